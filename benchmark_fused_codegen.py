@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one column per Math/Logic node vs fused expressions in populate_indicators
+
+Exports a trend + RSI filter graph (EMA difference -> divide by close -> threshold,
+AND an RSI threshold) with StrategyExporter(fuse_expressions=False) and with the
+default fused codegen, runs both populate_indicators bodies on 100k and 1M synthetic
+candles and reports their time, the time of their Math/Logic lines alone (the
+indicator calls are the same in both) and the number of columns they add.
+Indicators use TA-Lib when it is installed, else the preview's NumPy implementations.
+
+Usage: python benchmark_fused_codegen.py [sizes...]
+"""
+
+import contextlib
+import io
+import sys
+import textwrap
+import time
+import types
+
+import numpy as np
+import pandas as pd
+
+from exporter import StrategyExporter
+
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+REPEATS = 5
+
+GRAPH = {
+    'nodes': [
+        {'id': 'market', 'type': 'market_data', 'parameters': {'pair': 'BTC/USDT', 'timeframe': '5m'}},
+        {'id': 'ema_fast', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 12}},
+        {'id': 'ema_slow', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 26}},
+        {'id': 'rsi', 'type': 'indicator', 'parameters': {'indicator_type': 'RSI', 'period': 14}},
+        {'id': 'spread', 'type': 'math', 'parameters': {'operation': 'subtract'}},
+        {'id': 'spread_pct', 'type': 'math', 'parameters': {'operation': 'divide'}},
+        {'id': 'trend_up', 'type': 'logic', 'parameters': {'operation': 'greater_than', 'threshold': 0.001}},
+        {'id': 'trend_down', 'type': 'logic', 'parameters': {'operation': 'less_than', 'threshold': -0.001}},
+        {'id': 'not_overbought', 'type': 'logic', 'parameters': {'operation': 'less_than', 'threshold': 70}},
+        {'id': 'entry', 'type': 'logic', 'parameters': {'operation': 'AND'}},
+        {'id': 'enter', 'type': 'enter', 'parameters': {'side': 'long'}},
+        {'id': 'exit', 'type': 'exit', 'parameters': {'side': 'long'}}
+    ],
+    'connections': [
+        {'from': 'market.candles', 'to': 'ema_fast.candles'},
+        {'from': 'market.candles', 'to': 'ema_slow.candles'},
+        {'from': 'market.candles', 'to': 'rsi.candles'},
+        {'from': 'ema_fast.values', 'to': 'spread.A'},
+        {'from': 'ema_slow.values', 'to': 'spread.B'},
+        {'from': 'spread.result', 'to': 'spread_pct.A'},
+        {'from': 'market.candles', 'to': 'spread_pct.B'},
+        {'from': 'spread_pct.result', 'to': 'trend_up.condition1'},
+        {'from': 'spread_pct.result', 'to': 'trend_down.condition1'},
+        {'from': 'rsi.values', 'to': 'not_overbought.condition1'},
+        {'from': 'trend_up.result', 'to': 'entry.condition1'},
+        {'from': 'not_overbought.result', 'to': 'entry.condition2'},
+        {'from': 'entry.result', 'to': 'enter.signal'},
+        {'from': 'trend_down.result', 'to': 'exit.signal'}
+    ]
+}
+
+
+def indicator_library():
+    """talib.abstract if installed, else the preview's NumPy indicators behind the same calls"""
+    try:
+        import talib.abstract as ta
+        return ta, 'TA-Lib'
+    except ImportError:
+        from preview import ema, rsi
+
+        def wrap(function):
+            return lambda series, timeperiod: pd.Series(function(series.to_numpy(), timeperiod), index=series.index)
+        return types.SimpleNamespace(EMA=wrap(ema), RSI=wrap(rsi)), 'preview NumPy'
+
+
+def populate_indicators_lines(fuse_expressions: bool) -> list:
+    """populate_indicators body lines of the exported graph"""
+    exporter = StrategyExporter(fuse_expressions=fuse_expressions)
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph_data = exporter._analyze_graph_dict(GRAPH)
+        return exporter._generate_code_sections(graph_data)['indicators']
+
+
+def compile_lines(lines: list):
+    """Generated lines as a function of the dataframe"""
+    source = ("def populate_indicators(dataframe):\n" +
+              textwrap.indent(textwrap.dedent("\n".join(lines)), '    ') +
+              "\n    return dataframe\n")
+    namespace = {'ta': indicator_library()[0], 'np': np, 'pd': pd}
+    exec(source, namespace)
+    return namespace['populate_indicators']
+
+
+def synthetic_candles(count: int, seed: int = 42) -> pd.DataFrame:
+    """Random-walk 5m OHLCV candles"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, count)) * close
+    return pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=count, freq='5min', tz='UTC'),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread,
+        'low': np.minimum(open_, close) - spread,
+        'close': close,
+        'volume': rng.uniform(1, 100, count)
+    })
+
+
+def best_time(function, candles: pd.DataFrame) -> float:
+    """Fastest of REPEATS runs on fresh copies of the candles"""
+    best = None
+    for _ in range(REPEATS):
+        dataframe = candles.copy()
+        started = time.perf_counter()
+        function(dataframe)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    per_node_lines = populate_indicators_lines(fuse_expressions=False)
+    fused_lines = populate_indicators_lines(fuse_expressions=True)
+    indicator_lines = [line for line in fused_lines if 'ta.' in line]
+    indicators = compile_lines(indicator_lines)
+    per_node, fused = compile_lines(per_node_lines), compile_lines(fused_lines)
+    per_node_math = compile_lines([line for line in per_node_lines if line not in indicator_lines])
+    fused_math = compile_lines([line for line in fused_lines if line not in indicator_lines])
+    print(f"Indicators: {indicator_library()[1]}")
+    print(f"Math/Logic assignments per node: {len(per_node_lines) - len(indicator_lines)}, "
+          f"fused: {len(fused_lines) - len(indicator_lines)}")
+
+    print(f"{'candles':>10}{'populate, ms':>14}{'fused':>8}{'math/logic, ms':>16}{'fused':>8}{'speedup':>10}"
+          f"{'columns':>9}{'fused':>7}")
+    for size in sizes:
+        candles = synthetic_candles(size)
+        with_indicators = indicators(candles.copy())
+        per_node_columns = len(per_node(candles.copy()).columns) - len(candles.columns)
+        fused_columns = len(fused(candles.copy()).columns) - len(candles.columns)
+
+        per_node_time, fused_time = best_time(per_node, candles), best_time(fused, candles)
+        per_node_math_time = best_time(per_node_math, with_indicators)
+        fused_math_time = best_time(fused_math, with_indicators)
+        print(f"{size:>10}{per_node_time * 1000:>14.1f}{fused_time * 1000:>8.1f}"
+              f"{per_node_math_time * 1000:>16.1f}{fused_math_time * 1000:>8.1f}"
+              f"{per_node_math_time / fused_math_time:>9.2f}x{per_node_columns:>9}{fused_columns:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-simulation loop vs batched Monte Carlo trade resampling
+
+Runs 10k bootstrap simulations over 500, 3k and 10k synthetic trades through a
+loop of one resampled path per iteration and through monte_carlo.monte_carlo_trades,
+and reports the time of both plus the median max drawdown as a sanity check.
+
+Usage: python benchmark_monte_carlo.py [sizes...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from monte_carlo import monte_carlo_trades
+
+
+DEFAULT_SIZES = [500, 3_000, 10_000]
+SIMULATIONS = 10_000
+
+
+def synthetic_trades(count: int, seed: int = 42) -> pd.DataFrame:
+    """Trades frame with the columns the Monte Carlo reads"""
+    rng = np.random.default_rng(seed)
+    exit_dates = pd.Timestamp('2025-04-01', tz='UTC') + pd.to_timedelta(
+        np.sort(rng.integers(0, 90 * 86400, count)), unit='s')
+    return pd.DataFrame({'exit_date': exit_dates, 'profit_abs': rng.normal(0.2, 2.0, count)})
+
+
+def loop_monte_carlo(trades_df: pd.DataFrame, starting_balance: float = 1000.0,
+                     simulations: int = SIMULATIONS, seed: int = 1) -> np.ndarray:
+    """One resampled equity path per iteration with the same statistics; returns the max drawdowns"""
+    rng = np.random.default_rng(seed)
+    profits = trades_df['profit_abs'].to_numpy()
+    positions = np.arange(1, len(profits) + 1)
+    band_index = np.linspace(0, len(profits) - 1, 200).astype(np.int64)
+    final_equity = np.empty(simulations)
+    max_drawdown = np.empty(simulations)
+    under_water = np.empty(simulations)
+    band_equity = np.empty((simulations, len(band_index)))
+    for i in range(simulations):
+        equity = starting_balance + np.cumsum(rng.choice(profits, len(profits)))
+        peak = np.maximum(np.maximum.accumulate(equity), starting_balance)
+        final_equity[i] = equity[-1]
+        max_drawdown[i] = ((equity / peak).min() - 1) * 100
+        under_water[i] = (positions - np.maximum.accumulate((equity >= peak) * positions)).max()
+        band_equity[i] = equity[band_index]
+    np.percentile(band_equity, [5, 25, 50, 75, 95], axis=0)
+    return max_drawdown
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print(f"{'trades':>10}{'loop, s':>10}{'batched, s':>13}{'speedup':>10}{'median DD loop':>17}{'batched':>10}")
+    for size in sizes:
+        trades_df = synthetic_trades(size)
+
+        started = time.perf_counter()
+        loop_drawdown = loop_monte_carlo(trades_df)
+        loop = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = monte_carlo_trades(trades_df, simulations=SIMULATIONS, seed=1)
+        batched = time.perf_counter() - started
+
+        print(f"{size:>10}{loop:>10.3f}{batched:>13.3f}{loop / batched:>9.1f}x"
+              f"{np.median(loop_drawdown):>16.2f}%{results['percentiles']['max_drawdown'][50]:>9.2f}%")
+
+
+if __name__ == "__main__":
+    main()
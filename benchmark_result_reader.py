@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extract + json.load vs streaming result zip reader
+
+Reads the zips in user_data/backtest_results through both paths, then repeats
+the comparison on a synthetic zip with many trades (built by replicating the
+trades of the latest result) and prints parse time and peak Python memory.
+
+Usage: python benchmark_result_reader.py [trades]
+"""
+
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+from result_reader import read_backtest_zip, find_result_member
+
+
+RESULTS_DIR = Path(__file__).parent / 'user_data' / 'backtest_results'
+
+
+def legacy_read(zip_path: Path, work_dir: Path) -> dict:
+    """Previous runner path: extract the result JSON to disk and json.load it"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        member = find_result_member(zip_ref.namelist())
+        zip_ref.extract(member, work_dir)
+    with open(work_dir / member, 'r') as f:
+        return json.load(f)
+
+
+def build_synthetic_zip(source_zip: Path, trades: int, target: Path) -> Path:
+    """Write a result zip with `trades` trades copied from source_zip"""
+    with zipfile.ZipFile(source_zip, 'r') as zip_ref:
+        member = find_result_member(zip_ref.namelist())
+        data = json.loads(zip_ref.read(member))
+
+    strategy = next(iter(data['strategy'].values()))
+    template = strategy['trades']
+    strategy['trades'] = [template[i % len(template)] for i in range(trades)]
+    strategy['total_trades'] = trades
+
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr(member, json.dumps(data))
+    return target
+
+
+def measure(read, runs: int) -> tuple:
+    """(median seconds, peak traced MB) for a read() callable"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        read()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    read()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak / (1024 * 1024)
+
+
+def main():
+    trades = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    zips = sorted(RESULTS_DIR.glob('*.zip'))
+    if not zips:
+        print(f"❌ Нет zip файлов в {RESULTS_DIR}")
+        return
+
+    with tempfile.TemporaryDirectory(prefix='frequi_bench_') as tmp:
+        work_dir = Path(tmp)
+        synthetic = build_synthetic_zip(zips[-1], trades, work_dir / 'synthetic.zip')
+
+        cases = [(zip_path.name, zip_path, 20) for zip_path in zips]
+        cases.append((f"synthetic {trades} trades", synthetic, 3))
+
+        print(f"{'result':<44}{'extract+load':>16}{'streaming':>16}{'peak MB old/new':>20}")
+        for name, zip_path, runs in cases:
+            old_time, old_peak = measure(lambda: legacy_read(zip_path, work_dir), runs)
+            new_time, new_peak = measure(lambda: read_backtest_zip(zip_path), runs)
+            print(f"{name:<44}{old_time * 1000:>13.1f} ms{new_time * 1000:>13.1f} ms"
+                  f"{old_peak:>11.1f} / {new_peak:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-trade dict/f-string loop vs columnar trades DataFrame
+
+Builds the trades DataFrame from 1k, 100k and 1M synthetic exported trades
+through the previous per-row path and through trades_frame.build_trades_frame,
+and reports the time of the first visible page of display strings for both.
+
+Usage: python benchmark_trades_frame.py [sizes...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from trades_frame import build_trades_frame
+
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def synthetic_trades(count: int, seed: int = 42) -> list:
+    """Exported-trade dicts shaped like freqtrade's backtest result"""
+    rng = np.random.default_rng(seed)
+    open_ts = 1743465600000 + np.sort(rng.integers(0, 90 * 86400, count)) * 1000
+    duration = rng.integers(5, 3000, count)
+    close_ts = open_ts + duration * 60000
+    open_rate = rng.uniform(60000, 110000, count)
+    profit_ratio = rng.normal(0.002, 0.02, count)
+
+    trades = []
+    for i in range(count):
+        trades.append({
+            'pair': 'BTC/USDT',
+            'is_short': bool(i % 7 == 0),
+            'amount': 0.00121,
+            'stake_amount': 99.65,
+            'open_date': pd.Timestamp(int(open_ts[i]), unit='ms', tz='UTC').isoformat(sep=' '),
+            'close_date': pd.Timestamp(int(close_ts[i]), unit='ms', tz='UTC').isoformat(sep=' '),
+            'open_timestamp': int(open_ts[i]),
+            'close_timestamp': int(close_ts[i]),
+            'open_rate': float(open_rate[i]),
+            'close_rate': float(open_rate[i] * (1 + profit_ratio[i])),
+            'profit_abs': float(99.65 * profit_ratio[i]),
+            'profit_ratio': float(profit_ratio[i]),
+            'trade_duration': int(duration[i])
+        })
+    return trades
+
+
+def _format_duration(duration_minutes: int) -> str:
+    if duration_minutes < 60:
+        return f"{duration_minutes}m"
+    elif duration_minutes < 1440:
+        return f"{duration_minutes // 60}h {duration_minutes % 60}m"
+    return f"{duration_minutes // 1440}d {(duration_minutes % 1440) // 60}h"
+
+
+def legacy_frame(trades: list) -> pd.DataFrame:
+    """Previous runner path: one formatted dict and one pd.to_datetime per trade"""
+    trades_data = []
+    for trade in trades:
+        trades_data.append({
+            'entry_date': trade.get('open_date', '').replace('+00:00', ''),
+            'exit_date': trade.get('close_date', '').replace('+00:00', ''),
+            'pair': trade.get('pair', ''),
+            'side': 'Short' if trade.get('is_short', False) else 'Long',
+            'amount': f"{trade.get('amount', 0):.6f}",
+            'entry_price': f"{trade.get('open_rate', 0):.2f}",
+            'exit_price': f"{trade.get('close_rate', 0):.2f}",
+            'profit': f"{trade.get('profit_abs', 0):.2f} USDT",
+            'profit_pct': f"{trade.get('profit_ratio', 0) * 100:.2f}%",
+            'duration': _format_duration(trade.get('trade_duration', 0)),
+            'close_timestamp': pd.to_datetime(trade.get('close_date', '')),
+            'profit_ratio': trade.get('profit_ratio', 0)
+        })
+    return pd.DataFrame(trades_data)
+
+
+def first_page_ms(trades_df: pd.DataFrame, rows: int = 50) -> float:
+    """Time to produce the display strings of the first visible rows through the table model"""
+    from ui.results_panel import TradesTableModel
+
+    model = TradesTableModel(trades_df)
+    started = time.perf_counter()
+    for row in range(min(rows, model.rowCount())):
+        for column in range(model.columnCount()):
+            model.data(model.index(row, column))
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    from PySide6.QtCore import QCoreApplication
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    print(f"{'trades':>10}{'per-row, s':>14}{'columnar, s':>14}{'speedup':>10}{'first page, ms':>17}")
+    for size in sizes:
+        trades = synthetic_trades(size)
+
+        started = time.perf_counter()
+        legacy_frame(trades)
+        legacy = time.perf_counter() - started
+
+        started = time.perf_counter()
+        trades_df = build_trades_frame(trades)
+        columnar = time.perf_counter() - started
+
+        print(f"{size:>10}{legacy:>14.3f}{columnar:>14.3f}{legacy / columnar:>9.1f}x"
+              f"{first_page_ms(trades_df):>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold `freqtrade backtesting` CLI vs warm worker pool
+
+Runs the same backtest on the bundled BTC/USDT 1h and 5m data several times
+through both paths and prints per-run and median latency.
+
+Usage: python benchmark_worker_pool.py [runs]
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from runner import FreqtradeRunner
+
+
+STRATEGY_NAME = "WorkingStrategy"
+
+CASES = [
+    # (timeframe, timerange) covered by user_data/data/binance/BTC_USDT-*.feather
+    ('1h', '20250501-20250630'),
+    ('5m', '20250625-20250701'),
+]
+
+
+def _config_overrides(runner: FreqtradeRunner, timeframe: str) -> dict:
+    exchange = dict(runner.default_config['exchange'], pair_whitelist=['BTC/USDT'])
+    return {'timeframe': timeframe, 'exchange': exchange}
+
+
+def _time_runs(runner: FreqtradeRunner, strategy_code: str, timeframe: str, timerange: str, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = runner.run_backtest(strategy_code, STRATEGY_NAME,
+                                      _config_overrides(runner, timeframe), timerange)
+        timings.append(time.perf_counter() - started)
+        if not results.get('success'):
+            raise RuntimeError(results.get('error', 'backtest failed'))
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    runner = FreqtradeRunner()
+    strategy_code = (runner.strategies_dir / f"{STRATEGY_NAME}.py").read_text()
+
+    report = []
+    try:
+        for timeframe, timerange in CASES:
+            print(f"\n⏱  Cold CLI: BTC/USDT {timeframe} {timerange}")
+            cold = _time_runs(runner, strategy_code, timeframe, timerange, runs)
+            report.append((f"cold CLI {timeframe}", cold))
+
+        started = time.perf_counter()
+        runner.start_worker_pool(size=1)
+        startup = time.perf_counter() - started
+        print(f"\n🔥 Worker pool startup: {startup:.2f}s")
+
+        for timeframe, timerange in CASES:
+            print(f"\n⏱  Warm worker: BTC/USDT {timeframe} {timerange}")
+            # First job loads the pair data, later ones reuse it
+            first = _time_runs(runner, strategy_code, timeframe, timerange, 1)
+            warm = _time_runs(runner, strategy_code, timeframe, timerange, runs)
+            report.append((f"warm first {timeframe}", first))
+            report.append((f"warm worker {timeframe}", warm))
+    finally:
+        runner.cleanup()
+
+    print("\n" + "=" * 60)
+    print(f"{'case':<22}{'median, s':>12}{'runs':>26}")
+    for name, timings in report:
+        runs_str = ", ".join(f"{t:.2f}" for t in timings)
+        print(f"{name:<22}{statistics.median(timings):>12.2f}   {runs_str}")
+
+
+if __name__ == "__main__":
+    main()
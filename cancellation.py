@@ -0,0 +1,91 @@
+"""
+Cancellation helpers - cancel tokens and process-tree termination for runner jobs
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+from typing import List, Callable
+
+
+class JobCancelled(Exception):
+    """Raised when a running job is cancelled or preempted"""
+    pass
+
+
+class CancelToken:
+    """Thread-safe cancellation flag with callbacks (e.g. killing a subprocess tree)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Mark as cancelled and run registered callbacks once"""
+
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"⚠️ Ошибка при отмене задачи: {e}")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Register a callback; runs immediately if the token is already cancelled"""
+
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise JobCancelled("Job was cancelled")
+
+
+def popen_group_kwargs() -> dict:
+    """Popen kwargs that put the child in its own process group so the whole tree can be killed"""
+
+    if sys.platform == 'win32':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_tree(process: subprocess.Popen, grace_period: float = 3.0) -> None:
+    """Terminate a process started with popen_group_kwargs() together with all its children"""
+
+    if sys.platform == 'win32':
+        if process.poll() is not None:
+            return
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        process.wait()
+        return
+
+    # Signal the group even if the leader already exited - children may still be alive
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=grace_period)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
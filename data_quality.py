@@ -0,0 +1,242 @@
+"""
+Data quality - vectorized OHLCV preprocessing behind the MarketDataNode settings
+
+Candles go through whole-array passes: timestamps are rounded to the timeframe and
+de-duplicated, invalid / zero-volume / outlier candles are masked, every gap is
+filled with flat zero-volume candles at the previous close (as freqtrade does before
+a backtest, so previews see the candles the exported strategy sees; gaps of more
+than max_gap_minutes of missing candles are reported as large), and a quality score
+(share of candles that were neither missing nor masked) is checked against
+data_quality_threshold. With use_ohlcv_preprocessing the
+masked candles are also replaced by a flat candle at the previous close; that step
+keeps the rows, so the exporter emits the same repair into generated strategies.
+Results are cached per (candle fingerprint, settings).
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import timeframe_to_timedelta
+
+
+# MarketDataNode parameters driving the pipeline, with the node defaults
+PREPROCESSING_DEFAULTS = {
+    'validate_data': True,
+    'fill_missing': True,
+    'remove_outliers': False,
+    'max_gap_minutes': 30,
+    'round_timestamps': True,
+    'data_quality_threshold': 0.95,
+    'volume_filter_enabled': False,
+    'use_ohlcv_preprocessing': False
+}
+
+# Trailing window (candles) of the rolling median / MAD outlier test
+OUTLIER_WINDOW = 50
+# Deviation from the rolling median, in robust standard deviations, that marks an outlier
+OUTLIER_MADS = 10.0
+# MAD -> standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+# Part of processed fingerprints: bump when the pipeline output for the same settings changes,
+# so indicators cached on disk for the old output are not reused
+PIPELINE_VERSION = 2
+
+# Processed candles by (fingerprint, timeframe, settings)
+CACHE_SIZE = 8
+_cache: 'OrderedDict[str, Tuple[Dict[str, np.ndarray], Dict[str, Any]]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def preprocessing_settings(market_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline settings of a MarketData node (missing parameters use the node defaults)"""
+    return {name: market_params.get(name, default) for name, default in PREPROCESSING_DEFAULTS.items()}
+
+
+def outlier_mask(prices: Dict[str, np.ndarray]) -> np.ndarray:
+    """Candles with a price further than OUTLIER_MADS robust deviations from the trailing median close"""
+
+    log_close = pd.Series(np.log(prices['close']))
+    median = log_close.rolling(OUTLIER_WINDOW, min_periods=OUTLIER_WINDOW // 5).median()
+    mad = (log_close - median).abs().rolling(OUTLIER_WINDOW, min_periods=OUTLIER_WINDOW // 5).median()
+    limit = (OUTLIER_MADS * MAD_SCALE * mad).to_numpy()
+
+    deviation = np.zeros(len(log_close))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for column in PRICE_COLUMNS:
+            deviation = np.fmax(deviation, np.abs(np.log(prices[column]) - median.to_numpy()))
+        return (limit > 0) & (deviation > limit)
+
+
+def repair_candles(candles: Dict[str, np.ndarray], settings: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], Dict[str, int]]:
+    """Mask invalid / zero-volume / outlier candles; with use_ohlcv_preprocessing flatten them
+    at the previous close (rows are kept)"""
+
+    open_, high, low, close, volume = (candles[column] for column in ('open', 'high', 'low', 'close', 'volume'))
+    length = len(close)
+    counts = {'invalid': 0, 'low_volume': 0, 'outliers': 0}
+    masked = np.zeros(length, dtype=bool)
+
+    if settings['validate_data']:
+        with np.errstate(invalid='ignore'):
+            invalid = ~(np.isfinite(open_) & np.isfinite(high) & np.isfinite(low) & np.isfinite(close))
+            invalid |= (low <= 0) | (high < np.fmax(open_, close)) | (low > np.fmin(open_, close))
+            invalid |= ~(volume >= 0)
+        counts['invalid'] = int(invalid.sum())
+        masked |= invalid
+
+    if settings['volume_filter_enabled']:
+        low_volume = ~masked & (volume <= 0)
+        counts['low_volume'] = int(low_volume.sum())
+        masked |= low_volume
+
+    if settings['remove_outliers']:
+        outliers = ~masked & outlier_mask(candles)
+        counts['outliers'] = int(outliers.sum())
+        masked |= outliers
+
+    if not masked.any() or not settings['use_ohlcv_preprocessing']:
+        return candles, counts
+
+    # Previous unmasked close (the first unmasked one for leading masked candles)
+    valid_index = np.where(masked, -1, np.arange(length))
+    previous = np.maximum.accumulate(valid_index)
+    first_valid = np.argmax(~masked) if not masked.all() else 0
+    flat = close[np.where(previous >= 0, previous, first_valid)]
+
+    repaired = dict(candles)
+    for column in PRICE_COLUMNS:
+        repaired[column] = np.where(masked, flat, candles[column])
+    repaired['volume'] = np.where(masked & ~(volume >= 0), 0.0, volume)
+    return repaired, counts
+
+
+def regularize_dates(candles: Dict[str, np.ndarray], timeframe_ns: int,
+                     round_timestamps: bool) -> Tuple[Dict[str, np.ndarray], int]:
+    """Round dates down to the timeframe, sort and drop duplicates (the last candle wins)"""
+
+    dates = candles['date'].view(np.int64)
+    round_timestamps = round_timestamps and bool(np.any(dates % timeframe_ns))
+    if round_timestamps:
+        dates = dates - dates % timeframe_ns
+
+    order = None if np.all(dates[1:] >= dates[:-1]) else np.argsort(dates, kind='stable')
+    if order is not None:
+        dates = dates[order]
+    keep = np.append(dates[1:] != dates[:-1], True) if len(dates) else np.ones(0, dtype=bool)
+    duplicates = int(len(keep) - keep.sum())
+
+    if order is None and duplicates == 0 and not round_timestamps:
+        return candles, 0
+
+    regular = {}
+    for column, values in candles.items():
+        values = dates.view('datetime64[ns]') if column == 'date' else values
+        if order is not None and column != 'date':
+            values = values[order]
+        regular[column] = values[keep] if duplicates else values
+    return regular, duplicates
+
+
+def fill_gaps(candles: Dict[str, np.ndarray], timeframe_ns: int, max_gap_ns: int,
+              fill: bool = True) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Insert flat zero-volume candles at the previous close into every gap (freqtrade's
+    fill before backtesting); gaps of more than max_gap_ns of missing candles are reported
+    as large. fill=False only reports the gaps."""
+
+    dates = candles['date'].view(np.int64)
+    missing = np.maximum(np.diff(dates) // timeframe_ns - 1, 0)
+    fillable = missing if fill else np.zeros_like(missing)
+
+    gap_info = {
+        'gaps': int((missing > 0).sum()),
+        'missing': int(missing.sum()),
+        'largest_gap_minutes': float(missing.max() * timeframe_ns / 60e9) if len(missing) else 0.0,
+        'large_gaps': int((missing * timeframe_ns > max_gap_ns).sum()),
+        'filled': int(fillable.sum())
+    }
+    if not gap_info['filled']:
+        return candles, gap_info
+
+    # Position of each original candle in the filled arrays, and the source of every row
+    position = np.arange(len(dates)) + np.concatenate([[0], np.cumsum(fillable)])
+    total = position[-1] + 1
+    source = np.zeros(total, dtype=np.int64)
+    source[position] = np.arange(len(dates))
+    source = np.maximum.accumulate(source)
+    inserted = np.ones(total, dtype=bool)
+    inserted[position] = False
+
+    filled = {'date': (dates[source] + (np.arange(total) - position[source]) * timeframe_ns).view('datetime64[ns]')}
+    for column in PRICE_COLUMNS:
+        filled[column] = np.where(inserted, candles['close'][source], candles[column][source])
+    filled['volume'] = np.where(inserted, 0.0, candles['volume'][source])
+    for column in set(candles) - set(filled):
+        filled[column] = candles[column][source]
+    return filled, gap_info
+
+
+def preprocess_candles(candles: Dict[str, np.ndarray], timeframe: str, settings: Dict[str, Any],
+                       fingerprint: str = None) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Full pipeline on candle arrays (date as datetime64[ns] + OHLCV); returns (candles, report)
+
+    With the input's fingerprint the result is cached per (fingerprint, timeframe, settings).
+    """
+
+    key = None
+    if fingerprint is not None:
+        key = _settings_key(fingerprint, timeframe, settings)
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                return _cache[key]
+
+    timeframe_ns = timeframe_to_timedelta(timeframe).value
+    received = len(candles['close'])
+
+    candles, duplicates = regularize_dates(candles, timeframe_ns, settings['round_timestamps'])
+    candles, counts = repair_candles(candles, settings)
+    candles, gap_info = fill_gaps(candles, timeframe_ns, int(settings['max_gap_minutes'] * 60e9),
+                                  settings['fill_missing'])
+
+    expected = received - duplicates + gap_info['missing']
+    masked = counts['invalid'] + counts['low_volume'] + counts['outliers']
+    quality = (expected - gap_info['missing'] - masked) / expected if expected else 1.0
+
+    report = {
+        'candles': len(candles['close']),
+        'expected': expected,
+        'duplicates': duplicates,
+        **gap_info,
+        **counts,
+        'quality': quality,
+        'passed': not settings['validate_data'] or quality >= settings['data_quality_threshold']
+    }
+    if not report['passed']:
+        print(f"⚠️ Качество данных {quality:.1%} ниже порога {settings['data_quality_threshold']:.0%}: "
+              f"пропущено {gap_info['missing']}, исправлено {masked}")
+
+    if key is not None:
+        with _cache_lock:
+            _cache[key] = (candles, report)
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return candles, report
+
+
+def processed_fingerprint(fingerprint: str, timeframe: str, settings: Dict[str, Any]) -> str:
+    """Fingerprint of preprocessed candles, derived from the raw candles' fingerprint"""
+    return _settings_key(fingerprint, timeframe, settings)
+
+
+def _settings_key(fingerprint: str, timeframe: str, settings: Dict[str, Any]) -> str:
+    payload = json.dumps([PIPELINE_VERSION, fingerprint, timeframe, settings], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
@@ -0,0 +1,171 @@
+"""
+Equity engine - bar-level mark-to-market equity curve from trades and candles
+
+Every trade adds its signed position size and cost basis to per-pair difference
+arrays at its entry bar and removes them at its exit bar, so open positions,
+unrealized PnL and exposure for all bars come from a few cumulative sums instead
+of a loop over trades x candles. Realized PnL uses the exported (fee-inclusive)
+profit_abs at the exit bar; open positions are marked at the candle close.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import DEFAULT_DATA_DIR, get_store
+
+
+# Columns of the trades frame the engine needs (see trades_frame.build_trades_frame)
+REQUIRED_COLUMNS = ('entry_date', 'exit_date', 'pair', 'amount', 'entry_price', 'profit_abs')
+
+
+def _to_ns(dates) -> np.ndarray:
+    """UTC dates as int64 nanoseconds"""
+    return pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).as_unit('ns').asi8
+
+
+def _on_grid(grid: np.ndarray, dates: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """As-of lookup: last value at or before each grid date (first value before the data starts)"""
+    index = np.searchsorted(dates, grid, side='right') - 1
+    return values[np.clip(index, 0, len(values) - 1)]
+
+
+def _bar_grid(date_arrays, extra_dates: np.ndarray) -> np.ndarray:
+    """Sorted union of candle dates and trade dates
+
+    Pairs of one timeframe usually share the same candle dates, so identical arrays
+    are merged once and trade dates are only added when they fall between candles.
+    """
+    distinct = []
+    for dates in date_arrays:
+        if not any(len(dates) == len(seen) and np.array_equal(dates, seen) for seen in distinct):
+            distinct.append(dates)
+
+    grid = distinct[0] if len(distinct) == 1 else np.unique(np.concatenate(distinct or [extra_dates]))
+
+    position = np.clip(np.searchsorted(grid, extra_dates), 0, max(len(grid) - 1, 0))
+    off_grid = extra_dates[grid[position] != extra_dates] if len(grid) else extra_dates
+    if len(off_grid):
+        grid = np.union1d(grid, off_grid)
+    return grid
+
+
+def _open_sum(entry_index: np.ndarray, exit_index: np.ndarray, weights: np.ndarray, bars: int) -> np.ndarray:
+    """Per-bar sum of weights over trades open at that bar (entry bar inclusive, exit bar exclusive)"""
+    delta = np.bincount(entry_index, weights, bars + 1) - np.bincount(exit_index, weights, bars + 1)
+    return np.cumsum(delta[:bars])
+
+
+def mark_to_market(trades_df: pd.DataFrame, prices: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                   starting_balance: float = 1000.0, start=None, end=None) -> pd.DataFrame:
+    """Per-bar equity curve across all pairs
+
+    prices maps pair -> (candle dates as int64 ns, close prices). Pairs without prices
+    are carried at their entry price, so they only contribute realized PnL. The bar grid
+    is the union of all candle dates between start and end (default: first entry to
+    last exit). Returns date, equity, realized, unrealized, exposure, open_trades,
+    returns, cum_return and drawdown (underwater, % below the running peak).
+    """
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in trades_df.columns]
+    if missing:
+        raise ValueError(f"Trades frame misses columns: {missing}")
+
+    entry = _to_ns(trades_df['entry_date'])
+    exit_ = _to_ns(trades_df['exit_date'])
+    pair_codes, pair_names = pd.factorize(trades_df['pair'])
+    direction = np.where(trades_df['is_short'].to_numpy(dtype=bool), -1.0, 1.0) \
+        if 'is_short' in trades_df.columns else np.ones(len(trades_df))
+    size = trades_df['amount'].to_numpy(dtype=float)
+    signed_size = size * direction
+    cost = signed_size * trades_df['entry_price'].to_numpy(dtype=float)
+    profit = trades_df['profit_abs'].to_numpy(dtype=float)
+
+    start = _to_ns([start])[0] if start is not None else entry.min()
+    end = _to_ns([end])[0] if end is not None else exit_.max()
+
+    grid = _bar_grid([dates for dates, _ in prices.values()], np.concatenate([entry, exit_]))
+    grid = grid[(grid >= start) & (grid <= end)]
+    bars = len(grid)
+
+    entry_index = np.searchsorted(grid, entry, side='left')
+    exit_index = np.searchsorted(grid, exit_, side='left')
+
+    realized = np.cumsum(np.bincount(exit_index, profit, bars + 1)[:bars])
+    open_trades = _open_sum(entry_index, exit_index, np.ones(len(trades_df)), bars)
+
+    unrealized = np.zeros(bars)
+    exposure = np.zeros(bars)
+    for code, pair in enumerate(pair_names):
+        in_pair = pair_codes == code
+        pair_entry, pair_exit = entry_index[in_pair], exit_index[in_pair]
+        open_cost = _open_sum(pair_entry, pair_exit, cost[in_pair], bars)
+
+        if pair in prices:
+            dates, close = prices[pair]
+            close_on_grid = _on_grid(grid, dates, close)
+            open_size = _open_sum(pair_entry, pair_exit, signed_size[in_pair], bars)
+            gross_size = _open_sum(pair_entry, pair_exit, size[in_pair], bars)
+            unrealized += open_size * close_on_grid - open_cost
+            exposure += gross_size * close_on_grid
+        else:
+            exposure += _open_sum(pair_entry, pair_exit, np.abs(cost[in_pair]), bars)
+
+    equity = starting_balance + realized + unrealized
+
+    previous = np.concatenate([[starting_balance], equity[:-1]])
+    returns = equity / previous - 1
+    peak = np.maximum(np.maximum.accumulate(equity), starting_balance)
+
+    return pd.DataFrame({
+        'date': pd.to_datetime(grid, utc=True),
+        'equity': equity,
+        'realized': realized,
+        'unrealized': unrealized,
+        'exposure': exposure,
+        'open_trades': np.rint(open_trades).astype(np.int64),
+        'returns': returns,
+        'cum_return': equity / starting_balance - 1,
+        'drawdown': (equity / peak - 1) * 100
+    })
+
+
+class EquityCurveEngine:
+    """Builds mark-to-market equity curves from trades and the local candle store"""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR):
+        self.data_dir = Path(data_dir)
+
+    def build(self, trades_df: pd.DataFrame, timeframe: str = '1h', starting_balance: float = 1000.0,
+              exchange: str = 'binance', start=None, end=None) -> pd.DataFrame:
+        """Equity curve for a trades frame, marking open positions at each candle close"""
+
+        store = get_store(self.data_dir)
+        prices = {}
+        for pair in trades_df['pair'].unique():
+            try:
+                # Views into the mapped candle file, no copies
+                candles = store.load(pair, timeframe, exchange, columns=('date', 'close'))
+            except FileNotFoundError as e:
+                print(f"⚠️ {e} - позиции {pair} учитываются только по закрытию")
+                continue
+            prices[pair] = (candles['date'].view(np.int64), candles['close'])
+
+        return mark_to_market(trades_df, prices, starting_balance, start, end)
+
+    def build_for_results(self, trades_df: pd.DataFrame, strategy_results: Dict[str, Any],
+                          exchange: str = 'binance') -> pd.DataFrame:
+        """Equity curve using timeframe, balance and backtest window of a freqtrade result"""
+
+        start = strategy_results.get('backtest_start_ts')
+        end = strategy_results.get('backtest_end_ts')
+        return self.build(
+            trades_df,
+            timeframe=strategy_results.get('timeframe', '1h'),
+            starting_balance=float(strategy_results.get('starting_balance', 1000.0)),
+            exchange=exchange,
+            start=pd.Timestamp(start, unit='ms', tz='UTC') if start is not None else None,
+            end=pd.Timestamp(end, unit='ms', tz='UTC') if end is not None else None
+        )
@@ -3,20 +3,98 @@ Strategy exporter - converts node graph to Freqtrade IStrategy Python code
 """
 
 import json
+import math
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader, Template
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict, deque
 
+import numpy as np
+
 from nodes.base_nodes import NODE_CLASSES
+from data_quality import preprocessing_settings, OUTLIER_WINDOW, OUTLIER_MADS, MAD_SCALE
+from ohlcv_store import timeframe_to_timedelta
+
+
+# Indicator columns that may be precomputed for hyperopt-driven periods. Precomputing
+# costs one indicator run per candidate period (done once) plus the memory for those
+# columns; per-epoch computation costs one run per epoch. Hyperopt usually runs a few
+# hundred epochs, so larger candidate sets are computed per epoch instead.
+PRECOMPUTE_COLUMN_BUDGET = 200
+
+# Indicators whose `period` parameter is used by the generated code
+PERIOD_INDICATORS = ('EMA', 'SMA', 'RSI', 'Bollinger Bands')
+
+# Import of the indicator cache helpers; outside the builder indicators are computed directly
+INDICATOR_CACHE_IMPORT = """try:
+    from indicator_cache import cached_indicator, data_fingerprint
+except ImportError:
+    def data_fingerprint(dataframe):
+        return None
+
+    def cached_indicator(fingerprint, expression, params, compute):
+        return compute()"""
+
+# Math/Logic nodes are turned into expression trees before code is generated:
+# ('column', name), ('constant', value) or (operator, *operands)
+MATH_OPERATORS = {
+    'add': '+',
+    'subtract': '-',
+    'multiply': '*',
+    'divide': '/',
+    'power': '**',
+    'max': 'maximum',
+    'min': 'minimum'
+}
+
+# Logic operations comparing condition1 with condition2 (or the node's threshold)
+COMPARISON_OPERATORS = {
+    'greater_than': '>',
+    'less_than': '<',
+    'greater_equal': '>=',
+    'less_equal': '<=',
+    'equal': '=='
+}
+
+# MathNode `comparison` of the result against the node's `threshold` ('none' keeps the value)
+MATH_COMPARISONS = dict(COMPARISON_OPERATORS, greater='>', less='<')
+
+# NumPy equivalents used to fold constant operands (same results as the generated pandas code)
+CONSTANT_FOLDS = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+    '**': np.power,
+    'maximum': np.maximum,
+    'minimum': np.minimum,
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '&': np.logical_and,
+    '|': np.logical_or,
+    '~': np.logical_not
+}
+
+# Neutral operands: (operator, constant, its position) - the other operand is the result
+IDENTITY_OPERANDS = (('+', 0, 1), ('+', 0, 0), ('-', 0, 1), ('*', 1, 1), ('*', 1, 0), ('/', 1, 1), ('**', 1, 1))
 
 
 class StrategyExporter:
     """Exports node graphs to Freqtrade IStrategy Python code"""
     
-    def __init__(self):
+    def __init__(self, indicator_cache: bool = False, prune_columns: bool = False,
+                 fuse_expressions: bool = True):
+        """indicator_cache: route indicator calls of generated strategies through indicator_cache.py
+        prune_columns: drop intermediate columns at the end of populate_indicators
+        fuse_expressions: inline single-use Math/Logic nodes into their consumer's expression"""
         self.template_dir = Path(__file__).parent / 'templates'
         self.env = Environment(loader=FileSystemLoader(str(self.template_dir)))
+        self.indicator_cache = indicator_cache
+        self.prune_columns = prune_columns
+        self.fuse_expressions = fuse_expressions
     
     def export_graph(self, graph) -> str:
         """Export node graph to Python strategy code"""
@@ -35,11 +113,11 @@ class StrategyExporter:
         # Generate code sections
         code_sections = self._generate_code_sections(graph_data)
         
-        # Extract timeframe from market data nodes
+        # Extract timeframe from market data nodes (informative nodes have higher timeframes)
         timeframe = '1h'  # default
         if graph_data['market_data_nodes']:
-            first_market_node = graph_data['market_data_nodes'][0]
-            timeframe = first_market_node['parameters'].get('timeframe', '1h')
+            base_market_node = self._base_market_node(graph_data)
+            timeframe = base_market_node['parameters'].get('timeframe', '1h')
         
         # Load and render template
         template = self._get_strategy_template()
@@ -51,8 +129,11 @@ class StrategyExporter:
             entry_signals=code_sections['entry_signals'],
             exit_signals=code_sections['exit_signals'],
             hyperopt_params=code_sections['hyperopt_params'],
+            parameter_indicators=code_sections['parameter_indicators'],
             plots=code_sections['plots'],
-            imports=code_sections['imports']
+            imports=code_sections['imports'],
+            informative_pairs=code_sections['informative_pairs'],
+            startup_candle_count=code_sections['startup_candle_count']
         )
         
         return strategy_code
@@ -60,19 +141,7 @@ class StrategyExporter:
     def _analyze_graph(self, nodes) -> Dict[str, Any]:
         """Analyze graph structure and connections"""
         
-        graph_data = {
-            'nodes': {},
-            'connections': defaultdict(list),
-            'execution_order': [],
-            'market_data_nodes': [],
-            'indicator_nodes': [],
-            'math_nodes': [],
-            'logic_nodes': [],
-            'enter_nodes': [],
-            'exit_nodes': [],
-            'hyperopt_nodes': [],
-            'plot_nodes': []
-        }
+        graph_data = self._empty_graph_data()
         
         # Process all nodes
         for node in nodes:
@@ -122,6 +191,80 @@ class StrategyExporter:
                 node_data['outputs'][port_name] = connected_inputs
             
             graph_data['nodes'][node_id] = node_data
+        
+        return self._index_graph_data(graph_data)
+    
+    def _analyze_graph_dict(self, strategy_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze a saved strategy (JSON definition or NodeGraphQt session) without a live graph"""
+        
+        graph_data = self._empty_graph_data()
+        
+        # JSON definitions store a node list, NodeGraphQt sessions a dict keyed by node id
+        raw_nodes = strategy_data.get('nodes', [])
+        if isinstance(raw_nodes, dict):
+            raw_nodes = [dict(node, id=node_id) for node_id, node in raw_nodes.items()]
+        
+        for node in raw_nodes:
+            node_type = node.get('type_') or node.get('type', '')
+            node_class = NODE_CLASSES.get(node_type)
+            # Use the same type string NodeGraphQt reports for live nodes
+            if node_class is not None:
+                node_type = f"{node_class.__identifier__}.{node_class.__name__}"
+            
+            graph_data['nodes'][node['id']] = {
+                'id': node['id'],
+                'type': node_type,
+                'name': node.get('name', node['id']),
+                'parameters': dict(node.get('parameters', {})),
+                'inputs': {},
+                'outputs': {}
+            }
+        
+        for connection in strategy_data.get('connections', []):
+            if 'out' in connection:
+                from_node_id, from_port = connection['out']
+                to_node_id, to_port = connection['in']
+            else:
+                from_node_id, _, from_port = connection['from'].partition('.')
+                to_node_id, _, to_port = connection['to'].partition('.')
+            
+            if from_node_id not in graph_data['nodes'] or to_node_id not in graph_data['nodes']:
+                print(f"Warning: skipping connection {from_node_id}.{from_port} -> {to_node_id}.{to_port}")
+                continue
+            
+            graph_data['nodes'][to_node_id]['inputs'].setdefault(to_port or 'input', []).append({
+                'node_id': from_node_id,
+                'port_name': from_port or 'output'
+            })
+            graph_data['nodes'][from_node_id]['outputs'].setdefault(from_port or 'output', []).append({
+                'node_id': to_node_id,
+                'port_name': to_port or 'input'
+            })
+        
+        return self._index_graph_data(graph_data)
+    
+    def _empty_graph_data(self) -> Dict[str, Any]:
+        """Create an empty graph_data structure"""
+        
+        return {
+            'nodes': {},
+            'connections': defaultdict(list),
+            'execution_order': [],
+            'market_data_nodes': [],
+            'indicator_nodes': [],
+            'math_nodes': [],
+            'logic_nodes': [],
+            'enter_nodes': [],
+            'exit_nodes': [],
+            'hyperopt_nodes': [],
+            'plot_nodes': []
+        }
+    
+    def _index_graph_data(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Categorize nodes by type and compute execution order"""
+        
+        for node_data in graph_data['nodes'].values():
+            node_type = node_data['type']
             
             # Categorize nodes by type
             if 'MarketData' in node_type:
@@ -228,17 +371,326 @@ class StrategyExporter:
     def _generate_code_sections(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate code sections for different parts of the strategy"""
         
+        graph_data = self._eliminate_dead_nodes(self._eliminate_common_subexpressions(graph_data))
+        graph_data = dict(graph_data, expressions=self._build_expressions(graph_data), inlined=set())
+        if self.fuse_expressions:
+            graph_data = self._fuse_expressions(graph_data)
+        indicators, parameter_indicators = self._generate_indicators(graph_data)
+        
         sections = {
             'imports': self._generate_imports(graph_data),
             'hyperopt_params': self._generate_hyperopt_params(graph_data),
-            'indicators': self._generate_indicators(graph_data),
+            'indicators': indicators,
+            'parameter_indicators': parameter_indicators,
             'entry_signals': self._generate_entry_signals(graph_data),
             'exit_signals': self._generate_exit_signals(graph_data),
-            'plots': self._generate_plots(graph_data)
+            'plots': self._generate_plots(graph_data),
+            'informative_pairs': self._generate_informative_pairs(graph_data),
+            'startup_candle_count': self._max_lookback(graph_data)
         }
         
         return sections
     
+    def _eliminate_common_subexpressions(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge structurally identical Indicator/Math/Logic nodes (hash-consing)
+        
+        Nodes are keyed in execution order by type, parameters and the keys of their
+        inputs (MarketData nodes by their candle frame and source, Indicator nodes only by
+        the parameters their generated call uses), so copies of a node or of a whole
+        subtree get the same key. Every copy after the first is dropped and its
+        consumers read the first node's column(s) instead, which also shares all outputs
+        of multi-output indicators. Returns a new graph_data; the input is not modified.
+        """
+        
+        frames = self._informative_frames(graph_data)
+        keys = {}
+        canonical = {}
+        aliases = {}
+        nodes = {}
+        
+        for node_id in graph_data['execution_order']:
+            node = graph_data['nodes'][node_id]
+            inputs = {
+                input_name: [dict(connection, node_id=aliases.get(connection['node_id'], connection['node_id']))
+                             for connection in connections]
+                for input_name, connections in node['inputs'].items()
+            }
+            node = dict(node, inputs=inputs)
+            node_type = node['type']
+            
+            if 'MarketData' in node_type:
+                frame = frames.get(node_id)
+                identity = [frame['frame'] if frame else 'dataframe', node['parameters'].get('source', 'close')]
+            elif 'Indicator' in node_type:
+                identity = self._indicator_identity(node['parameters'])
+            elif any(kind in node_type for kind in ('Math', 'Logic')):
+                identity = node['parameters']
+            else:
+                # Signals, plots and hyperopt parameters are never merged
+                identity = node_id
+            
+            upstream = {
+                input_name: [(keys.get(connection['node_id'], connection['node_id']), connection.get('port_name'))
+                             for connection in connections]
+                for input_name, connections in inputs.items()
+            }
+            key = json.dumps([node_type, identity, upstream], sort_keys=True, default=str)
+            keys[node_id] = key
+            
+            if key in canonical and 'MarketData' not in node_type:
+                aliases[node_id] = canonical[key]
+                continue
+            canonical.setdefault(key, node_id)
+            nodes[node_id] = node
+        
+        if not aliases:
+            return graph_data
+        
+        print(f"Optimizer: {len(aliases)} duplicate node(s) merged")
+        return self._with_nodes(graph_data, nodes)
+    
+    def _indicator_identity(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Parameters the generated indicator call depends on (ta.MACD runs with its default
+        periods, Bollinger Bands with the default 2 std, the RSI/MACD/BB extras are unused)"""
+        
+        indicator_type = parameters.get('indicator_type', 'EMA')
+        identity = {'indicator_type': indicator_type, 'source': parameters.get('source', 'close')}
+        if indicator_type in PERIOD_INDICATORS:
+            identity['period'] = parameters.get('period', 14)
+        return identity
+    
+    def _eliminate_dead_nodes(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop Indicator/Math/Logic nodes no Enter/Exit/Plot node depends on
+        
+        Informative MarketData nodes without consumers are dropped as well (their frame
+        would be loaded and merged for nothing); the base MarketData node, signal, plot and
+        hyperopt nodes always stay. Returns a new graph_data; the input is not modified.
+        """
+        
+        reachable = set()
+        pending = [node['id'] for node in graph_data['enter_nodes'] + graph_data['exit_nodes'] + graph_data['plot_nodes']]
+        while pending:
+            node_id = pending.pop()
+            if node_id in reachable or node_id not in graph_data['nodes']:
+                continue
+            reachable.add(node_id)
+            for connections in graph_data['nodes'][node_id]['inputs'].values():
+                pending.extend(connection['node_id'] for connection in connections)
+        
+        frames = self._informative_frames(graph_data)
+        dead = [
+            node_id for node_id, node in graph_data['nodes'].items()
+            if node_id not in reachable and (any(kind in node['type'] for kind in ('Indicator', 'Math', 'Logic'))
+                                             or node_id in frames)
+        ]
+        if not dead:
+            return graph_data
+        
+        print(f"Optimizer: {len(dead)} unused node(s) skipped")
+        return self._with_nodes(graph_data, {node_id: node for node_id, node in graph_data['nodes'].items()
+                                             if node_id not in dead})
+    
+    def _with_nodes(self, graph_data: Dict[str, Any], nodes: Dict[str, Dict]) -> Dict[str, Any]:
+        """graph_data restricted to (possibly rewritten) nodes, keeping the execution order"""
+        
+        optimized = dict(graph_data, nodes=nodes)
+        optimized['execution_order'] = [node_id for node_id in graph_data['execution_order'] if node_id in nodes]
+        for category in ('market_data_nodes', 'indicator_nodes', 'math_nodes', 'logic_nodes', 'enter_nodes',
+                         'exit_nodes', 'hyperopt_nodes', 'plot_nodes'):
+            optimized[category] = [nodes[node['id']] for node in graph_data[category] if node['id'] in nodes]
+        return optimized
+    
+    def _build_expressions(self, graph_data: Dict[str, Any]) -> Dict[str, tuple]:
+        """Simplified expression of every supported Math/Logic node, by node id
+        
+        Constant operands are folded and neutral operations (x + 0, x * 1, NOT NOT x,
+        x AND x, ...) reduce to their operand. A node reducing to a plain column is an
+        alias: no column is written for it and consumers read the aliased column.
+        Consumers of a node reducing to a constant use the value.
+        """
+        
+        expressions = {}
+        for node_id in graph_data['execution_order']:
+            node = graph_data['nodes'][node_id]
+            if 'Math' in node['type']:
+                expression = self._math_expression(node, graph_data, expressions)
+            elif 'Logic' in node['type']:
+                expression = self._logic_expression(node, graph_data, expressions)
+            else:
+                continue
+            if expression is not None:
+                expressions[node_id] = self._simplify_expression(expression)
+        return expressions
+    
+    def _fuse_expressions(self, graph_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Inline Math/Logic nodes read by exactly one other expression into their consumer
+        
+        A chain of nodes then becomes one column assignment instead of one full-length
+        column per node. Columns are still written for nodes read by several expressions
+        (computed once), by Enter/Exit/Plot nodes or after populate_indicators. Nodes read
+        by nothing (e.g. the inner NOT of a collapsed NOT NOT) write no column either.
+        Returns graph_data with the fused expressions and the ids of the nodes without a
+        column ('inlined').
+        """
+        
+        expressions = graph_data['expressions']
+        columns = {self._node_column(graph_data['nodes'][node_id]): node_id for node_id in expressions}
+        
+        references = defaultdict(int)
+        for expression in expressions.values():
+            if expression[0] != 'column':
+                for column in self._expression_columns(expression):
+                    references[columns.get(column)] += 1
+        
+        external = set()
+        for node in graph_data['enter_nodes'] + graph_data['exit_nodes'] + graph_data['plot_nodes']:
+            external.update(columns.get(column) for column in self._input_columns(node, graph_data))
+        
+        inlined = {node_id for node_id, expression in expressions.items()
+                   if expression[0] != 'column' and node_id not in external and references[node_id] <= 1}
+        
+        fused = {}
+        for node_id in graph_data['execution_order']:
+            expression = expressions.get(node_id)
+            if expression is not None:
+                # Aliases keep naming the column they read
+                fused[node_id] = (expression if expression[0] == 'column'
+                                  else self._inline_columns(expression, columns, fused, inlined))
+        return dict(graph_data, expressions=fused, inlined=inlined)
+    
+    def _inline_columns(self, expression: tuple, columns: Dict[str, str], fused: Dict[str, tuple],
+                        inlined: set) -> tuple:
+        """Replace the columns of inlined nodes by their expressions (re-simplified bottom-up)"""
+        
+        operator, operands = expression[0], expression[1:]
+        if operator == 'column':
+            node_id = columns.get(operands[0])
+            return fused[node_id] if node_id in inlined else expression
+        if operator == 'constant':
+            return expression
+        return self._simplify_expression(
+            (operator,) + tuple(self._inline_columns(operand, columns, fused, inlined) for operand in operands))
+    
+    def _expression_columns(self, expression: tuple) -> List[str]:
+        """Columns an expression reads (with repetitions)"""
+        
+        if expression[0] == 'column':
+            return [expression[1]]
+        if expression[0] == 'constant':
+            return []
+        return [column for operand in expression[1:] for column in self._expression_columns(operand)]
+    
+    def _node_column(self, node: Dict) -> str:
+        """Column a Math/Logic node is written to"""
+        
+        prefix = 'math' if 'Math' in node['type'] else 'logic'
+        return f"{prefix}_{node['id'].replace('-', '_')}"
+    
+    def _math_expression(self, node: Dict, graph_data: Dict, expressions: Dict[str, tuple]) -> tuple:
+        """Expression of a math node; B is the node's constant when use_constant is set or B is unconnected
+        
+        With a comparison set the node outputs the result compared with its threshold.
+        """
+        
+        params = node['parameters']
+        input_a = self._input_expression(node, 'A', graph_data, expressions)
+        input_b = None if params.get('use_constant') else self._input_expression(node, 'B', graph_data, expressions)
+        
+        if input_a is None:
+            input_a = ('constant', math.nan)
+        if input_b is None:
+            input_b = ('constant', float(params.get('constant', 0.0)))
+        expression = (MATH_OPERATORS.get(params.get('operation', 'add'), '+'), input_a, input_b)
+        
+        comparison = MATH_COMPARISONS.get(params.get('comparison', 'none'))
+        if comparison is not None:
+            expression = (comparison, self._simplify_expression(expression),
+                          ('constant', float(params.get('threshold', 0.0))))
+        return expression
+    
+    def _logic_expression(self, node: Dict, graph_data: Dict, expressions: Dict[str, tuple]) -> Optional[tuple]:
+        """Expression of a logic node, None for unsupported operations
+        
+        Comparisons test condition1 against condition2, or against the node's threshold
+        when condition2 is unconnected.
+        """
+        
+        operation = node['parameters'].get('operation', 'AND')
+        cond1 = self._input_expression(node, 'condition1', graph_data, expressions)
+        cond2 = self._input_expression(node, 'condition2', graph_data, expressions)
+        
+        if operation == 'AND' and cond1 and cond2:
+            return ('&', cond1, cond2)
+        elif operation == 'OR' and cond1 and cond2:
+            return ('|', cond1, cond2)
+        elif operation == 'NOT' and cond1:
+            # NOT of a NOT node is its operand
+            source = expressions.get(node['inputs']['condition1'][0]['node_id'])
+            return ('~', source if source is not None and source[0] == '~' else cond1)
+        elif operation in COMPARISON_OPERATORS and cond1:
+            if cond2 is None:
+                cond2 = ('constant', float(node['parameters'].get('threshold', 0.0)))
+            return (COMPARISON_OPERATORS[operation], cond1, cond2)
+        return None
+    
+    def _input_expression(self, node: Dict, input_name: str, graph_data: Dict,
+                          expressions: Dict[str, tuple]) -> Optional[tuple]:
+        """Expression of a node input: the source's column, or what an alias / constant source reduced to"""
+        
+        connections = node['inputs'].get(input_name)
+        if not connections:
+            return None
+        source = expressions.get(connections[0]['node_id'])
+        if source is not None and source[0] in ('column', 'constant'):
+            return source
+        return ('column', self._get_input_variable(node, input_name, graph_data))
+    
+    def _simplify_expression(self, expression: tuple) -> tuple:
+        """Fold constant operands and drop neutral operations (operands are already simplified)"""
+        
+        operator, operands = expression[0], expression[1:]
+        if operator in ('column', 'constant'):
+            return expression
+        
+        if all(operand[0] == 'constant' for operand in operands):
+            with np.errstate(all='ignore'):
+                value = CONSTANT_FOLDS[operator](*(operand[1] for operand in operands))
+            return ('constant', bool(value) if isinstance(value, np.bool_) else float(value))
+        
+        for identity_operator, constant, position in IDENTITY_OPERANDS:
+            if operator != identity_operator:
+                continue
+            neutral = operands[position]
+            if neutral[0] == 'constant' and not isinstance(neutral[1], bool) and neutral[1] == constant:
+                return operands[1 - position]
+        
+        if operator == '~' and operands[0][0] == '~':
+            return operands[0][1]
+        if operator in ('&', '|') and operands[0] == operands[1]:
+            return operands[0]
+        return expression
+    
+    def _render_expression(self, expression: tuple, nested: bool = False) -> str:
+        """Python source of an expression (nested: operand of an arithmetic or comparison operator)"""
+        
+        operator, operands = expression[0], expression[1:]
+        if operator == 'column':
+            return f"dataframe['{operands[0]}']"
+        if operator == 'constant':
+            value = operands[0]
+            if isinstance(value, float) and not math.isfinite(value):
+                return 'np.nan' if math.isnan(value) else ('np.inf' if value > 0 else '-np.inf')
+            return repr(value)
+        if operator in ('maximum', 'minimum'):
+            return f"np.{operator}({self._render_expression(operands[0])}, {self._render_expression(operands[1])})"
+        if operator == '~':
+            return f"~({self._render_expression(operands[0])})"
+        if operator in ('&', '|'):
+            return f"({self._render_expression(operands[0])}) {operator} ({self._render_expression(operands[1])})"
+        
+        code = f"{self._render_expression(operands[0], True)} {operator} {self._render_expression(operands[1], True)}"
+        return f"({code})" if nested else code
+    
     def _generate_imports(self, graph_data: Dict[str, Any]) -> List[str]:
         """Generate required imports based on nodes used"""
         
@@ -254,10 +706,13 @@ class StrategyExporter:
         # Add hyperopt imports if needed
         if graph_data['hyperopt_nodes']:
             imports.extend([
-                "from freqtrade.optimize.space import Categorical, Dimension, Integer, SKDecimal",
+                "from freqtrade.strategy import IntParameter, DecimalParameter, CategoricalParameter",
                 "from functools import reduce"
             ])
         
+        if self.indicator_cache and graph_data['indicator_nodes']:
+            imports.append(INDICATOR_CACHE_IMPORT)
+        
         return imports
     
     def _generate_hyperopt_params(self, graph_data: Dict[str, Any]) -> List[str]:
@@ -270,111 +725,522 @@ class StrategyExporter:
             param_type = node['parameters'].get('param_type', 'Integer')
             min_val = node['parameters'].get('min_value', 0)
             max_val = node['parameters'].get('max_value', 100)
+            step = node['parameters'].get('step', 1)
             choices = node['parameters'].get('choices', [])
+            default = self._hyperopt_default(node['parameters'])
+            
+            options = "space='buy'"
+            if not node['parameters'].get('optimize', True):
+                options += ", optimize=False"
             
             if param_type == 'Integer':
-                params.append(f"    {param_name} = Integer({min_val}, {max_val}, default={(min_val + max_val) // 2}, space='buy')")
+                params.append(f"    {param_name} = IntParameter({int(min_val)}, {int(max_val)}, default={default}, {options})")
             elif param_type == 'Real':
-                params.append(f"    {param_name} = SKDecimal({min_val}, {max_val}, default={(min_val + max_val) / 2}, space='buy')")
+                # Decimal places follow the step size (DecimalParameter defaults to 3)
+                if step and 0 < step < 1:
+                    options = f"decimals={-math.floor(math.log10(step))}, {options}"
+                params.append(f"    {param_name} = DecimalParameter({float(min_val)}, {float(max_val)}, default={default}, {options})")
             elif param_type == 'Categorical' and choices:
-                params.append(f"    {param_name} = Categorical({choices}, default='{choices[0]}', space='buy')")
+                params.append(f"    {param_name} = CategoricalParameter({choices!r}, default={default!r}, {options})")
         
         return params
     
-    def _generate_indicators(self, graph_data: Dict[str, Any]) -> List[str]:
-        """Generate indicator calculations"""
+    def _hyperopt_default(self, parameters: Dict[str, Any]) -> Any:
+        """Default value of a hyperopt parameter: default_value when inside the range, else the midpoint"""
+        
+        param_type = parameters.get('param_type', 'Integer')
+        min_val = parameters.get('min_value', 0)
+        max_val = parameters.get('max_value', 100)
+        default = parameters.get('default_value')
+        
+        if param_type == 'Categorical':
+            choices = parameters.get('choices', [])
+            return default if default in choices else (choices[0] if choices else None)
+        
+        if not isinstance(default, (int, float)) or not min_val <= default <= max_val:
+            default = (min_val + max_val) / 2
+        return int(round(default)) if param_type == 'Integer' else float(default)
+    
+    def _hyperopt_period_source(self, node: Dict, graph_data: Dict) -> Optional[Dict]:
+        """Hyperopt node connected to an indicator's period input, if any"""
+        
+        for connection in node['inputs'].get('period', []):
+            source_node = graph_data['nodes'].get(connection['node_id'])
+            if source_node is not None and 'Hyperopt' in source_node['type']:
+                return source_node
+        return None
+    
+    def _base_market_node(self, graph_data: Dict[str, Any]) -> Dict:
+        """MarketData node of the strategy timeframe: the lowest timeframe (the first node on a tie)"""
+        return min(graph_data['market_data_nodes'],
+                   key=lambda node: timeframe_to_timedelta(node['parameters'].get('timeframe', '1h')))
+    
+    def _market_source(self, node: Dict, graph_data: Dict) -> Optional[str]:
+        """Id of the MarketData node connected to one of the node's inputs, if any"""
+        
+        for connections in node['inputs'].values():
+            for connection in connections:
+                source_node = graph_data['nodes'].get(connection['node_id'])
+                if source_node is not None and 'MarketData' in source_node['type']:
+                    return source_node['id']
+        return None
+    
+    def _informative_frames(self, graph_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Informative candle frames by MarketData node id
+        
+        MarketData nodes with another pair or timeframe than the base node read the
+        candles of their pair/timeframe; indicators on them are computed there and merged
+        into the base dataframe at candle close with the column suffix 'suffix'. Nodes
+        of the same pair/timeframe share one frame; 'pair' is None for the traded pair.
+        """
+        
+        if not graph_data['market_data_nodes']:
+            return {}
+        
+        base_params = self._base_market_node(graph_data)['parameters']
+        base_key = (base_params.get('pair', 'BTC/USDT'), base_params.get('timeframe', '1h'))
+        
+        frames = {}
+        by_key = {}
+        for node in graph_data['market_data_nodes']:
+            key = (node['parameters'].get('pair', 'BTC/USDT'), node['parameters'].get('timeframe', '1h'))
+            if key == base_key:
+                continue
+            if key not in by_key:
+                pair, timeframe = key
+                asset = None if pair == base_key[0] else pair
+                suffix = timeframe if asset is None else f"{pair.replace('/', '_').replace(':', '_').lower()}_{timeframe}"
+                by_key[key] = {'pair': asset, 'timeframe': timeframe, 'suffix': suffix, 'frame': f"informative_{suffix}"}
+            frames[node['id']] = by_key[key]
+        return frames
+    
+    def _max_lookback(self, graph_data: Dict[str, Any]) -> int:
+        """Candles the entry/exit signals need before their values are valid (startup_candle_count)
+        
+        Lookbacks propagate through the graph in execution order, in base candles: a
+        node needs the largest lookback of its inputs plus its own, so paths take the
+        maximum and windows along a chain add up. Only what the generated code computes
+        counts: indicator calls read the candles and need their TA-Lib lookback
+        (hyperopt-driven periods with the largest value of their range), Math/Logic
+        nodes are element-wise. Values of an informative frame are merged once the
+        candle they come from has closed.
+        """
+        
+        frames = self._informative_frames(graph_data)
+        base_timeframe = (self._base_market_node(graph_data)['parameters'].get('timeframe', '1h')
+                          if graph_data['market_data_nodes'] else '1h')
+        
+        lookbacks = {}
+        for node_id in graph_data['execution_order']:
+            node = graph_data['nodes'][node_id]
+            
+            if 'Indicator' in node['type'] or 'MarketData' in node['type']:
+                lookback = self._indicator_lookback(node, graph_data) if 'Indicator' in node['type'] else 0
+                frame = frames.get(node_id) or frames.get(self._market_source(node, graph_data))
+                if frame is not None:
+                    # The value of informative candle n is merged when candle n closes
+                    ratio = timeframe_to_timedelta(frame['timeframe']) / timeframe_to_timedelta(base_timeframe)
+                    lookback = math.ceil((lookback + 1) * ratio) - 1
+            else:
+                lookback = max((lookbacks.get(connection['node_id'], 0)
+                                for connections in node['inputs'].values() for connection in connections), default=0)
+            lookbacks[node_id] = lookback
+        
+        return max((lookbacks.get(node['id'], 0) for node in graph_data['enter_nodes'] + graph_data['exit_nodes']),
+                   default=0)
+    
+    def _indicator_lookback(self, node: Dict, graph_data: Dict) -> int:
+        """Leading candles without a value of the generated indicator call (TA-Lib lookback)"""
+        
+        params = node['parameters']
+        indicator_type = params.get('indicator_type', 'EMA')
+        
+        if indicator_type == 'MACD':
+            # ta.MACD defaults: slow EMA 26, then the signal EMA 9 of the MACD line
+            return (26 - 1) + (9 - 1)
+        if indicator_type not in PERIOD_INDICATORS:
+            return 0
+        
+        period = int(params.get('period', 14))
+        hyperopt_node = self._hyperopt_period_source(node, graph_data)
+        if hyperopt_node is not None:
+            period = int(hyperopt_node['parameters'].get('max_value', period))
+        # RSI starts from the first price change
+        return period if indicator_type == 'RSI' else period - 1
+    
+    def _plan_period_links(self, graph_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Decide per hyperopt-driven indicator whether all candidate periods are precomputed
+        
+        Integer parameters are precomputed while their candidate columns fit into
+        PRECOMPUTE_COLUMN_BUDGET (smallest ranges first), everything else is computed
+        per epoch from the parameter value.
+        """
+        
+        frames = self._informative_frames(graph_data)
+        links = {}
+        for node in graph_data['indicator_nodes']:
+            hyperopt_node = self._hyperopt_period_source(node, graph_data)
+            if hyperopt_node is None or node['parameters'].get('indicator_type', 'EMA') not in PERIOD_INDICATORS:
+                continue
+            # Informative frames are computed once in populate_indicators (parameter default)
+            if self._market_source(node, graph_data) in frames:
+                continue
+            
+            params = hyperopt_node['parameters']
+            candidates = None
+            if params.get('param_type', 'Integer') == 'Integer':
+                candidates = int(params.get('max_value', 100)) - int(params.get('min_value', 0)) + 1
+            
+            links[node['id']] = {
+                'param': params.get('param_name', 'param'),
+                'param_type': params.get('param_type', 'Integer'),
+                'candidates': candidates,
+                'columns': candidates * len(self._indicator_columns(node, 'period')[1]) if candidates else None,
+                'precompute': False
+            }
+        
+        budget = PRECOMPUTE_COLUMN_BUDGET
+        for node_id, link in sorted(links.items(), key=lambda item: item[1]['columns'] or math.inf):
+            if link['columns'] is not None and link['columns'] <= budget:
+                link['precompute'] = True
+                budget -= link['columns']
+            else:
+                print(f"Hyperopt: {graph_data['nodes'][node_id]['name']} period ({link['param']}) "
+                      f"will be computed per epoch - range too large to precompute")
+        
+        return links
+    
+    def _generate_indicators(self, graph_data: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Generate indicator calculations
+        
+        Returns (populate_indicators lines, lines depending on hyperopt parameters). The
+        latter run at the start of populate_entry_trend, which freqtrade calls for every
+        epoch, while populate_indicators only runs once per hyperopt.
+        """
         
         indicators = []
+        parameter_indicators = []
+        links = self._plan_period_links(graph_data)
+        frames = self._informative_frames(graph_data)
+        informative = {}
+        dependent = set()
         
         # Process nodes in execution order
         for node_id in graph_data['execution_order']:
             node = graph_data['nodes'][node_id]
             
+            # Downstream of a hyperopt-driven indicator the values change per epoch
+            if node_id in links or any(connection['node_id'] in dependent
+                                       for connections in node['inputs'].values()
+                                       for connection in connections):
+                dependent.add(node_id)
+            target = parameter_indicators if node_id in dependent else indicators
+            
             if 'Indicator' in node['type']:
-                indicator_code = self._generate_indicator_code(node, graph_data)
-                if indicator_code:
-                    indicators.append(indicator_code)
+                link = links.get(node_id)
+                frame = frames.get(self._market_source(node, graph_data))
+                if frame is not None:
+                    hyperopt_node = self._hyperopt_period_source(node, graph_data)
+                    period = str(self._hyperopt_default(hyperopt_node['parameters'])) if hyperopt_node else None
+                    informative.setdefault(frame['frame'], (frame, []))[1].append(
+                        self._generate_indicator_code(node, graph_data, period, frame['frame']))
+                elif link is not None and link['precompute']:
+                    indicators.append(self._generate_precompute_code(node, link))
+                    parameter_indicators.append(self._generate_precompute_selection(node, link))
+                elif link is not None:
+                    period = f"self.{link['param']}.value"
+                    if link['param_type'] != 'Integer':
+                        period = f"int({period})"
+                    parameter_indicators.append(self._generate_indicator_code(node, graph_data, period))
+                else:
+                    indicator_code = self._generate_indicator_code(node, graph_data)
+                    if indicator_code:
+                        target.append(indicator_code)
             elif 'Math' in node['type']:
                 math_code = self._generate_math_code(node, graph_data)
                 if math_code:
-                    indicators.append(math_code)
+                    target.append(math_code)
             elif 'Logic' in node['type']:
                 logic_code = self._generate_logic_code(node, graph_data)
                 if logic_code:
-                    indicators.append(logic_code)
+                    target.append(logic_code)
+        
+        # Cached indicator calls key on the candles, fingerprinted once per populate_* call
+        for lines in (indicators, parameter_indicators):
+            if any('cached_indicator(' in line for line in lines):
+                lines.insert(0, "        fingerprint = data_fingerprint(dataframe)")
+        
+        if self.prune_columns:
+            pruning = self._generate_column_pruning(graph_data, dependent, links)
+            if pruning:
+                indicators.append(pruning)
+        
+        # Informative frames are merged before any base column reads them
+        indicators[0:0] = [self._generate_informative_code(frame, lines) for frame, lines in informative.values()]
+        
+        # Candle repair runs first, so indicators and fingerprints see the repaired candles
+        preprocessing = self._generate_preprocessing_code(graph_data)
+        if preprocessing:
+            indicators.insert(0, preprocessing)
+        
+        return indicators, parameter_indicators
+    
+    def _generate_preprocessing_code(self, graph_data: Dict[str, Any]) -> Optional[str]:
+        """Data-quality repair of the MarketData node (use_ohlcv_preprocessing)
+        
+        Emits the masks of data_quality.repair_candles for freqtrade's dataframe. Gap
+        filling and timestamp rounding are left to freqtrade, which fills missing candles
+        itself and expects populate_indicators to keep the rows.
+        """
+        
+        if not graph_data['market_data_nodes']:
+            return None
+        settings = preprocessing_settings(self._base_market_node(graph_data)['parameters'])
+        if not settings['use_ohlcv_preprocessing'] or not (
+                settings['validate_data'] or settings['volume_filter_enabled'] or settings['remove_outliers']):
+            return None
+        
+        lines = [
+            "        # Data quality: flatten invalid / zero-volume / outlier candles at the previous close",
+            "        prices = dataframe[['open', 'high', 'low', 'close']]",
+            "        masked = pd.Series(False, index=dataframe.index)"
+        ]
+        if settings['validate_data']:
+            lines += [
+                "        masked |= ~np.isfinite(prices).all(axis=1) | (dataframe['low'] <= 0)",
+                "        masked |= (dataframe['high'] < prices[['open', 'close']].max(axis=1))",
+                "        masked |= (dataframe['low'] > prices[['open', 'close']].min(axis=1))",
+                "        masked |= ~(dataframe['volume'] >= 0)"
+            ]
+        if settings['volume_filter_enabled']:
+            lines.append("        masked |= dataframe['volume'] <= 0")
+        if settings['remove_outliers']:
+            min_periods = OUTLIER_WINDOW // 5
+            lines += [
+                "        log_close = np.log(dataframe['close'])",
+                f"        median = log_close.rolling({OUTLIER_WINDOW}, min_periods={min_periods}).median()",
+                f"        limit = {OUTLIER_MADS * MAD_SCALE!r} * (log_close - median).abs()"
+                f".rolling({OUTLIER_WINDOW}, min_periods={min_periods}).median()",
+                "        deviation = np.log(prices).sub(median, axis=0).abs().max(axis=1)",
+                "        masked |= (limit > 0) & (deviation > limit)"
+            ]
+        lines += [
+            "        flat = dataframe['close'].where(~masked).ffill().bfill()",
+            "        for column in ['open', 'high', 'low', 'close']:",
+            "            dataframe[column] = dataframe[column].mask(masked, flat)",
+            "        dataframe['volume'] = dataframe['volume'].mask(masked & ~(dataframe['volume'] >= 0), 0.0)"
+        ]
+        return "\n".join(lines)
+    
+    def _generate_column_pruning(self, graph_data: Dict[str, Any], dependent: set,
+                                 links: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """Drop the columns populate_indicators only needs internally
+        
+        Columns read after populate_indicators (by signals, plots and the per-epoch
+        parameter columns) stay, as do precomputed candidate columns. Dropping them keeps
+        freqtrade's per-pair dataframes small when many pairs are traded.
+        """
+        
+        frames = self._informative_frames(graph_data)
+        
+        needed = set()
+        for node in graph_data['enter_nodes'] + graph_data['exit_nodes'] + graph_data['plot_nodes']:
+            needed.update(self._input_columns(node, graph_data))
+        for node_id in dependent:
+            needed.update(self._input_columns(graph_data['nodes'][node_id], graph_data))
+            # A fused per-epoch expression also reads the inputs of the nodes inlined into it
+            expression = graph_data['expressions'].get(node_id)
+            if expression is not None:
+                needed.update(self._expression_columns(expression))
+        
+        columns = []
+        for frame in {frame['frame']: frame for frame in frames.values()}.values():
+            columns += [f"{column}_{frame['suffix']}" for column in ('date', 'open', 'high', 'low', 'close', 'volume')]
+        for node_id in graph_data['execution_order']:
+            node = graph_data['nodes'][node_id]
+            alias = graph_data['expressions'].get(node_id)
+            if (node_id in dependent or node_id in links or node_id in graph_data['inlined']
+                    or (alias is not None and alias[0] == 'column')):
+                continue
+            var_id = node_id.replace('-', '_')
+            if 'Indicator' in node['type']:
+                frame = frames.get(self._market_source(node, graph_data))
+                suffix = f"_{frame['suffix']}" if frame else ''
+                columns += [f"indicator_{var_id}{column_suffix}{suffix}"
+                            for column_suffix in self._indicator_calls(node, 'period')[1]]
+            elif 'Math' in node['type']:
+                columns.append(f"math_{var_id}")
+            elif 'Logic' in node['type']:
+                columns.append(f"logic_{var_id}")
         
-        return indicators
+        columns = [column for column in columns if column not in needed]
+        if not columns:
+            return None
+        return ("        # Intermediate columns only used above\n"
+                f"        dataframe = dataframe.drop(columns={columns!r}, errors='ignore')")
+    
+    def _input_columns(self, node: Dict, graph_data: Dict) -> List[str]:
+        """Dataframe columns a node reads through its inputs"""
+        
+        columns = []
+        for input_name in node['inputs']:
+            column = self._get_input_variable(node, input_name, graph_data)
+            if column:
+                columns.append(column)
+        return columns
     
-    def _generate_indicator_code(self, node: Dict, graph_data: Dict) -> str:
-        """Generate code for indicator node"""
+    def _generate_informative_code(self, frame: Dict[str, Any], lines: List[str]) -> str:
+        """Load an informative frame, compute its indicators and merge it into the dataframe
+        
+        merge_informative_pair shifts the informative dates to the candle close, so a
+        candle's values are used from the first base candle after it closed.
+        """
+        
+        timeframe = frame['timeframe']
+        pair = f"'{frame['pair']}'" if frame['pair'] else "metadata['pair']"
+        code = [
+            f"        # Informative {timeframe} candles{' of ' + frame['pair'] if frame['pair'] else ''}, merged at candle close",
+            f"        {frame['frame']} = self.dp.get_pair_dataframe(pair={pair}, timeframe='{timeframe}')"
+        ]
+        if any('cached_indicator(' in line for line in lines):
+            code.append(f"        {frame['frame']}_fingerprint = data_fingerprint({frame['frame']})")
+        code += lines
+        
+        merge = f"merge_informative_pair(dataframe, {frame['frame']}, self.timeframe, '{timeframe}', ffill=True"
+        if frame['pair']:
+            merge += f", append_timeframe=False, suffix='{frame['suffix']}'"
+        code.append(f"        dataframe = {merge})")
+        return "\n".join(code)
+    
+    def _generate_informative_pairs(self, graph_data: Dict[str, Any]) -> List[str]:
+        """Body lines of informative_pairs() for the informative frames"""
+        
+        lines = []
+        frames = {frame['frame']: frame for frame in self._informative_frames(graph_data).values()}
+        for frame in frames.values():
+            if frame['pair']:
+                lines.append(f"        informative.append(('{frame['pair']}', '{frame['timeframe']}'))")
+            else:
+                lines.append(f"        informative += [(pair, '{frame['timeframe']}') for pair in pairs]")
+        return lines
+    
+    def _indicator_columns(self, node: Dict, period: str, frame: str = 'dataframe') -> Tuple[List[str], Dict[str, str]]:
+        """Setup statements and {column suffix: expression} of an indicator for a period expression
+        
+        With indicator_cache the indicator call (the setup statement, else the column
+        expression) is wrapped in cached_indicator, keyed by the call text and period.
+        frame is the dataframe variable the indicator reads (an informative frame or dataframe).
+        """
+        
+        setup, columns = self._indicator_calls(node, period, frame)
+        if not self.indicator_cache or not columns:
+            return setup, columns
+        
+        key_setup, key_columns = self._indicator_calls(node, 'period', frame)
+        params = "{'period': " + period + "}" if 'period' in ''.join(key_setup) + ''.join(key_columns.values()) else "{}"
+        fingerprint = 'fingerprint' if frame == 'dataframe' else f"{frame}_fingerprint"
+        
+        def cached(key_expression: str, expression: str) -> str:
+            return f"cached_indicator({fingerprint}, {key_expression!r}, {params}, lambda: {expression})"
+        
+        if not setup:
+            return [], {suffix: cached(key_columns[suffix], expression) for suffix, expression in columns.items()}
+        
+        cached_setup = []
+        for statement, key_statement in zip(setup, key_setup):
+            target, expression = statement.split(' = ', 1)
+            cached_setup.append(f"{target} = {cached(key_statement.split(' = ', 1)[1], expression)}")
+        return cached_setup, columns
+    
+    def _indicator_calls(self, node: Dict, period: str, frame: str = 'dataframe') -> Tuple[List[str], Dict[str, str]]:
+        """Plain (uncached) indicator setup statements and column expressions"""
         
         indicator_type = node['parameters'].get('indicator_type', 'EMA')
-        period = node['parameters'].get('period', 14)
         source = node['parameters'].get('source', 'close')
         
-        var_name = f"indicator_{node['id'].replace('-', '_')}"
-        
-        if indicator_type == 'EMA':
-            return f"        dataframe['{var_name}'] = ta.EMA(dataframe['{source}'], timeperiod={period})"
-        elif indicator_type == 'SMA':
-            return f"        dataframe['{var_name}'] = ta.SMA(dataframe['{source}'], timeperiod={period})"
-        elif indicator_type == 'RSI':
-            return f"        dataframe['{var_name}'] = ta.RSI(dataframe['{source}'], timeperiod={period})"
+        if indicator_type in ('EMA', 'SMA', 'RSI'):
+            return [], {'': f"ta.{indicator_type}({frame}['{source}'], timeperiod={period})"}
         elif indicator_type == 'MACD':
-            return f"        macd = ta.MACD(dataframe['{source}'])\n        dataframe['{var_name}'] = macd['macd']"
+            return [f"macd = ta.MACD({frame}['{source}'])"], {'': "macd['macd']"}
         elif indicator_type == 'Bollinger Bands':
-            return f"        bollinger = qtpylib.bollinger_bands(dataframe['{source}'], window={period})\n        dataframe['{var_name}_upper'] = bollinger['upper']\n        dataframe['{var_name}_middle'] = bollinger['mid']\n        dataframe['{var_name}_lower'] = bollinger['lower']"
-        else:
-            return f"        # TODO: Implement {indicator_type} indicator"
+            return [f"bollinger = qtpylib.bollinger_bands({frame}['{source}'], window={period})"], {
+                '_upper': "bollinger['upper']",
+                '_middle': "bollinger['mid']",
+                '_lower': "bollinger['lower']"
+            }
+        return [], {}
     
-    def _generate_math_code(self, node: Dict, graph_data: Dict) -> str:
-        """Generate code for math node"""
+    def _generate_indicator_code(self, node: Dict, graph_data: Dict, period: str = None,
+                                 frame: str = 'dataframe') -> str:
+        """Generate code for indicator node (period: expression overriding the node's period,
+        frame: dataframe variable the column is computed on)"""
         
-        operation = node['parameters'].get('operation', 'add')
-        constant = node['parameters'].get('constant', 0.0)
+        indicator_type = node['parameters'].get('indicator_type', 'EMA')
+        if period is None:
+            period = str(node['parameters'].get('period', 14))
         
-        var_name = f"math_{node['id'].replace('-', '_')}"
+        var_name = f"indicator_{node['id'].replace('-', '_')}"
+        
+        setup, columns = self._indicator_columns(node, period, frame)
+        if not columns:
+            return f"        # TODO: Implement {indicator_type} indicator"
         
-        # Get input variable names
-        input_a = self._get_input_variable(node, 'A', graph_data)
-        input_b = self._get_input_variable(node, 'B', graph_data)
+        lines = [f"        {statement}" for statement in setup]
+        lines += [f"        {frame}['{var_name}{suffix}'] = {expression}" for suffix, expression in columns.items()]
+        return "\n".join(lines)
+    
+    def _generate_precompute_code(self, node: Dict, link: Dict[str, Any]) -> str:
+        """Compute an indicator for every candidate period of its hyperopt parameter
         
-        if not input_b:
-            input_b = str(constant)
+        IntParameter.range yields all candidates while hyperopting and only the current
+        value otherwise, so backtests still compute a single column.
+        """
         
-        operations_map = {
-            'add': '+',
-            'subtract': '-',
-            'multiply': '*',
-            'divide': '/',
-            'power': '**'
-        }
+        var_name = f"indicator_{node['id'].replace('-', '_')}"
+        setup, columns = self._indicator_columns(node, 'period')
         
-        op_symbol = operations_map.get(operation, '+')
+        lines = [
+            f"        # {var_name} for every {link['param']} candidate, selected per epoch in populate_entry_trend",
+            f"        precomputed = {{}}",
+            f"        for period in self.{link['param']}.range:"
+        ]
+        lines += [f"            {statement}" for statement in setup]
+        lines += [f"            precomputed[f'{var_name}{suffix}_{{period}}'] = {expression}"
+                  for suffix, expression in columns.items()]
+        lines.append("        dataframe = pd.concat([dataframe, pd.DataFrame(precomputed, index=dataframe.index)], axis=1)")
+        return "\n".join(lines)
+    
+    def _generate_precompute_selection(self, node: Dict, link: Dict[str, Any]) -> str:
+        """Select the precomputed column for the current parameter value"""
         
-        if operation in ['max', 'min']:
-            return f"        dataframe['{var_name}'] = np.{operation}(dataframe['{input_a}'], dataframe['{input_b}'])"
-        else:
-            return f"        dataframe['{var_name}'] = dataframe['{input_a}'] {op_symbol} dataframe['{input_b}']"
+        var_name = f"indicator_{node['id'].replace('-', '_')}"
+        _, columns = self._indicator_columns(node, 'period')
+        return "\n".join(
+            f"        dataframe['{var_name}{suffix}'] = dataframe[f'{var_name}{suffix}_{{self.{link['param']}.value}}']"
+            for suffix in columns
+        )
+    
+    def _generate_math_code(self, node: Dict, graph_data: Dict) -> str:
+        """Generate code for math node (nothing for aliases and inlined nodes)"""
+        
+        var_name = f"math_{node['id'].replace('-', '_')}"
+        expression = graph_data['expressions'][node['id']]
+        if expression[0] == 'column' or node['id'] in graph_data['inlined']:
+            return ""
+        return f"        dataframe['{var_name}'] = {self._render_expression(expression)}"
     
     def _generate_logic_code(self, node: Dict, graph_data: Dict) -> str:
-        """Generate code for logic node"""
+        """Generate code for logic node (nothing for aliases and inlined nodes)"""
         
         operation = node['parameters'].get('operation', 'AND')
         var_name = f"logic_{node['id'].replace('-', '_')}"
         
-        # Get input variable names
-        cond1 = self._get_input_variable(node, 'condition1', graph_data)
-        cond2 = self._get_input_variable(node, 'condition2', graph_data)
-        
-        if operation == 'AND' and cond1 and cond2:
-            return f"        dataframe['{var_name}'] = (dataframe['{cond1}']) & (dataframe['{cond2}'])"
-        elif operation == 'OR' and cond1 and cond2:
-            return f"        dataframe['{var_name}'] = (dataframe['{cond1}']) | (dataframe['{cond2}'])"
-        elif operation == 'NOT' and cond1:
-            return f"        dataframe['{var_name}'] = ~(dataframe['{cond1}'])"
-        else:
+        expression = graph_data['expressions'].get(node['id'])
+        if expression is None:
             return f"        # TODO: Implement {operation} logic operation"
+        if expression[0] == 'column' or node['id'] in graph_data['inlined']:
+            return ""
+        return f"        dataframe['{var_name}'] = {self._render_expression(expression)}"
     
     def _generate_entry_signals(self, graph_data: Dict[str, Any]) -> List[str]:
         """Generate entry signal code"""
@@ -456,16 +1322,27 @@ class StrategyExporter:
         source_node_id = connection['node_id']
         source_node = graph_data['nodes'][source_node_id]
         
+        # Columns of informative frames carry the frame suffix after the merge
+        frames = self._informative_frames(graph_data)
+        
+        # Math/Logic nodes simplified to an alias read the aliased column
+        alias = graph_data.get('expressions', {}).get(source_node_id)
+        if alias is not None and alias[0] == 'column':
+            return alias[1]
+        
         # Generate variable name based on source node type
         if 'Indicator' in source_node['type']:
-            return f"indicator_{source_node_id.replace('-', '_')}"
+            frame = frames.get(self._market_source(source_node, graph_data))
+            var_name = f"indicator_{source_node_id.replace('-', '_')}"
+            return f"{var_name}_{frame['suffix']}" if frame else var_name
         elif 'Math' in source_node['type']:
             return f"math_{source_node_id.replace('-', '_')}"
         elif 'Logic' in source_node['type']:
             return f"logic_{source_node_id.replace('-', '_')}"
         elif 'MarketData' in source_node['type']:
             source = source_node['parameters'].get('source', 'close')
-            return source
+            frame = frames.get(source_node_id)
+            return f"{source}_{frame['suffix']}" if frame else source
         else:
             return f"var_{source_node_id.replace('-', '_')}"
     
@@ -511,7 +1388,7 @@ class {{ strategy_name }}(IStrategy):
     ignore_roi_if_entry_signal = False
     
     # Number of candles the strategy requires before producing valid signals
-    startup_candle_count: int = 30
+    startup_candle_count: int = {{ startup_candle_count }}
     
 {% if hyperopt_params %}
     # Hyperopt parameters
@@ -526,7 +1403,18 @@ class {{ strategy_name }}(IStrategy):
             config = {}
         super().__init__(config)
 
-    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
+{% if informative_pairs %}    def informative_pairs(self):
+        """
+        Pair/timeframe combinations of the informative Market Data nodes
+        """
+        pairs = self.dp.current_whitelist() if self.dp else []
+        informative = []
+{% for line in informative_pairs %}
+{{ line }}
+{% endfor %}
+        return informative
+
+{% endif %}    def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         """
         Adds several different TA indicators to the given DataFrame
         """
@@ -544,7 +1432,12 @@ class {{ strategy_name }}(IStrategy):
         dataframe['enter_long'] = 0
         dataframe['enter_short'] = 0
         
-{% for signal in entry_signals %}
+{% if parameter_indicators %}        # Columns depending on hyperopt parameters (recomputed for every epoch)
+{% for indicator in parameter_indicators %}
+{{ indicator }}
+{% endfor %}
+        
+{% endif %}{% for signal in entry_signals %}
 {{ signal }}
 {% endfor %}
         
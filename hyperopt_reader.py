@@ -0,0 +1,208 @@
+"""
+Hyperopt reader - tails freqtrade's hyperopt results file while epochs are written
+
+freqtrade appends one JSON line per evaluated epoch to
+user_data/hyperopt_results/strategy_<name>_<timestamp>.fthypt. The reader keeps a
+byte offset into that file and only decodes lines appended since the last poll,
+each epoch is reduced to its params and headline metrics, and a bounded heap
+keeps the best N epochs, so a long run costs one epoch of memory per line read.
+"""
+
+import heapq
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+
+# Metrics kept per epoch from results_metrics (trades and per-pair tables are dropped)
+EPOCH_METRICS = (
+    'total_trades', 'profit_total', 'profit_total_abs', 'profit_mean', 'sharpe', 'sortino',
+    'calmar', 'profit_factor', 'winrate', 'max_drawdown_account', 'holding_avg'
+)
+
+
+def epoch_summary(epoch: Dict[str, Any]) -> Dict[str, Any]:
+    """Params and headline metrics of one decoded hyperopt epoch"""
+
+    metrics = epoch.get('results_metrics') or {}
+    return {
+        'epoch': epoch.get('current_epoch'),
+        'loss': float(epoch.get('loss', float('inf'))),
+        'is_best': bool(epoch.get('is_best', False)),
+        'is_random': bool(epoch.get('is_random', False)),
+        'params': epoch.get('params_dict', {}),
+        'metrics': {key: metrics[key] for key in EPOCH_METRICS if key in metrics},
+        'explanation': epoch.get('results_explanation', '')
+    }
+
+
+class HyperoptLeaderboard:
+    """Best N epochs by loss (lower is better), kept in a bounded heap"""
+
+    def __init__(self, size: int = 10):
+        self.size = size
+        # Max-heap on loss via negated keys: the root is the worst kept epoch,
+        # ties keep the earlier epoch
+        self._heap = []
+        self.epochs_seen = 0
+
+    def add(self, summary: Dict[str, Any]) -> bool:
+        """Offer an epoch; returns True if it made the leaderboard"""
+
+        self.epochs_seen += 1
+        item = (-summary['loss'], -(summary['epoch'] or 0), self.epochs_seen, summary)
+
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+            return True
+
+        if item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+            return True
+        return False
+
+    @property
+    def best(self) -> Optional[Dict[str, Any]]:
+        return max(self._heap)[3] if self._heap else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Kept epochs, best first"""
+        return [item[3] for item in sorted(self._heap, reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class HyperoptEpochReader:
+    """Incremental reader of a hyperopt results file (.fthypt, one JSON epoch per line)"""
+
+    def __init__(self, results_dir: Path, strategy_name: str, since: float = None):
+        self.results_dir = Path(results_dir)
+        self.strategy_name = strategy_name
+        self.since = since
+        self.results_file: Optional[Path] = None
+        self._offset = 0
+        self._partial = b''
+
+    def find_results_file(self) -> Optional[Path]:
+        """Newest results file of the strategy written since the run started"""
+
+        if self.results_file is None and self.results_dir.exists():
+            candidates = [
+                path for path in self.results_dir.glob(f"strategy_{self.strategy_name}_*.fthypt")
+                if self.since is None or path.stat().st_mtime >= self.since
+            ]
+            if candidates:
+                self.results_file = max(candidates, key=lambda path: path.stat().st_mtime_ns)
+        return self.results_file
+
+    def read_new_epochs(self) -> List[Dict[str, Any]]:
+        """Decode the epochs appended since the previous call"""
+
+        results_file = self.find_results_file()
+        if results_file is None:
+            return []
+
+        try:
+            with open(results_file, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+        except OSError:
+            return []
+
+        if not data:
+            return []
+        self._offset += len(data)
+
+        # The last line may still be in the middle of being written
+        lines = (self._partial + data).split(b'\n')
+        self._partial = lines.pop()
+
+        epochs = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                epochs.append(epoch_summary(json.loads(line)))
+            except ValueError as e:
+                print(f"⚠️ Пропущена поврежденная эпоха hyperopt: {e}")
+        return epochs
+
+
+class HyperoptMonitor:
+    """Polls a HyperoptEpochReader in a background thread and feeds a leaderboard
+
+    on_epoch gets one event per epoch: epoch, total_epochs, loss, best_loss, is_best,
+    rank (position on the leaderboard or None), params, metrics and the leaderboard.
+    """
+
+    def __init__(self, reader: HyperoptEpochReader, total_epochs: int = None,
+                 on_epoch: Callable[[Dict[str, Any]], None] = None,
+                 leaderboard_size: int = 10, interval: float = 1.0):
+        self.reader = reader
+        self.total_epochs = total_epochs
+        self.on_epoch = on_epoch
+        self.leaderboard = HyperoptLeaderboard(leaderboard_size)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> 'HyperoptMonitor':
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling and read whatever was written since the last poll"""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.poll()
+
+    def poll(self) -> int:
+        """Process new epochs; returns how many were read"""
+
+        with self._lock:
+            epochs = self.reader.read_new_epochs()
+            for summary in epochs:
+                kept = self.leaderboard.add(summary)
+                if self.on_epoch is not None:
+                    self.on_epoch(self._epoch_event(summary, kept))
+            return len(epochs)
+
+    def results(self) -> Dict[str, Any]:
+        """Best epoch and leaderboard in the runner's hyperopt result format"""
+
+        best = self.leaderboard.best
+        return {
+            'best_params': dict(best['params']) if best else {},
+            'best_result': dict(best['metrics'], loss=best['loss'], epoch=best['epoch']) if best else {},
+            'leaderboard': self.leaderboard.entries(),
+            'epochs_read': self.leaderboard.epochs_seen,
+            'results_file': str(self.reader.results_file) if self.reader.results_file else None
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️ Ошибка чтения эпох hyperopt: {e}")
+
+    def _epoch_event(self, summary: Dict[str, Any], kept: bool) -> Dict[str, Any]:
+        entries = self.leaderboard.entries()
+        rank = next((i + 1 for i, entry in enumerate(entries) if entry is summary), None) if kept else None
+        return {
+            'epoch': summary['epoch'] or self.leaderboard.epochs_seen,
+            'total_epochs': self.total_epochs,
+            'loss': summary['loss'],
+            'best_loss': entries[0]['loss'],
+            'is_best': summary['is_best'],
+            'rank': rank,
+            'params': summary['params'],
+            'metrics': summary['metrics'],
+            'leaderboard': entries
+        }
@@ -0,0 +1,201 @@
+"""
+Indicator cache - persistent on-disk cache of computed indicator columns
+
+Indicator values only depend on the candles and the indicator parameters, so each
+computed column is stored under user_data/indicator_cache as a .npy file keyed by a
+fingerprint of the candle data plus the indicator expression and parameters, and is
+read back memory-mapped. Entries are shared by every process using the directory
+(preview, GUI sessions, freqtrade running generated strategies); the least recently
+used ones are evicted once the directory grows past its size budget.
+
+Generated strategies use it through cached_indicator/data_fingerprint:
+
+    fingerprint = data_fingerprint(dataframe)
+    dataframe['ema'] = cached_indicator(fingerprint, "ta.EMA(dataframe['close'], timeperiod=10)", {},
+                                        lambda: ta.EMA(dataframe['close'], timeperiod=10))
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Union
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / 'user_data' / 'indicator_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Candle columns the data fingerprint is computed from
+FINGERPRINT_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume')
+
+CachedValue = Union[np.ndarray, Dict[str, np.ndarray]]
+
+
+def data_fingerprint(candles: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> str:
+    """Content hash of the candle columns (same candles give the same fingerprint in any process)"""
+
+    digest = hashlib.blake2b(digest_size=16)
+    length = len(candles['close'])
+    digest.update(str(length).encode('ascii'))
+
+    for column in FINGERPRINT_COLUMNS:
+        if column not in candles:
+            continue
+        values = candles[column]
+        values = values.values if isinstance(values, pd.Series) else np.asarray(values)
+        if values.dtype.kind == 'M':
+            values = values.astype('datetime64[ns]').view(np.int64)
+        elif values.dtype.kind == 'O':
+            values = pd.to_datetime(values, utc=True).asi8
+        digest.update(column.encode('ascii'))
+        digest.update(np.ascontiguousarray(values).view(np.uint8))
+
+    return digest.hexdigest()
+
+
+def _as_arrays(value: Any) -> CachedValue:
+    """Indicator result as a float array, or a dict of float arrays for multi-output indicators"""
+
+    if isinstance(value, pd.DataFrame):
+        return {str(name): value[name].to_numpy(dtype=float) for name in value.columns}
+    if isinstance(value, dict):
+        return {str(name): np.asarray(column, dtype=float) for name, column in value.items()}
+    return np.asarray(value, dtype=float)
+
+
+class IndicatorCache:
+    """Directory of memory-mapped indicator columns with LRU eviction by total size"""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def key(self, fingerprint: str, expression: str, params: Dict[str, Any] = None) -> str:
+        payload = json.dumps([fingerprint, expression, params or {}], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedValue]:
+        """Memory-mapped entry, or None"""
+
+        path = self._path(key)
+        try:
+            values = np.load(path, mmap_mode='r')
+            # The file mtime is the LRU clock
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        if values.dtype.names:
+            return {name: values[name] for name in values.dtype.names}
+        return values
+
+    def put(self, key: str, value: CachedValue) -> None:
+        """Store an entry (atomically: readers never see a partial file)"""
+
+        if isinstance(value, dict):
+            first = next(iter(value.values()))
+            values = np.empty(len(first), dtype=[(name, np.float64) for name in value])
+            for name, column in value.items():
+                values[name] = column
+        else:
+            values = np.asarray(value, dtype=np.float64)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
+            np.save(f, values)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += values.nbytes
+            over_budget = self._size is None or self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def get_or_compute(self, fingerprint: Optional[str], expression: str, params: Dict[str, Any],
+                       compute: Callable[[], Any]) -> CachedValue:
+        """Cached value of an indicator expression, computed and stored on a miss"""
+
+        if fingerprint is None:
+            return _as_arrays(compute())
+
+        key = self.key(fingerprint, expression, params)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        value = _as_arrays(compute())
+        try:
+            self.put(key, value)
+        except OSError as e:
+            print(f"⚠️ Не удалось сохранить индикатор в кэш: {e}")
+        return value
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the directory fits max_bytes; returns the count"""
+
+        entries = []
+        for entry in os.scandir(self.cache_dir) if self.cache_dir.exists() else []:
+            if entry.name.endswith('.npy'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Still mapped on a platform that refuses the delete - try again next time
+                continue
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._size = total
+        return removed
+
+    def clear(self) -> None:
+        self.max_bytes, max_bytes = 0, self.max_bytes
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+
+_default_cache: Optional[IndicatorCache] = None
+
+
+def default_cache() -> IndicatorCache:
+    """Process-wide cache on the default directory"""
+
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache()
+    return _default_cache
+
+
+def cached_indicator(fingerprint: Optional[str], expression: str, params: Dict[str, Any],
+                     compute: Callable[[], Any]) -> CachedValue:
+    """Helper for generated strategies: default_cache().get_or_compute(...)"""
+    return default_cache().get_or_compute(fingerprint, expression, params, compute)
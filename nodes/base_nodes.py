@@ -112,7 +112,7 @@ class MarketDataNode(BaseStrategyNode):
         
         # Additional market data parameters
         self.set_parameter('data_quality_threshold', 0.95)  # Minimum data quality threshold
-        self.set_parameter('max_gap_minutes', 30)  # Maximum gap in minutes between candles
+        self.set_parameter('max_gap_minutes', 30)  # Missing minutes above which a gap is reported as large
         self.set_parameter('timezone', 'UTC')  # Timezone for data processing
         self.set_parameter('round_timestamps', True)  # Round timestamps to timeframe
         self.set_parameter('backtest_start_date', '')  # Custom backtest start date
@@ -134,6 +134,9 @@ class IndicatorNode(BaseStrategyNode):
         # Input port for candles data
         self.add_input('candles', color=(255, 255, 255))
         
+        # Optional period input (connect a Hyperopt Param node to optimize the period)
+        self.add_input('period', color=(255, 215, 0))
+        
         # Output port for indicator values
         self.add_output('values', color=(255, 255, 0))
         
@@ -197,8 +200,8 @@ class MathNode(BaseStrategyNode):
         self.set_parameter('constant', 0.0)
         self.set_parameter('use_constant', False)  # Use constant instead of input B
         
-        # Comparison operations
-        self.set_parameter('comparison', 'greater')  # greater, less, equal, greater_equal, less_equal
+        # Comparison of the result with threshold (boolean output)
+        self.set_parameter('comparison', 'none')  # none, greater, less, equal, greater_equal, less_equal
         self.set_parameter('threshold', 0.0)
         
         # Signal processing
@@ -236,7 +239,8 @@ class LogicNode(BaseStrategyNode):
         self.add_output('result', color=(0, 255, 0))
         
         # Default parameters
-        self.set_parameter('operation', 'AND')  # AND, OR, NOT, XOR, NAND, NOR
+        self.set_parameter('operation', 'AND')  # AND, OR, NOT, XOR, NAND, NOR, greater_than, less_than, ...
+        self.set_parameter('threshold', 0.0)  # Comparisons: condition1 vs threshold when condition2 is unconnected
         self.set_parameter('use_condition3', False)  # Enable third condition
         
         # Signal filters
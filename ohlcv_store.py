@@ -0,0 +1,230 @@
+"""
+OHLCV store - memory-mapped access to the local feather candle files
+
+freqtrade's feather files are Arrow IPC files. The store memory-maps them and hands
+out read-only NumPy views of the requested columns, sliced by timerange with a
+binary search on the date column, so callers only touch the pages they read and
+threads share the same memory. Files whose columns cannot be mapped directly
+(compressed, or split into several record batches) are rewritten once into an
+uncompressed single-batch copy under user_data/data_cache, which is mapped instead.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+DEFAULT_DATA_DIR = Path(__file__).parent / 'user_data' / 'data'
+
+OHLCV_COLUMNS = ('date', 'open', 'high', 'low', 'close', 'volume')
+
+TIMEFRAME_UNITS = {'m': 'min', 'h': 'h', 'd': 'D', 'w': 'W'}
+
+
+def parse_timerange(timerange: Optional[str]) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+    """Parse a freqtrade style timerange ('20250401-20250630', '20250401-', '-20250630')"""
+
+    if not timerange:
+        return None, None
+
+    start_str, sep, stop_str = timerange.partition('-')
+    if not sep:
+        raise ValueError(f"Invalid timerange: {timerange}")
+
+    def _parse(value: str) -> Optional[pd.Timestamp]:
+        if not value:
+            return None
+        if value.isdigit() and len(value) == 8:
+            return pd.Timestamp(datetime.strptime(value, '%Y%m%d'), tz='UTC')
+        if value.isdigit():
+            # Unix timestamp (seconds or milliseconds)
+            seconds = int(value) / 1000 if len(value) > 10 else int(value)
+            return pd.Timestamp(datetime.fromtimestamp(seconds, tz=timezone.utc))
+        raise ValueError(f"Invalid timerange: {timerange}")
+
+    return _parse(start_str), _parse(stop_str)
+
+
+def timeframe_to_timedelta(timeframe: str) -> pd.Timedelta:
+    """Candle length of a freqtrade timeframe string ('5m', '1h', '1d', ...)"""
+
+    match = re.fullmatch(r'(\d+)([mhdw])', timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return pd.Timedelta(int(match.group(1)), unit=TIMEFRAME_UNITS[match.group(2)])
+
+
+def data_file_path(pair: str, timeframe: str, exchange: str = 'binance',
+                   data_dir: Path = DEFAULT_DATA_DIR) -> Path:
+    """Return the feather file path freqtrade uses for a pair/timeframe"""
+    return Path(data_dir) / exchange / f"{pair.replace('/', '_')}-{timeframe}.feather"
+
+
+def _timestamp_ns(value) -> int:
+    """UTC nanoseconds of a date (naive dates are taken as UTC)"""
+    timestamp = pd.Timestamp(value)
+    return (timestamp if timestamp.tzinfo else timestamp.tz_localize('UTC')).value
+
+
+class MappedCandles:
+    """One memory-mapped candle file: column views and the date column as int64 ns"""
+
+    def __init__(self, path: Path, stat: os.stat_result, batch: pa.RecordBatch, mapped_path: Path):
+        self.path = path
+        self.signature = (stat.st_size, stat.st_mtime_ns)
+        self.mapped_path = mapped_path
+        self._batch = batch
+        self._columns: Dict[str, np.ndarray] = {}
+        self.dates_ns = self.column('date').view(np.int64)
+
+    def __len__(self):
+        return self._batch.num_rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a column (datetime64[ns] UTC for 'date')"""
+
+        values = self._columns.get(name)
+        if values is None:
+            if name not in self._batch.schema.names:
+                raise KeyError(f"No column {name} in {self.path}")
+            values = self._batch.column(name).to_numpy(zero_copy_only=True)
+            if values.dtype.kind == 'M':
+                values = values.astype('datetime64[ns]', copy=False)
+            self._columns[name] = values
+        return values
+
+    def bounds(self, start=None, end=None) -> Tuple[int, int]:
+        """Row slice [first, last) of the dates within [start, end] (both inclusive)"""
+
+        first = 0 if start is None else int(np.searchsorted(self.dates_ns, _timestamp_ns(start), side='left'))
+        last = len(self) if end is None else int(np.searchsorted(self.dates_ns, _timestamp_ns(end), side='right'))
+        return first, max(first, last)
+
+
+class OHLCVStore:
+    """Memory-mapped candle files of a data directory, shared by every caller in the process"""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR, cache_dir: Path = None):
+        self.data_dir = Path(data_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.data_dir.parent / 'data_cache'
+        self._files: Dict[Path, MappedCandles] = {}
+        self._lock = threading.Lock()
+
+    def open(self, pair: str, timeframe: str, exchange: str = 'binance') -> MappedCandles:
+        """Mapped candles of a pair/timeframe (re-mapped when the file changed)"""
+
+        path = data_file_path(pair, timeframe, exchange, self.data_dir)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No data found for {pair} {timeframe}: {path}") from None
+
+        with self._lock:
+            mapped = self._files.get(path)
+            if mapped is None or mapped.signature != (stat.st_size, stat.st_mtime_ns):
+                mapped = self._map(path, stat)
+                self._files[path] = mapped
+        return mapped
+
+    def load(self, pair: str, timeframe: str, exchange: str = 'binance',
+             columns: Iterable[str] = OHLCV_COLUMNS, timerange: Optional[str] = None,
+             start=None, end=None) -> Dict[str, np.ndarray]:
+        """Read-only views of the requested columns, sliced by timerange or start/end (inclusive)"""
+
+        if timerange:
+            start, end = parse_timerange(timerange)
+
+        mapped = self.open(pair, timeframe, exchange)
+        first, last = mapped.bounds(start, end)
+        return {name: mapped.column(name)[first:last] for name in columns}
+
+    def frame(self, pair: str, timeframe: str, exchange: str = 'binance',
+              columns: Iterable[str] = OHLCV_COLUMNS, timerange: Optional[str] = None) -> pd.DataFrame:
+        """Slice as a DataFrame (with a UTC date column) for pandas based callers"""
+
+        views = self.load(pair, timeframe, exchange, columns, timerange)
+        if 'date' in views:
+            views['date'] = pd.DatetimeIndex(views['date']).tz_localize('UTC')
+        return pd.DataFrame(views)
+
+    def date_range(self, pair: str, timeframe: str, exchange: str = 'binance') -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last candle date, or None for an empty file"""
+
+        dates = self.open(pair, timeframe, exchange).dates_ns
+        if not len(dates):
+            return None
+        return pd.Timestamp(dates[0], tz='UTC'), pd.Timestamp(dates[-1], tz='UTC')
+
+    def _map(self, path: Path, stat: os.stat_result) -> MappedCandles:
+        batch = self._map_file(path)
+        if batch is not None:
+            return MappedCandles(path, stat, batch, path)
+
+        # Decompress / combine once into a mappable copy named after the source version
+        copy_path = self.cache_dir / path.parent.name / f"{path.stem}.{stat.st_size}.{stat.st_mtime_ns}.arrow"
+        batch = self._map_file(copy_path) if copy_path.exists() else None
+        if batch is None:
+            self._write_mappable_copy(path, copy_path)
+            batch = self._map_file(copy_path)
+        return MappedCandles(path, stat, batch, copy_path)
+
+    def _map_file(self, path: Path) -> Optional[pa.RecordBatch]:
+        """The file's single record batch if all its buffers point into the mapping, else None"""
+
+        source = pa.memory_map(str(path), 'r')
+        reader = ipc.open_file(source)
+        if reader.num_record_batches != 1:
+            return None
+
+        batch = reader.get_batch(0)
+        source.seek(0)
+        region = source.read_buffer(source.size())
+        lower, upper = region.address, region.address + region.size
+        for column in batch.columns:
+            for buffer in column.buffers():
+                if buffer is not None and buffer.size and not lower <= buffer.address < upper:
+                    return None
+        return batch
+
+    def _write_mappable_copy(self, path: Path, copy_path: Path) -> None:
+        with pa.memory_map(str(path), 'r') as source:
+            table = ipc.open_file(source).read_all().combine_chunks()
+
+        copy_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = copy_path.with_name(f"{copy_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with ipc.new_file(str(temp_path), table.schema) as writer:
+            batches = table.to_batches(max_chunksize=max(table.num_rows, 1))
+            writer.write_batch(batches[0] if batches else pa.RecordBatch.from_pylist([], schema=table.schema))
+        os.replace(temp_path, copy_path)
+
+        # Copies of older versions of the same file
+        for stale in copy_path.parent.glob(f"{path.stem}.*.arrow"):
+            if stale != copy_path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        print(f"🗜  Несжатая копия для mmap: {copy_path.name}")
+
+
+_stores: Dict[Path, OHLCVStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(data_dir: Path = DEFAULT_DATA_DIR) -> OHLCVStore:
+    """Process-wide store of a data directory (mappings are shared by all its users)"""
+
+    data_dir = Path(data_dir).resolve()
+    with _stores_lock:
+        store = _stores.get(data_dir)
+        if store is None:
+            store = _stores[data_dir] = OHLCVStore(data_dir)
+        return store
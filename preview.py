@@ -0,0 +1,566 @@
+"""
+Signal preview - evaluates node graphs in-process on local OHLCV data
+
+Walks the same graph_data / execution order the exporter produces and computes
+entry/exit masks with NumPy, so a graph can be checked without starting freqtrade.
+Node outputs are memoized by a key of the node's parameters, its upstream keys and
+the data slice, so after an edit only the changed node and its downstream nodes
+are recomputed; indicator columns also go through the on-disk IndicatorCache, so
+they are reused across sessions. Candles go through the MarketData node's
+data-quality preprocessing (data_quality.preprocess_candles) before evaluation.
+Indicators on informative MarketData nodes (higher timeframe or another pair) are
+computed on those candles and joined to the base candles with one as-of index per
+frame, aligned at candle close like merge_informative_pair.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cancellation import CancelToken
+from data_quality import preprocess_candles, preprocessing_settings, processed_fingerprint
+from exporter import StrategyExporter
+from indicator_cache import IndicatorCache, data_fingerprint
+from ohlcv_store import DEFAULT_DATA_DIR, get_store, timeframe_to_timedelta
+from resampler import ensure_timeframe
+
+
+# Same operator mapping as the exporter's MATH_OPERATORS
+MATH_OPERATIONS = {
+    'add': np.add,
+    'subtract': np.subtract,
+    'multiply': np.multiply,
+    'divide': np.divide,
+    'power': np.power,
+    'max': np.maximum,
+    'min': np.minimum
+}
+
+# Same comparisons as the exporter's COMPARISON_OPERATORS (logic nodes)
+COMPARISON_OPERATIONS = {
+    'greater_than': np.greater,
+    'less_than': np.less,
+    'greater_equal': np.greater_equal,
+    'less_equal': np.less_equal,
+    'equal': np.equal
+}
+
+# Same as the exporter's MATH_COMPARISONS (MathNode comparison against its threshold)
+MATH_COMPARISONS = dict(COMPARISON_OPERATIONS, greater=np.greater, less=np.less)
+
+# Candle slices kept by SignalPreviewEngine (base plus informative frames)
+CANDLE_SLICES = 4
+
+
+def load_ohlcv(pair: str, timeframe: str, exchange: str = 'binance',
+               timerange: Optional[str] = None, data_dir: Path = DEFAULT_DATA_DIR) -> pd.DataFrame:
+    """Load OHLCV candles from the local feather store, optionally sliced by timerange"""
+    return get_store(data_dir).frame(pair, timeframe, exchange, timerange=timerange)
+
+
+def _source_values(candles: Dict[str, np.ndarray], source: str) -> np.ndarray:
+    """Resolve an indicator source name to a price array"""
+
+    if source in candles:
+        return candles[source]
+    if source == 'hl2':
+        return (candles['high'] + candles['low']) / 2
+    if source == 'hlc3':
+        return (candles['high'] + candles['low'] + candles['close']) / 3
+    if source == 'ohlc4':
+        return (candles['open'] + candles['high'] + candles['low'] + candles['close']) / 4
+    raise ValueError(f"Unknown price source: {source}")
+
+
+def _seeded_ewm(values: np.ndarray, period: int, alpha: float, first: int = 0) -> np.ndarray:
+    """Recursive moving average seeded with the SMA of the first window (TA-Lib convention)"""
+
+    result = np.full(len(values), np.nan)
+    seed_index = first + period - 1
+    if period < 1 or seed_index >= len(values):
+        return result
+
+    seeded = values.astype(float, copy=True)
+    seeded[:seed_index] = np.nan
+    seeded[seed_index] = np.mean(values[first:seed_index + 1])
+
+    result[seed_index:] = pd.Series(seeded[seed_index:]).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average matching ta.EMA"""
+    return _seeded_ewm(values, period, 2.0 / (period + 1))
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average matching ta.SMA"""
+    return pd.Series(values).rolling(period).mean().to_numpy()
+
+
+def rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI matching ta.RSI"""
+
+    result = np.full(len(values), np.nan)
+    if period < 1 or len(values) <= period:
+        return result
+
+    delta = np.diff(values, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    avg_gain = _seeded_ewm(gains, period, 1.0 / period, first=1)
+    avg_loss = _seeded_ewm(losses, period, 1.0 / period, first=1)
+
+    total = avg_gain + avg_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = np.where(total > 0, 100.0 * avg_gain / total, 0.0)
+    result[np.isnan(total)] = np.nan
+    return result
+
+
+def macd(values: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD line, signal and histogram"""
+
+    line = ema(values, fast) - ema(values, slow)
+    signal_line = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(line))
+    if len(valid):
+        signal_line[valid[0]:] = ema(line[valid[0]:], signal)
+
+    return {'macd': line, 'macdsignal': signal_line, 'macdhist': line - signal_line}
+
+
+def bollinger_bands(values: np.ndarray, window: int = 20, stds: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands matching qtpylib.bollinger_bands"""
+
+    rolling = pd.Series(values).rolling(window)
+    mid = rolling.mean().to_numpy()
+    std = rolling.std(ddof=0).to_numpy()
+
+    return {'upper': mid + std * stds, 'mid': mid, 'lower': mid - std * stds}
+
+
+def node_keys(graph_data: Dict[str, Any], data_key: Any = None) -> Dict[str, str]:
+    """Content key per node: type, parameters and the keys of its upstream nodes
+
+    Keys are computed in execution order, so a node's key changes exactly when the
+    node itself or anything upstream of it changed; node ids are not part of the key.
+    """
+
+    keys = {}
+    for node_id in graph_data['execution_order']:
+        node = graph_data['nodes'][node_id]
+        inputs = {
+            input_name: [(keys.get(connection['node_id']), connection.get('port_name'))
+                         for connection in connections]
+            for input_name, connections in node['inputs'].items()
+        }
+        payload = json.dumps([node['type'], node['parameters'], inputs, data_key], sort_keys=True, default=str)
+        keys[node_id] = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    return keys
+
+
+def asof_index(dates: np.ndarray, informative_dates: np.ndarray, informative_timeframe: str,
+               timeframe: str) -> np.ndarray:
+    """Row of the informative candle joined to each candle (-1: none yet)
+
+    Same alignment as merge_informative_pair: an informative candle is used from the
+    candle starting one base candle before its close, i.e. once it has closed. Like its
+    exact-date merge plus forward fill, candles made available before the first base
+    candle are not carried into the data.
+    """
+
+    shift = (timeframe_to_timedelta(informative_timeframe) - timeframe_to_timedelta(timeframe)).value
+    available = informative_dates.view(np.int64) + shift
+    dates = dates.view(np.int64)
+    index = np.searchsorted(available, dates, side='right') - 1
+    if len(dates):
+        index[(index >= 0) & (available[index] < dates[0])] = -1
+    return index
+
+
+def _take_asof(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """values[index] with NaN where no informative candle is available yet"""
+    return np.where(index >= 0, np.asarray(values, dtype=float)[index], np.nan)
+
+
+# Preview implementations by indicator type: (source values, period) -> column or named columns
+PREVIEW_INDICATORS = {
+    'EMA': ema,
+    'SMA': sma,
+    'RSI': rsi,
+    # The exporter calls ta.MACD with its default periods
+    'MACD': lambda values, period: macd(values)['macd'],
+    'Bollinger Bands': lambda values, period: bollinger_bands(values, window=period)
+}
+
+
+class SignalPreviewEngine:
+    """Evaluates analyzed graphs on local candles and produces entry/exit masks"""
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR, indicator_cache: IndicatorCache = None):
+        self.data_dir = Path(data_dir)
+        self.exporter = StrategyExporter()
+        self.indicator_cache = indicator_cache or IndicatorCache(self.data_dir.parent / 'indicator_cache')
+        # Outputs of the last evaluation by node key: (column, extra columns by suffix)
+        self._node_cache: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]] = {}
+        # Recently loaded candle slices by slice key: (fingerprint, dates, candles, data quality report)
+        self._candles_cache: Dict[Any, Tuple[str, np.ndarray, Dict[str, np.ndarray], Dict[str, Any]]] = {}
+        # A preempted preview thread may still be running on the same engine
+        self._cache_lock = threading.Lock()
+
+    def preview_graph(self, graph, timerange: Optional[str] = None) -> Dict[str, Any]:
+        """Preview signals for a live NodeGraphQt graph"""
+
+        nodes = graph.all_nodes()
+        if not nodes:
+            raise ValueError("Graph is empty - add some nodes first")
+
+        return self.preview_graph_data(self.exporter._analyze_graph(nodes), timerange)
+
+    def preview_strategy_dict(self, strategy_data: Dict[str, Any], timerange: Optional[str] = None) -> Dict[str, Any]:
+        """Preview signals for a JSON strategy definition"""
+        return self.preview_graph_data(self.exporter._analyze_graph_dict(strategy_data), timerange)
+
+    def preview_graph_data(self, graph_data: Dict[str, Any], timerange: Optional[str] = None,
+                           cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Preview signals for already analyzed graph_data
+        
+        Raises JobCancelled between nodes once cancel_token fires (a newer preview preempts it).
+        """
+
+        started = time.perf_counter()
+
+        self.exporter._validate_graph(graph_data)
+
+        market_params = self.exporter._base_market_node(graph_data)['parameters']
+        pair = market_params.get('pair', 'BTC/USDT')
+        timeframe = market_params.get('timeframe', '1h')
+        exchange = market_params.get('exchange', 'binance')
+        settings = preprocessing_settings(market_params)
+
+        data_key, dates, candles, quality = self._load_candles(pair, timeframe, exchange, timerange, settings)
+        informative = self._load_informative(graph_data, pair, timeframe, exchange, timerange, dates)
+        if informative:
+            fingerprints = sorted({frame['fingerprint'] for frame in informative.values()})
+            data_key = hashlib.sha1(json.dumps([data_key] + fingerprints).encode('utf-8')).hexdigest()
+        loaded = time.perf_counter()
+
+        stats = {}
+        columns = self.evaluate(graph_data, candles, cancel_token, data_key, stats, informative)
+        signals = self._evaluate_signals(graph_data, columns, len(dates))
+        finished = time.perf_counter()
+
+        return {
+            'success': True,
+            'pair': pair,
+            'timeframe': timeframe,
+            'informative_timeframes': sorted({frame['timeframe'] for frame in informative.values()}),
+            'timerange': timerange,
+            'candles': len(dates),
+            'dates': dates,
+            'columns': columns,
+            'signals': signals,
+            'signal_counts': {name: int(mask.sum()) for name, mask in signals.items()},
+            'data_quality': quality,
+            'nodes_evaluated': stats.get('evaluated', 0),
+            'nodes_cached': stats.get('cached', 0),
+            'load_ms': (loaded - started) * 1000,
+            'eval_ms': (finished - loaded) * 1000
+        }
+
+    def evaluate(self, graph_data: Dict[str, Any], candles: Dict[str, np.ndarray],
+                 cancel_token: CancelToken = None, data_key: Any = None,
+                 stats: Dict[str, int] = None,
+                 informative: Dict[str, Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """Evaluate every node output in execution order, keyed by node id
+
+        With a data_key identifying the candles (their data_fingerprint), outputs of nodes
+        whose key is unchanged since the previous evaluation are reused; only the dirty
+        subgraph is computed, and indicators are looked up in the on-disk cache first.
+        stats (if given) receives the evaluated / cached node counts. informative maps
+        informative MarketData node ids to their frame (see _load_informative).
+        """
+
+        columns = {}
+        informative = informative or {}
+        keys = node_keys(graph_data, data_key) if data_key is not None else {}
+        with self._cache_lock:
+            previous = self._node_cache
+        cache = {}
+        evaluated = cached = 0
+
+        for node_id in graph_data['execution_order']:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+            node = graph_data['nodes'][node_id]
+            node_type = node['type']
+            if not any(kind in node_type for kind in ('Indicator', 'Math', 'Logic')):
+                continue
+
+            key = keys.get(node_id)
+            # Identical nodes earlier in this graph count as well
+            hit = (cache.get(key) or previous.get(key)) if key is not None else None
+            if hit is not None:
+                column, extras = hit
+                cached += 1
+            else:
+                before = set(columns)
+                frame = informative.get(self.exporter._market_source(node, graph_data))
+                if 'Indicator' in node_type and frame is not None:
+                    column = self._evaluate_informative_indicator(node, graph_data, frame, columns)
+                elif 'Indicator' in node_type:
+                    column = self._evaluate_indicator(node, graph_data, candles, columns, data_key)
+                elif 'Math' in node_type:
+                    column = self._evaluate_math(node, graph_data, candles, columns, informative)
+                else:
+                    column = self._evaluate_logic(node, graph_data, candles, columns, informative)
+                # Extra output columns (e.g. Bollinger bands) are stored by suffix
+                extras = {name[len(node_id):]: columns[name] for name in set(columns) - before}
+                evaluated += 1
+
+            columns[node_id] = column
+            for suffix, values in extras.items():
+                columns[f"{node_id}{suffix}"] = values
+            if key is not None:
+                cache[key] = (column, extras)
+
+        # Keep only what this graph uses; a cancelled evaluation leaves the cache as it was
+        if data_key is not None:
+            with self._cache_lock:
+                self._node_cache = cache
+        if stats is not None:
+            stats.update(evaluated=evaluated, cached=cached)
+
+        return columns
+
+    def _load_candles(self, pair: str, timeframe: str, exchange: str, timerange: Optional[str],
+                      settings: Dict[str, Any]) -> Tuple[str, np.ndarray, Dict[str, np.ndarray], Dict[str, Any]]:
+        """Fingerprint, preprocessed candle arrays and data quality report of the preview slice,
+        reused while the data file and the preprocessing settings are unchanged"""
+
+        store = get_store(self.data_dir)
+        ensure_timeframe(pair, timeframe, exchange, self.data_dir)
+        mapped = store.open(pair, timeframe, exchange)
+        slice_key = (mapped.path, mapped.signature, timerange, json.dumps(settings, sort_keys=True))
+
+        with self._cache_lock:
+            cached = self._candles_cache.get(slice_key)
+        if cached is not None:
+            return cached
+
+        # Read-only views into the mapped file; preprocessing only copies the columns it changes
+        candles = store.load(pair, timeframe, exchange, timerange=timerange)
+        fingerprint = data_fingerprint(candles)
+        candles, quality = preprocess_candles(candles, timeframe, settings, fingerprint)
+        candles = dict(candles)
+        dates = candles.pop('date')
+        loaded = (processed_fingerprint(fingerprint, timeframe, settings), dates, candles, quality)
+        with self._cache_lock:
+            self._candles_cache[slice_key] = loaded
+            while len(self._candles_cache) > CANDLE_SLICES:
+                self._candles_cache.pop(next(iter(self._candles_cache)))
+        return loaded
+
+    def _load_informative(self, graph_data: Dict[str, Any], pair: str, timeframe: str, exchange: str,
+                          timerange: Optional[str], dates: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """Candles of the informative frames by MarketData node id
+
+        Each frame has its candles, fingerprint, timeframe and the as-of index joining it
+        to the base dates. Informative candles are loaded up to the end of the timerange
+        (with all earlier history, as warmup for their indicators).
+        """
+
+        until = f"-{timerange.partition('-')[2]}" if timerange and timerange.partition('-')[2] else None
+        loaded = {}
+        informative = {}
+        for market_id, frame in self.exporter._informative_frames(graph_data).items():
+            if frame['frame'] not in loaded:
+                frame_pair = frame['pair'] or pair
+                settings = preprocessing_settings(graph_data['nodes'][market_id]['parameters'])
+                fingerprint, frame_dates, frame_candles, _ = self._load_candles(
+                    frame_pair, frame['timeframe'], exchange, until, settings)
+                loaded[frame['frame']] = {
+                    'timeframe': frame['timeframe'],
+                    'candles': frame_candles,
+                    'fingerprint': fingerprint,
+                    'index': asof_index(dates, frame_dates, frame['timeframe'], timeframe)
+                }
+            informative[market_id] = loaded[frame['frame']]
+        return informative
+
+    def _input_values(self, node: Dict, input_name: str, graph_data: Dict,
+                      candles: Dict[str, np.ndarray], columns: Dict[str, np.ndarray],
+                      informative: Dict[str, Dict[str, Any]] = None) -> Optional[np.ndarray]:
+        """Resolve a node input to an array (mirrors StrategyExporter._get_input_variable)"""
+
+        connections = node['inputs'].get(input_name)
+        if not connections:
+            return None
+
+        source_node = graph_data['nodes'][connections[0]['node_id']]
+        if 'MarketData' in source_node['type']:
+            source = source_node['parameters'].get('source', 'close')
+            frame = (informative or {}).get(source_node['id'])
+            if frame is not None:
+                return _take_asof(_source_values(frame['candles'], source), frame['index'])
+            return _source_values(candles, source)
+
+        return columns.get(source_node['id'])
+
+    def _evaluate_indicator(self, node: Dict, graph_data: Dict, candles: Dict[str, np.ndarray],
+                            columns: Dict[str, np.ndarray], fingerprint: str = None) -> np.ndarray:
+        """Compute an indicator node (a hyperopt-driven period uses the parameter default)
+        
+        With the candles' fingerprint the column is read from / stored in the indicator cache.
+        """
+
+        indicator_type = node['parameters'].get('indicator_type', 'EMA')
+        period = int(node['parameters'].get('period', 14))
+        hyperopt_node = self.exporter._hyperopt_period_source(node, graph_data)
+        if hyperopt_node is not None:
+            period = int(self.exporter._hyperopt_default(hyperopt_node['parameters']))
+        source = node['parameters'].get('source', 'close')
+
+        if indicator_type not in PREVIEW_INDICATORS:
+            print(f"Warning: {indicator_type} indicator is not supported in preview")
+            return np.full(len(candles['close']), np.nan)
+
+        values = self.indicator_cache.get_or_compute(
+            fingerprint, f"preview.{indicator_type}",
+            {'source': source} if indicator_type == 'MACD' else {'period': period, 'source': source},
+            lambda: PREVIEW_INDICATORS[indicator_type](_source_values(candles, source), period)
+        )
+
+        if indicator_type == 'Bollinger Bands':
+            columns[f"{node['id']}_upper"] = values['upper']
+            columns[f"{node['id']}_middle"] = values['mid']
+            columns[f"{node['id']}_lower"] = values['lower']
+            return values['mid']
+        return values
+
+    def _evaluate_informative_indicator(self, node: Dict, graph_data: Dict, frame: Dict[str, Any],
+                                        columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Compute an indicator on informative candles and join its columns to the base candles"""
+
+        frame_columns = {}
+        values = self._evaluate_indicator(node, graph_data, frame['candles'], frame_columns, frame['fingerprint'])
+        for name, column in frame_columns.items():
+            columns[name] = _take_asof(column, frame['index'])
+        return _take_asof(values, frame['index'])
+
+    def _evaluate_math(self, node: Dict, graph_data: Dict, candles: Dict[str, np.ndarray],
+                       columns: Dict[str, np.ndarray], informative: Dict[str, Dict[str, Any]] = None) -> np.ndarray:
+        """Compute a math node"""
+
+        operation = node['parameters'].get('operation', 'add')
+        input_a = self._input_values(node, 'A', graph_data, candles, columns, informative)
+        input_b = None
+        if not node['parameters'].get('use_constant'):
+            input_b = self._input_values(node, 'B', graph_data, candles, columns, informative)
+
+        length = len(candles['close'])
+        if input_a is None:
+            return np.full(length, np.nan)
+        if input_b is None:
+            input_b = float(node['parameters'].get('constant', 0.0))
+
+        comparison = MATH_COMPARISONS.get(node['parameters'].get('comparison', 'none'))
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            values = MATH_OPERATIONS.get(operation, np.add)(input_a, input_b)
+            if comparison is not None:
+                values = comparison(values, float(node['parameters'].get('threshold', 0.0)))
+        return values
+
+    def _evaluate_logic(self, node: Dict, graph_data: Dict, candles: Dict[str, np.ndarray],
+                        columns: Dict[str, np.ndarray], informative: Dict[str, Dict[str, Any]] = None) -> np.ndarray:
+        """Compute a logic node"""
+
+        operation = node['parameters'].get('operation', 'AND')
+        cond1 = self._input_values(node, 'condition1', graph_data, candles, columns, informative)
+        cond2 = self._input_values(node, 'condition2', graph_data, candles, columns, informative)
+
+        if operation == 'AND' and cond1 is not None and cond2 is not None:
+            return _as_bool(cond1) & _as_bool(cond2)
+        elif operation == 'OR' and cond1 is not None and cond2 is not None:
+            return _as_bool(cond1) | _as_bool(cond2)
+        elif operation == 'NOT' and cond1 is not None:
+            return ~_as_bool(cond1)
+        elif operation in COMPARISON_OPERATIONS and cond1 is not None:
+            if cond2 is None:
+                cond2 = float(node['parameters'].get('threshold', 0.0))
+            with np.errstate(invalid='ignore'):
+                return COMPARISON_OPERATIONS[operation](cond1, cond2)
+
+        print(f"Warning: {operation} logic operation is not supported in preview")
+        return np.zeros(len(candles['close']), dtype=bool)
+
+    def _evaluate_signals(self, graph_data: Dict[str, Any], columns: Dict[str, np.ndarray],
+                          length: int) -> Dict[str, np.ndarray]:
+        """Build enter/exit masks with the same comparisons as the generated strategy"""
+
+        signals = {name: np.zeros(length, dtype=bool)
+                   for name in ('enter_long', 'enter_short', 'exit_long', 'exit_short')}
+
+        for direction, nodes in (('enter', graph_data['enter_nodes']), ('exit', graph_data['exit_nodes'])):
+            for node in nodes:
+                side = node['parameters'].get('side', 'long')
+                connections = node['inputs'].get('signal')
+                if not connections:
+                    continue
+
+                values = columns.get(connections[0]['node_id'])
+                if values is None:
+                    continue
+
+                values = np.asarray(values, dtype=float)
+                positive = np.nan_to_num(values, nan=0.0) > 0
+                negative = np.nan_to_num(values, nan=0.0) < 0
+
+                # Entries fire on positive values for longs, exits on negative values
+                long_mask, short_mask = (positive, negative) if direction == 'enter' else (negative, positive)
+                if side in ['long', 'both']:
+                    signals[f'{direction}_long'] |= long_mask
+                if side in ['short', 'both']:
+                    signals[f'{direction}_short'] |= short_mask
+
+        return signals
+
+
+def _as_bool(values: np.ndarray) -> np.ndarray:
+    """Convert a numeric or boolean column to a boolean mask (NaN is False)"""
+
+    if values.dtype == bool:
+        return values
+    return np.nan_to_num(values, nan=0.0) != 0
+
+
+def preview_signals(graph_data: Dict[str, Any], timerange: Optional[str] = None,
+                    data_dir: Path = DEFAULT_DATA_DIR) -> Dict[str, Any]:
+    """Headless entry point: evaluate analyzed graph_data and return signal masks and counts"""
+    return SignalPreviewEngine(data_dir).preview_graph_data(graph_data, timerange)
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    strategy_file = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("user_data/strategies/ema_rsi_demo.json")
+    timerange = sys.argv[2] if len(sys.argv) > 2 else None
+
+    with open(strategy_file, 'r') as f:
+        strategy_data = json.load(f)
+
+    result = SignalPreviewEngine().preview_strategy_dict(strategy_data, timerange)
+    print(f"{result['pair']} {result['timeframe']}: {result['candles']} candles, "
+          f"load {result['load_ms']:.1f} ms, eval {result['eval_ms']:.1f} ms")
+    for name, count in result['signal_counts'].items():
+        print(f"  {name}: {count}")
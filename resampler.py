@@ -0,0 +1,189 @@
+"""
+Resampler - builds higher-timeframe candle files from lower-timeframe local data
+
+OHLCV aggregation is exact: a 4h candle is the first open, highest high, lowest low,
+last close and summed volume of its 5m or 1h candles. When a pair has no file for a
+timeframe, ensure_timeframe aggregates one from a local file whose timeframe divides
+the requested one (whole-array reduceat passes over the memory-mapped source) and
+writes it next to the downloaded files, so freqtrade, the preview and the equity
+curve read it like any other data file. Derived files record the source file
+version in their Arrow schema metadata and are rebuilt when the source changes;
+downloaded files are never touched. The data directory is git-ignored, so derived
+files never show up as changes next to the versioned sample data.
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from ohlcv_store import DEFAULT_DATA_DIR, OHLCV_COLUMNS, data_file_path, get_store, timeframe_to_timedelta
+
+
+# Schema metadata key of derived files: {"source": file name, "size": ..., "mtime_ns": ...}
+RESAMPLED_METADATA_KEY = b'resampled_from'
+
+# Weekly candles start on Monday; the Unix epoch is a Thursday
+WEEK_OFFSET_NS = 4 * 86400 * 10**9
+
+_lock = threading.Lock()
+
+
+def resample_candles(candles: Dict[str, np.ndarray], timeframe: str,
+                     source_timeframe: str) -> Dict[str, np.ndarray]:
+    """Aggregate candle arrays (date as datetime64[ns] + OHLCV, sorted) to a higher timeframe
+
+    Incomplete candles at either end of the data (the source starts or stops inside a
+    candle) are dropped; gaps inside the data simply give candles from fewer rows.
+    """
+
+    target_ns = timeframe_to_timedelta(timeframe).value
+    source_ns = timeframe_to_timedelta(source_timeframe).value
+    offset = WEEK_OFFSET_NS if timeframe.endswith('w') else 0
+
+    dates = candles['date'].view(np.int64)
+    if not len(dates):
+        return {column: candles[column][:0] for column in OHLCV_COLUMNS}
+
+    starts = dates - (dates - offset) % target_ns
+    boundaries = np.flatnonzero(starts[1:] != starts[:-1]) + 1
+    first = np.concatenate([[0], boundaries])
+    last = np.concatenate([boundaries - 1, [len(dates) - 1]])
+
+    resampled = {
+        'date': starts[first].view('datetime64[ns]'),
+        'open': candles['open'][first],
+        'high': np.maximum.reduceat(candles['high'], first),
+        'low': np.minimum.reduceat(candles['low'], first),
+        'close': candles['close'][last],
+        'volume': np.add.reduceat(candles['volume'], first)
+    }
+
+    keep = slice(1 if dates[0] > starts[0] else 0,
+                 -1 if dates[-1] + source_ns < starts[-1] + target_ns else None)
+    return {column: values[keep] for column, values in resampled.items()}
+
+
+def local_timeframes(pair: str, exchange: str = 'binance', data_dir: Path = DEFAULT_DATA_DIR,
+                     include_derived: bool = False) -> Dict[str, Path]:
+    """Timeframes with a local file for a pair ({timeframe: path})"""
+
+    pair_file = pair.replace('/', '_')
+    pattern = re.compile(rf"{re.escape(pair_file)}-(\d+[mhdw])\.feather")
+    timeframes = {}
+    for path in (Path(data_dir) / exchange).glob(f"{pair_file}-*.feather"):
+        match = pattern.fullmatch(path.name)
+        if match and (include_derived or resampled_source(path) is None):
+            timeframes[match.group(1)] = path
+    return timeframes
+
+
+def resampled_source(path: Path) -> Optional[Dict[str, Any]]:
+    """Source version recorded in a derived file, None for downloaded files"""
+
+    try:
+        with pa.memory_map(str(path), 'r') as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    value = metadata.get(RESAMPLED_METADATA_KEY)
+    return json.loads(value) if value else None
+
+
+def source_timeframe(pair: str, timeframe: str, exchange: str = 'binance',
+                     data_dir: Path = DEFAULT_DATA_DIR) -> Optional[str]:
+    """Downloaded timeframe to aggregate a timeframe from
+
+    Any lower timeframe dividing the requested one gives exact candles, so the one
+    covering the longest date range wins (finer on a tie); a week of 5m data makes a
+    poor 4h file next to months of 1h data.
+    """
+
+    target_ns = timeframe_to_timedelta(timeframe).value
+    store = get_store(data_dir)
+    best, best_rank = None, None
+    for candidate in local_timeframes(pair, exchange, data_dir):
+        candidate_ns = timeframe_to_timedelta(candidate).value
+        if candidate_ns >= target_ns or target_ns % candidate_ns:
+            continue
+        date_range = store.date_range(pair, candidate, exchange)
+        if date_range is None:
+            continue
+        rank = (date_range[1] - date_range[0], -candidate_ns)
+        if best_rank is None or rank > best_rank:
+            best, best_rank = candidate, rank
+    return best
+
+
+def ensure_timeframe(pair: str, timeframe: str, exchange: str = 'binance',
+                     data_dir: Path = DEFAULT_DATA_DIR) -> Optional[Path]:
+    """Path of the pair's candle file for a timeframe, resampled from lower-timeframe data
+    if there is no file (or the derived file is older than its source); None if neither exists"""
+
+    path = data_file_path(pair, timeframe, exchange, data_dir)
+    with _lock:
+        if path.exists():
+            recorded = resampled_source(path)
+            if recorded is None:
+                return path
+            source_path = path.with_name(recorded['source'])
+            try:
+                stat = source_path.stat()
+            except FileNotFoundError:
+                return path
+            if (stat.st_size, stat.st_mtime_ns) == (recorded['size'], recorded['mtime_ns']):
+                return path
+            source = _timeframe_of(source_path)
+        else:
+            source = source_timeframe(pair, timeframe, exchange, data_dir)
+            if source is None:
+                return None
+
+        write_resampled(pair, timeframe, source, exchange, data_dir)
+        return path
+
+
+def ensure_pairs(pairs: List[str], timeframe: str, exchange: str = 'binance',
+                 data_dir: Path = DEFAULT_DATA_DIR) -> List[Path]:
+    """ensure_timeframe for every pair; returns the files that exist afterwards"""
+
+    paths = []
+    for pair in pairs:
+        path = ensure_timeframe(pair, timeframe, exchange, data_dir)
+        if path is not None:
+            paths.append(path)
+    return paths
+
+
+def write_resampled(pair: str, timeframe: str, source: str, exchange: str = 'binance',
+                    data_dir: Path = DEFAULT_DATA_DIR) -> Path:
+    """Aggregate the source timeframe file into the timeframe's file (written atomically)"""
+
+    store = get_store(data_dir)
+    mapped = store.open(pair, source, exchange)
+    candles = resample_candles(store.load(pair, source, exchange), timeframe, source)
+
+    metadata = {'source': mapped.path.name, 'size': mapped.signature[0], 'mtime_ns': mapped.signature[1]}
+    schema = pa.schema([('date', pa.timestamp('ns', tz='UTC'))] + [(column, pa.float64()) for column in OHLCV_COLUMNS[1:]],
+                       metadata={RESAMPLED_METADATA_KEY: json.dumps(metadata).encode('utf-8')})
+    batch = pa.RecordBatch.from_arrays([pa.array(candles['date'], type=schema.field('date').type)] +
+                                       [pa.array(candles[column]) for column in OHLCV_COLUMNS[1:]], schema=schema)
+
+    path = data_file_path(pair, timeframe, exchange, data_dir)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with ipc.new_file(str(temp_path), schema) as writer:
+        writer.write_batch(batch)
+    os.replace(temp_path, path)
+
+    print(f"🔁 {pair} {timeframe}: {batch.num_rows} свечей из {source} ({mapped.path.name})")
+    return path
+
+
+def _timeframe_of(path: Path) -> str:
+    return path.stem.rsplit('-', 1)[1]
@@ -0,0 +1,143 @@
+"""
+Backtest result cache - content-addressed store of parsed backtest results
+
+Entries are keyed by a hash of the strategy code, the effective config, the
+timerange, the strategy's hyperopt params file and fingerprints of the candle
+files used, so an identical rerun
+returns the parsed results (stats, trades, equity) without calling freqtrade.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class BacktestResultCache:
+    """Content-addressed cache of parsed backtest results with size/age eviction"""
+
+    def __init__(self, cache_dir: Path, max_size_mb: float = 512, max_age_days: float = 30):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 86400
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> sha256, so unchanged files are hashed only once
+        self._fingerprints: Dict[Tuple[str, int, int], str] = {}
+
+    def make_key(self, strategy_code: str, config: Dict[str, Any], timerange: Optional[str],
+                 data_files: List[Path], params_file: Optional[Path] = None) -> str:
+        """Build the cache key for one backtest run
+
+        params_file is the <strategy>.json freqtrade loads next to the strategy (hyperopt
+        results); its contents are part of the key, 'missing' when there is none.
+        """
+
+        digest = hashlib.sha256()
+        digest.update(strategy_code.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update((timerange or '').encode('utf-8'))
+        if params_file is not None:
+            digest.update(b'\0')
+            digest.update(self.fingerprint(params_file).encode('utf-8'))
+
+        for data_file in sorted(Path(f) for f in data_files):
+            digest.update(b'\0')
+            digest.update(data_file.name.encode('utf-8'))
+            digest.update(self.fingerprint(data_file).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def fingerprint(self, data_file: Path) -> str:
+        """Content hash of a data file ('missing' if it does not exist)"""
+
+        try:
+            stat = os.stat(data_file)
+        except FileNotFoundError:
+            return 'missing'
+
+        memo_key = (str(data_file), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._fingerprints:
+            digest = hashlib.sha256()
+            with open(data_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            self._fingerprints[memo_key] = digest.hexdigest()
+
+        return self._fingerprints[memo_key]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached results for key, or None on a miss"""
+
+        entry = self._entry_path(key)
+        with self._lock:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                return None
+
+            if time.time() - stat.st_mtime > self.max_age_seconds:
+                entry.unlink(missing_ok=True)
+                return None
+
+            try:
+                with open(entry, 'rb') as f:
+                    results = pickle.load(f)
+            except Exception as e:
+                print(f"⚠️ Повреждена запись кеша {entry.name}: {e}")
+                entry.unlink(missing_ok=True)
+                return None
+
+            # Touch for LRU eviction
+            os.utime(entry)
+
+        return results
+
+    def put(self, key: str, results: Dict[str, Any]) -> None:
+        """Store results for key and evict old entries"""
+
+        entry = self._entry_path(key)
+        tmp_entry = entry.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_entry, 'wb') as f:
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_entry, entry)
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all cache entries"""
+
+        with self._lock:
+            for entry in self.cache_dir.glob('*.pkl'):
+                entry.unlink(missing_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones until under the size limit"""
+
+        now = time.time()
+        entries = []
+        for entry in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age_seconds:
+                entry.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= size
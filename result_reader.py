@@ -0,0 +1,220 @@
+"""
+Backtest result reader - streams freqtrade result JSON straight out of the result zip
+
+The result member is decompressed on the fly and walked with an incremental JSON
+reader: only the `strategy` section is materialized, trades are decoded one at a
+time and reduced to the fields the runner uses, and nothing is extracted to disk.
+"""
+
+import io
+import json
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional, IO, Iterator, Iterable
+
+
+# Trade fields kept from each exported trade (orders, stoploss details etc. are dropped)
+TRADE_FIELDS = (
+    'pair', 'is_short', 'amount', 'stake_amount', 'leverage',
+    'open_date', 'close_date', 'open_timestamp', 'close_timestamp',
+    'open_rate', 'close_rate', 'fee_open', 'fee_close',
+    'profit_abs', 'profit_ratio', 'trade_duration', 'exit_reason', 'enter_tag'
+)
+
+_NON_WHITESPACE = re.compile(r'\S')
+
+# Characters kept after a decoded value before trusting that it was not truncated
+_NUMBER_LOOKAHEAD = 64
+
+
+class JsonStreamReader:
+    """Incremental JSON reader over a text stream
+
+    Containers are walked with iter_object/iter_array, scalar and small container
+    values are decoded with the C decoder one at a time, so memory holds the read
+    buffer plus whatever the caller keeps.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int = 1024 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def read_value(self) -> Any:
+        """Decode the value at the current position"""
+
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value continues in the next chunk; grow geometrically so
+                # a large value is not re-decoded once per chunk
+                if self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    continue
+                raise
+
+            # A number close to the buffer end may be cut off ("1." of "1.25")
+            if len(self.buffer) - end < _NUMBER_LOOKAHEAD and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Skip the value at the current position"""
+        self.read_value()
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position
+
+        The caller must read or skip the value of each key before advancing.
+        """
+
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self._expect(':')
+            yield key
+
+            separator = self._peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' in JSON object, got {separator!r}")
+
+    def iter_array(self) -> Iterator[None]:
+        """Iterate over the items of the array at the current position
+
+        The caller must read or skip each item before advancing.
+        """
+
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield None
+
+            separator = self._peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it"""
+
+        while True:
+            match = _NON_WHITESPACE.search(self.buffer, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.buffer[self.pos]
+            self.pos = len(self.buffer)
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, got {found!r}")
+        self.pos += 1
+
+    def _fill(self, size: int = None) -> bool:
+        """Append the next chunk to the unread part of the buffer"""
+
+        if self.eof:
+            return False
+
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+
+def load_backtest_stream(stream: IO[str], trade_fields: Optional[Iterable[str]] = TRADE_FIELDS,
+                         include_trades: bool = True) -> Dict[str, Any]:
+    """Read the `strategy` section of a freqtrade backtest result
+
+    Returns {'strategy': {name: stats}} like json.load would, with each trade reduced
+    to trade_fields (None keeps full trades). Other top-level sections are skipped,
+    and so are the trades when include_trades is False (headline stats only).
+    """
+
+    trade_fields = tuple(trade_fields) if trade_fields is not None else None
+    reader = JsonStreamReader(stream)
+    backtest_data = {}
+
+    for section in reader.iter_object():
+        if section != 'strategy':
+            # strategy_comparison, metadata - not used by the runner
+            reader.skip_value()
+            continue
+
+        strategies = backtest_data.setdefault('strategy', {})
+        for strategy_name in reader.iter_object():
+            stats = strategies[strategy_name] = {}
+            for key in reader.iter_object():
+                if key == 'trades' and not include_trades:
+                    for _ in reader.iter_array():
+                        reader.skip_value()
+                elif key == 'trades':
+                    stats['trades'] = _read_trades(reader, trade_fields)
+                else:
+                    stats[key] = reader.read_value()
+
+    return backtest_data
+
+
+def _read_trades(reader: JsonStreamReader, trade_fields: Optional[tuple]) -> List[Dict[str, Any]]:
+    trades = []
+    for _ in reader.iter_array():
+        trade = reader.read_value()
+        if trade_fields is not None:
+            trade = {field: trade[field] for field in trade_fields if field in trade}
+        trades.append(trade)
+    return trades
+
+
+def find_result_member(names: List[str]) -> Optional[str]:
+    """Name of the backtest result JSON inside a freqtrade result zip"""
+
+    for name in names:
+        if name.endswith('.json') and not name.endswith('_config.json') and 'market_change' not in name:
+            return name
+    return None
+
+
+def read_backtest_zip(zip_path: Path, trade_fields: Optional[Iterable[str]] = TRADE_FIELDS,
+                      include_trades: bool = True) -> Dict[str, Any]:
+    """Stream the backtest result out of a freqtrade result zip without extracting it"""
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        member = find_result_member(zip_ref.namelist())
+        if member is None:
+            raise ValueError(f"No backtest result JSON in {zip_path}")
+
+        with zip_ref.open(member) as raw:
+            return load_backtest_stream(io.TextIOWrapper(raw, encoding='utf-8'), trade_fields, include_trades)
+
+
+def read_backtest_json(json_path: Path, trade_fields: Optional[Iterable[str]] = TRADE_FIELDS) -> Dict[str, Any]:
+    """Stream the backtest result out of a plain result JSON file"""
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return load_backtest_stream(f, trade_fields)
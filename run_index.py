@@ -0,0 +1,258 @@
+"""
+Backtest run index - SQLite index of the result zips in user_data/backtest_results
+
+One row per (result file, strategy) with strategy name, code hash, timerange and
+headline metrics. refresh() only parses zips that are new or changed since the
+last scan (tracked by size and mtime), so the index stays cheap to keep current,
+and indexed queries such as "top 20 runs by Sharpe for this code hash" stay well
+below a millisecond.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from result_reader import read_backtest_zip
+
+
+DEFAULT_RESULTS_DIR = Path(__file__).parent / 'user_data' / 'backtest_results'
+DEFAULT_DB_PATH = Path(__file__).parent / 'user_data' / 'backtest_index.sqlite'
+
+# Headline metrics stored per run: column -> key in freqtrade strategy stats
+METRIC_COLUMNS = {
+    'total_trades': 'total_trades',
+    'profit_total': 'profit_total',
+    'profit_total_abs': 'profit_total_abs',
+    'sharpe': 'sharpe',
+    'sortino': 'sortino',
+    'calmar': 'calmar',
+    'cagr': 'cagr',
+    'profit_factor': 'profit_factor',
+    'winrate': 'winrate',
+    'max_drawdown': 'max_drawdown_account',
+    'final_balance': 'final_balance',
+    'market_change': 'market_change',
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    run_id TEXT,
+    code_hash TEXT,
+    run_time INTEGER,
+    timeframe TEXT,
+    timerange TEXT,
+    backtest_start INTEGER,
+    backtest_end INTEGER,
+    pairs TEXT,
+    {', '.join(f'{column} REAL' for column in METRIC_COLUMNS)},
+    UNIQUE (file, strategy)
+);
+CREATE INDEX IF NOT EXISTS runs_code_hash_sharpe ON runs (code_hash, sharpe);
+CREATE INDEX IF NOT EXISTS runs_strategy_sharpe ON runs (strategy, sharpe);
+CREATE INDEX IF NOT EXISTS runs_run_time ON runs (run_time);
+"""
+
+_RUN_COLUMNS = ['file', 'strategy', 'run_id', 'code_hash', 'run_time', 'timeframe', 'timerange',
+                'backtest_start', 'backtest_end', 'pairs'] + list(METRIC_COLUMNS)
+
+_ORDER_COLUMNS = set(METRIC_COLUMNS) | {'run_time', 'backtest_start', 'backtest_end'}
+
+
+def code_hash(strategy_code: str) -> str:
+    """Hash identifying a strategy source (same value for the GUI export and the zip copy)"""
+    return hashlib.sha256(strategy_code.encode('utf-8')).hexdigest()
+
+
+def latest_result_zip(results_dir: Path, pattern: str = "*.zip") -> Optional[Path]:
+    """Most recent result zip: the one named in .last_result.json, else the newest file"""
+
+    results_dir = Path(results_dir)
+    last_result = results_dir / '.last_result.json'
+    if last_result.exists():
+        try:
+            with open(last_result, 'r') as f:
+                latest = results_dir / json.load(f)['latest_backtest']
+            if latest.exists() and latest.match(pattern):
+                return latest
+        except (ValueError, KeyError, OSError):
+            pass
+
+    zip_files = list(results_dir.glob(pattern))
+    if not zip_files:
+        return None
+    return max(zip_files, key=lambda path: path.stat().st_mtime_ns)
+
+
+class BacktestRunIndex:
+    """Incrementally built SQLite index of backtest result zips"""
+
+    def __init__(self, results_dir: Path = DEFAULT_RESULTS_DIR, db_path: Path = DEFAULT_DB_PATH):
+        self.results_dir = Path(results_dir)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+
+    def refresh(self) -> int:
+        """Index new or changed result zips and forget deleted ones; returns the number of parsed files"""
+
+        if not self.results_dir.exists():
+            return 0
+
+        with self._lock:
+            known = {row['name']: (row['size'], row['mtime_ns'])
+                     for row in self._db.execute("SELECT name, size, mtime_ns FROM files")}
+            seen = set()
+            parsed = 0
+
+            for entry in os.scandir(self.results_dir):
+                if not entry.name.endswith('.zip') or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                if known.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                    continue
+                self._index_file(Path(entry.path), stat)
+                parsed += 1
+
+            for name in set(known) - seen:
+                self._db.execute("DELETE FROM runs WHERE file = ?", (name,))
+                self._db.execute("DELETE FROM files WHERE name = ?", (name,))
+
+            self._db.commit()
+
+        if parsed:
+            print(f"🗂  Проиндексировано результатов бэктеста: {parsed}")
+        return parsed
+
+    def top_runs(self, metric: str = 'sharpe', limit: int = 20, strategy: str = None,
+                 code_hash: str = None, timeframe: str = None, ascending: bool = False) -> List[Dict[str, Any]]:
+        """Best runs by a metric, optionally for one strategy name / code hash / timeframe"""
+
+        if metric not in _ORDER_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        conditions = [f"{metric} IS NOT NULL"]
+        params = []
+        for column, value in (('strategy', strategy), ('code_hash', code_hash), ('timeframe', timeframe)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        query = (f"SELECT * FROM runs WHERE {' AND '.join(conditions)} "
+                 f"ORDER BY {metric} {'ASC' if ascending else 'DESC'} LIMIT ?")
+        params.append(int(limit))
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [self._row_dict(row) for row in rows]
+
+    def latest_runs(self, limit: int = 20, strategy: str = None, code_hash: str = None) -> List[Dict[str, Any]]:
+        """Most recent runs"""
+        return self.top_runs('run_time', limit, strategy, code_hash)
+
+    def index_file(self, zip_path: Path) -> None:
+        """Index (or re-index) a single result zip"""
+        with self._lock:
+            self._index_file(Path(zip_path), os.stat(zip_path))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _index_file(self, zip_path: Path, stat: os.stat_result) -> None:
+        try:
+            runs = self._read_runs(zip_path, stat)
+        except Exception as e:
+            # Remember the file anyway so a broken zip is not re-parsed on every scan
+            print(f"⚠️ Не удалось проиндексировать {zip_path.name}: {e}")
+            runs = []
+
+        self._db.execute("DELETE FROM runs WHERE file = ?", (zip_path.name,))
+        self._db.executemany(
+            f"INSERT INTO runs ({', '.join(_RUN_COLUMNS)}) VALUES ({', '.join('?' * len(_RUN_COLUMNS))})",
+            [[run.get(column) for column in _RUN_COLUMNS] for run in runs]
+        )
+        self._db.execute("INSERT OR REPLACE INTO files (name, size, mtime_ns) VALUES (?, ?, ?)",
+                         (zip_path.name, stat.st_size, stat.st_mtime_ns))
+
+    def _read_runs(self, zip_path: Path, stat: os.stat_result) -> List[Dict[str, Any]]:
+        """One run dict per strategy in a result zip (headline stats only, trades are skipped)"""
+
+        backtest_data = read_backtest_zip(zip_path, include_trades=False)
+
+        meta = {}
+        meta_file = zip_path.with_suffix('.meta.json')
+        if meta_file.exists():
+            with open(meta_file, 'r') as f:
+                meta = json.load(f)
+
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            sources = {name: zip_ref.read(name).decode('utf-8')
+                       for name in zip_ref.namelist() if name.endswith('.py')}
+
+        runs = []
+        for strategy, stats in backtest_data.get('strategy', {}).items():
+            strategy_meta = meta.get(strategy, {})
+            source = next((code for name, code in sources.items() if name.endswith(f"_{strategy}.py")), None)
+
+            run = {
+                'file': zip_path.name,
+                'strategy': strategy,
+                'run_id': strategy_meta.get('run_id'),
+                'code_hash': code_hash(source) if source is not None else None,
+                'run_time': strategy_meta.get('backtest_start_time')
+                            or stats.get('backtest_run_start_ts') or stat.st_mtime_ns // 1_000_000_000,
+                'timeframe': stats.get('timeframe') or strategy_meta.get('timeframe'),
+                'timerange': stats.get('timerange'),
+                'backtest_start': stats.get('backtest_start_ts'),
+                'backtest_end': stats.get('backtest_end_ts'),
+                'pairs': ','.join(stats.get('pairlist', []))
+            }
+            for column, key in METRIC_COLUMNS.items():
+                value = stats.get(key)
+                run[column] = float(value) if isinstance(value, (int, float)) else None
+            runs.append(run)
+
+        return runs
+
+    def _row_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        run = dict(row)
+        run['path'] = str(self.results_dir / run['file'])
+        run['pairs'] = run['pairs'].split(',') if run['pairs'] else []
+        return run
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    metric = sys.argv[1] if len(sys.argv) > 1 else 'sharpe'
+    strategy = sys.argv[2] if len(sys.argv) > 2 else None
+
+    index = BacktestRunIndex()
+    index.refresh()
+
+    started = time.perf_counter()
+    runs = index.top_runs(metric, 20, strategy=strategy)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"Top {len(runs)} runs by {metric} ({elapsed:.3f} ms)")
+    for run in runs:
+        print(f"  {run[metric]:>10.4f}  {run['strategy']:<24} {run['timerange'] or '':<20} {run['file']}")
@@ -14,7 +14,30 @@ import shutil
 import os
 import re
 import numpy as np
+import threading
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from preview import SignalPreviewEngine
+from worker_pool import FreqtradeWorkerPool
+from result_cache import BacktestResultCache
+from stream_executor import StreamingProcess
+from cancellation import CancelToken, JobCancelled
+from result_reader import read_backtest_zip, read_backtest_json
+from trades_frame import build_trades_frame
+from equity import EquityCurveEngine
+from run_index import BacktestRunIndex, code_hash, latest_result_zip
+from hyperopt_reader import HyperoptEpochReader, HyperoptMonitor
+from walk_forward import local_data_range, stitch_equity, walk_forward_windows
+from ohlcv_store import timeframe_to_timedelta
+from exporter import StrategyExporter
+from monte_carlo import monte_carlo_trades
+from resampler import ensure_pairs
+
+
+# Informative candles loaded by generated strategies (pair=metadata['pair'] means every whitelisted pair)
+INFORMATIVE_PATTERN = re.compile(r"self\.dp\.get_pair_dataframe\(pair=(?:metadata\['pair'\]|'([^']+)'), timeframe='(\w+)'\)")
 
 
 class FreqtradeRunner:
@@ -29,6 +52,27 @@ class FreqtradeRunner:
         self.user_data_dir.mkdir(exist_ok=True)
         self.strategies_dir.mkdir(exist_ok=True)
         
+        # In-process signal preview (no freqtrade subprocess)
+        self.preview_engine = SignalPreviewEngine(self.user_data_dir / 'data')
+        
+        # Mark-to-market equity curves from trades + local candles
+        self.equity_engine = EquityCurveEngine(self.user_data_dir / 'data')
+        
+        # Optional pool of warm freqtrade workers (see start_worker_pool)
+        self.worker_pool: Optional[FreqtradeWorkerPool] = None
+        
+        # Parsed results of previous runs, keyed by code/config/timerange/data
+        self.result_cache: Optional[BacktestResultCache] = BacktestResultCache(self.user_data_dir / 'backtest_cache')
+        
+        # SQLite index of all result zips in user_data/backtest_results (see query_runs)
+        self.run_index = BacktestRunIndex(self.user_data_dir / 'backtest_results',
+                                          self.user_data_dir / 'backtest_index.sqlite')
+        self._archive_lock = threading.Lock()
+        
+        # Cancel tokens of running backtests/hyperopts (see cancel_all)
+        self._active_tokens = set()
+        self._tokens_lock = threading.Lock()
+        
         # Default config
         self.default_config = {
             "max_open_trades": 3,
@@ -111,23 +155,50 @@ class FreqtradeRunner:
             }
         }
     
-    def save_strategy(self, strategy_code: str, strategy_name: str = "GeneratedStrategy") -> Path:
+    def save_strategy(self, strategy_code: str, strategy_name: str = "GeneratedStrategy",
+                      directory: Path = None) -> Path:
         """Save strategy code to file"""
-        strategy_file = self.strategies_dir / f"{strategy_name}.py"
+        strategy_file = (directory or self.strategies_dir) / f"{strategy_name}.py"
         
         with open(strategy_file, 'w') as f:
             f.write(strategy_code)
         
         return strategy_file
+
+    def _freqtrade_env(self) -> Dict[str, str]:
+        """Environment of freqtrade subprocesses: builder modules (indicator_cache) importable"""
+        env = os.environ.copy()
+        builder_dir = str(Path(__file__).parent)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [builder_dir, env.get('PYTHONPATH')]))
+        return env
+
+    def _data_requirements(self, config: Dict[str, Any], strategy_code: str = None) -> List[tuple]:
+        """(pairs, timeframe) candle sets a run reads: the whitelist plus the strategy's informative frames"""
+        pairs = config['exchange'].get('pair_whitelist', [])
+        requirements = [(pairs, config.get('timeframe', '1h'))]
+        for match in INFORMATIVE_PATTERN.finditer(strategy_code or ''):
+            requirements.append(([match.group(1)] if match.group(1) else pairs, match.group(2)))
+        return requirements
     
-    def create_config(self, config_overrides: Dict = None) -> Path:
-        """Create Freqtrade config file"""
+    def _prepare_data(self, config: Dict[str, Any], strategy_code: str = None) -> None:
+        """Resample missing timeframe files of the run from lower-timeframe local data"""
+        for pairs, timeframe in self._data_requirements(config, strategy_code):
+            ensure_pairs(pairs, timeframe, config['exchange']['name'], self.user_data_dir / 'data')
+    
+    def build_config(self, config_overrides: Dict = None) -> Dict[str, Any]:
+        """Build the effective Freqtrade config dict"""
         config = self.default_config.copy()
         
         if config_overrides:
             config.update(config_overrides)
         
-        config_file = self.temp_dir / "config.json"
+        return config
+    
+    def create_config(self, config_overrides: Dict = None, directory: Path = None) -> Path:
+        """Create Freqtrade config file"""
+        config = self.build_config(config_overrides)
+        
+        config_file = (directory or self.temp_dir) / "config.json"
         
         with open(config_file, 'w') as f:
             json.dump(config, f, indent=2)
@@ -135,14 +206,30 @@ class FreqtradeRunner:
         return config_file
     
     def run_backtest(self, strategy_code: str, strategy_name: str = "GeneratedStrategy", 
-                     config_overrides: Dict = None, timerange: str = None) -> Dict[str, Any]:
-        """Run backtest and return results"""
+                     config_overrides: Dict = None, timerange: str = None,
+                     workspace: Path = None, progress_callback=None,
+                     cancel_token: CancelToken = None, use_cache: bool = True) -> Dict[str, Any]:
+        """Run backtest and return results
+        
+        With a workspace the strategy, config and exported results are kept in that
+        directory, so several backtests can run side by side. progress_callback receives
+        progress event dicts (phase, pair, percent, message) while freqtrade runs.
+        Raises JobCancelled when cancel_token fires (or cancel_all() is called); the
+        freqtrade process tree is killed and partial result files are removed.
+        use_cache=False skips the result cache.
+        """
+        
+        if workspace is not None:
+            workspace = Path(workspace)
+            workspace.mkdir(parents=True, exist_ok=True)
         
         # Save strategy
-        strategy_file = self.save_strategy(strategy_code, strategy_name)
+        strategy_file = self.save_strategy(strategy_code, strategy_name, workspace)
         
         # Create config
-        config_file = self.create_config(config_overrides)
+        config = self.build_config(config_overrides)
+        config_file = self.create_config(config_overrides, workspace)
+        self._prepare_data(config, strategy_code)
         
         # Determine timerange if not provided
         if not timerange:
@@ -150,6 +237,59 @@ class FreqtradeRunner:
             # For recent data, use last month
             timerange = "20250401-20250630"  # Use date range instead of indices
         
+        # Return cached results if nothing changed since an earlier run
+        cache_key = None
+        if self.result_cache is not None and use_cache:
+            cache_key = self.result_cache.make_key(strategy_code, config, timerange,
+                                                   self._backtest_data_files(config, strategy_code),
+                                                   strategy_file.with_suffix('.json'))
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results is not None:
+                print(f"⚡ Результаты бэктеста взяты из кеша: {cache_key[:12]}")
+                cached_results['cached'] = True
+                return cached_results
+        
+        cancel_token = self._track_token(cancel_token)
+        try:
+            # Use a warm worker when the pool is running
+            if self.worker_pool is not None and self.worker_pool.running:
+                results = self._run_backtest_in_worker(strategy_name, config_overrides, timerange,
+                                                       workspace, cancel_token)
+            else:
+                results = self._run_backtest_cli(strategy_name, config_file, timerange, workspace,
+                                                 progress_callback, cancel_token)
+        except JobCancelled:
+            print("🛑 Бэктест отменен")
+            self._remove_partial_results(workspace or self.temp_dir)
+            raise
+        finally:
+            self._untrack_token(cancel_token)
+        
+        if cache_key is not None and results.get('success', False):
+            self.result_cache.put(cache_key, results)
+        
+        return results
+    
+    def _backtest_data_files(self, config: Dict[str, Any], strategy_code: str = None) -> List[Path]:
+        """Candle files a backtest with this config (and the strategy's informative frames) reads"""
+        data_dir = self.user_data_dir / 'data' / config['exchange']['name']
+        
+        data_files = []
+        for pairs, timeframe in self._data_requirements(config, strategy_code):
+            for pair in pairs:
+                pair_file = pair.replace('/', '_').replace(':', '_')
+                matches = sorted(data_dir.glob(f"{pair_file}-{timeframe}*.feather"))
+                data_files.extend(matches or [data_dir / f"{pair_file}-{timeframe}.feather"])
+        
+        return data_files
+    
+    def _run_backtest_cli(self, strategy_name: str, config_file: Path, timerange: str,
+                          workspace: Path = None, progress_callback=None,
+                          cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Run backtest through the freqtrade CLI and parse the exported results"""
+        
+        results_dir = workspace or self.temp_dir
+        
         # Build command
         cmd = [
             "freqtrade", "backtesting",
@@ -157,22 +297,25 @@ class FreqtradeRunner:
             "--strategy", strategy_name,
             "--user-data-dir", str(self.user_data_dir),
             "--export", "trades",
-            "--export-filename", str(self.temp_dir / "backtest_results.json"),
+            "--export-filename", str(results_dir / "backtest_results.json"),
             "--timerange", timerange,
             "--cache", "none"  # Disable cache to avoid issues
         ]
+        if workspace is not None:
+            cmd.extend(["--strategy-path", str(workspace)])
         
         # Run command
         try:
             print(f"🚀 Запускаю бэктест: {' '.join(cmd)}")
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
+            process = StreamingProcess(
+                cmd,
                 cwd=str(self.user_data_dir.parent),
-                timeout=300  # 5 minute timeout
+                on_progress=progress_callback,
+                cancel_token=cancel_token,
+                env=self._freqtrade_env()
             )
+            result = process.run(timeout=300)  # 5 minute timeout
             
             print(f"📊 Return code: {result.returncode}")
             print(f"📊 STDOUT: {result.stdout[-1000:]}")  # Last 1000 chars
@@ -188,22 +331,381 @@ class FreqtradeRunner:
                 raise RuntimeError(f"Backtest failed: {error_msg}")
             
             # Parse results
-            return self._parse_backtest_results(result.stdout, result.stderr)
+            return self._parse_backtest_results(result.stdout, result.stderr, results_dir)
             
+        except JobCancelled:
+            raise
         except subprocess.TimeoutExpired:
             raise RuntimeError("Бэктест превысил время ожидания (5 минут)")
         except Exception as e:
             raise RuntimeError(f"Ошибка запуска бэктеста: {str(e)}")
     
+    def start_worker_pool(self, size: int = 1):
+        """Start warm freqtrade workers used by run_backtest instead of the CLI"""
+        if self.worker_pool is None:
+            self.worker_pool = FreqtradeWorkerPool(size)
+        self.worker_pool.start()
+    
+    def stop_worker_pool(self):
+        """Stop warm freqtrade workers"""
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+    
+    def cancel_all(self):
+        """Cancel every running backtest/hyperopt (kills their freqtrade process trees)"""
+        with self._tokens_lock:
+            tokens = list(self._active_tokens)
+        for token in tokens:
+            token.cancel()
+    
+    def _track_token(self, cancel_token: CancelToken = None) -> CancelToken:
+        """Register the token of a starting job so cancel_all() can reach it"""
+        cancel_token = cancel_token or CancelToken()
+        with self._tokens_lock:
+            self._active_tokens.add(cancel_token)
+        return cancel_token
+    
+    def _untrack_token(self, cancel_token: CancelToken):
+        with self._tokens_lock:
+            self._active_tokens.discard(cancel_token)
+    
+    def _remove_partial_results(self, results_dir: Path, patterns=("backtest_results*",),
+                                since: float = None):
+        """Delete result files a cancelled freqtrade run may have left behind"""
+        for pattern in patterns:
+            for partial in results_dir.glob(pattern):
+                try:
+                    if since is not None and partial.stat().st_mtime < since:
+                        continue
+                    partial.unlink()
+                    print(f"🧹 Удален частичный результат: {partial.name}")
+                except OSError as e:
+                    print(f"⚠️ Не удалось удалить {partial}: {e}")
+    
+    def _worker_job(self, kind: str, strategy_name: str, config_overrides: Dict = None, **extra) -> Dict[str, Any]:
+        """Build a job description for the worker pool"""
+        job = {
+            'kind': kind,
+            'strategy_name': strategy_name,
+            'config': self.build_config(config_overrides),
+            'user_data_dir': str(self.user_data_dir),
+            'workspace': str(self.temp_dir / 'worker')
+        }
+        job.update(extra)
+        return job
+    
+    def _run_backtest_in_worker(self, strategy_name: str, config_overrides: Dict = None,
+                                timerange: str = None, workspace: Path = None,
+                                cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Run backtest on a warm worker and parse the returned result dict"""
+        try:
+            print(f"🚀 Запускаю бэктест в воркере: {strategy_name} {timerange}")
+            job = self._worker_job('backtest', strategy_name, config_overrides, timerange=timerange)
+            if workspace is not None:
+                job['workspace'] = str(workspace)
+                job['strategy_path'] = str(workspace)
+            response = self.worker_pool.submit(job, timeout=300, cancel_token=cancel_token)
+            print(f"📊 Бэктест в воркере завершен за {response['elapsed']:.2f}с")
+            results = self._parse_backtest_data(response['result'])
+            
+            # Keep the run in user_data/backtest_results and its index, like CLI runs
+            try:
+                zip_file = self._store_worker_result(response['result'], strategy_name, job['config'],
+                                                     workspace or self.temp_dir)
+                results['archived_result'] = str(self._archive_result(zip_file))
+            except Exception as e:
+                print(f"⚠️ Результат воркера не заархивирован: {e}")
+            return results
+        except JobCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Ошибка запуска бэктеста: {str(e)}")
+    
+    def run_backtest_batch(self, jobs: List[Dict[str, Any]], max_workers: int = None,
+                           callback=None, cancel_token: CancelToken = None) -> List[Dict[str, Any]]:
+        """Run many backtests in parallel, each in its own workspace
+        
+        Each job is a dict with 'strategy_code' and optional 'strategy_name', 'pairs',
+        'timerange' and 'config_overrides'. Every job runs as a separate freqtrade process
+        (or on a warm worker when the pool is running). callback(index, job, results) is
+        called as soon as each job finishes; the returned list keeps the order of jobs.
+        Cancelling cancel_token stops running jobs, skips queued ones and raises JobCancelled.
+        """
+        
+        if not jobs:
+            return []
+        
+        max_workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+        batch_dir = Path(tempfile.mkdtemp(prefix='batch_', dir=self.temp_dir))
+        all_results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        
+        print(f"🚀 Запускаю пакет из {len(jobs)} бэктестов ({max_workers} параллельно)")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._run_batch_job, job, batch_dir / f"job_{index}", cancel_token): index
+                for index, job in enumerate(jobs)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                results = future.result()
+                all_results[index] = results
+                
+                if callback is not None:
+                    callback(index, jobs[index], results)
+        
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
+        return all_results
+    
+    def _run_batch_job(self, job: Dict[str, Any], workspace: Path,
+                       cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Run one batch job and never raise (errors are returned in the results dict)"""
+        
+        config_overrides = dict(job.get('config_overrides') or {})
+        if job.get('pairs'):
+            exchange = dict(config_overrides.get('exchange', self.default_config['exchange']))
+            exchange['pair_whitelist'] = list(job['pairs'])
+            config_overrides['exchange'] = exchange
+        
+        try:
+            results = self.run_backtest(
+                job['strategy_code'],
+                job.get('strategy_name', "GeneratedStrategy"),
+                config_overrides,
+                job.get('timerange'),
+                workspace=workspace,
+                cancel_token=cancel_token
+            )
+        except JobCancelled:
+            results = {'success': False, 'cancelled': True, 'error': "Cancelled"}
+        except Exception as e:
+            results = {'success': False, 'error': str(e)}
+        
+        results['job'] = {key: value for key, value in job.items() if key != 'strategy_code'}
+        return results
+    
+    def run_walk_forward(self, strategy_code: str, strategy_name: str = "GeneratedStrategy",
+                         graph_data: Dict[str, Any] = None, config_overrides: Dict = None,
+                         in_sample_days: int = 60, out_of_sample_days: int = 14, step_days: int = None,
+                         epochs: int = 100, max_workers: int = None, callback=None,
+                         cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Walk-forward analysis: hyperopt each in-sample window, backtest the following out-of-sample window
+        
+        Windows run in parallel, each in its own workspace with its own strategy class name
+        so best-parameter files do not collide. The in-sample hyperopts run one at a time on
+        all cores: freqtrade holds <user_data_dir>/hyperopt.lock for a whole hyperopt (a second
+        CLI run exits without optimizing) and all runs share user_data/hyperopt_results; the
+        out-of-sample backtests overlap. A window whose hyperopt evaluated no epochs or found
+        no parameters fails. The indicator warmup comes from the graph's lookbacks
+        (graph_data, else the strategy's startup_candle_count). callback(index, window_result)
+        is called as each window finishes. Returns the per-window results and the stitched
+        out-of-sample 'equity' and 'trades'. Raises JobCancelled when cancel_token fires.
+        """
+        
+        config = self.build_config(config_overrides)
+        timeframe = config.get('timeframe', '1h')
+        self._prepare_data(config, strategy_code)
+        
+        if graph_data is not None:
+            warmup_candles = StrategyExporter()._max_lookback(graph_data)
+        else:
+            match = re.search(r"startup_candle_count\s*(?::\s*int)?\s*=\s*(\d+)", strategy_code)
+            warmup_candles = int(match.group(1)) if match else 0
+        warmup = timeframe_to_timedelta(timeframe) * warmup_candles
+        
+        data_start, data_end = local_data_range(config['exchange'].get('pair_whitelist', []), timeframe,
+                                                config['exchange']['name'], self.user_data_dir / 'data')
+        windows = walk_forward_windows(data_start, data_end, in_sample_days, out_of_sample_days,
+                                       step_days, warmup)
+        if not windows:
+            raise ValueError(f"Not enough data for walk-forward: {data_start} - {data_end} covers no "
+                             f"{in_sample_days}d in-sample + out-of-sample window after {warmup_candles} warmup candles")
+        
+        window_overrides = dict(config_overrides or {})
+        if warmup_candles:
+            window_overrides['startup_candle_count'] = warmup_candles
+        
+        cpu_count = os.cpu_count() or 1
+        max_workers = max_workers or min(len(windows), cpu_count)
+        hyperopt_lock = threading.Lock()
+        walk_dir = Path(tempfile.mkdtemp(prefix='walkforward_', dir=self.temp_dir))
+        window_results: List[Optional[Dict[str, Any]]] = [None] * len(windows)
+        
+        print(f"🚶 Walk-forward: {len(windows)} окон, {max_workers} параллельно (hyperopt по очереди), "
+              f"прогрев {warmup_candles} свечей")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._run_walk_forward_window, window, strategy_code, strategy_name,
+                                window_overrides, epochs, hyperopt_lock, walk_dir / f"window_{window['index']}",
+                                cancel_token): window['index']
+                for window in windows
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                window_results[index] = future.result()
+                
+                if callback is not None:
+                    callback(index, window_results[index])
+        
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        
+        starting_balance = float(config.get('dry_run_wallet', 1000))
+        equity = stitch_equity(window_results, starting_balance)
+        
+        trade_frames = [result['trades'].assign(window=result['window']['index'])
+                        for result in window_results
+                        if result.get('trades') is not None and not result['trades'].empty]
+        trades = pd.concat(trade_frames, ignore_index=True) if trade_frames else None
+        
+        succeeded = [result for result in window_results if result.get('success')]
+        final_equity = float(equity['equity'].iloc[-1]) if not equity.empty else starting_balance
+        
+        return {
+            'success': bool(succeeded),
+            'error': None if succeeded else "All walk-forward windows failed",
+            'windows': window_results,
+            'equity': equity,
+            'trades': trades,
+            'warmup_candles': warmup_candles,
+            'stats': {
+                'windows': len(windows),
+                'successful_windows': len(succeeded),
+                'total_return': f"{(final_equity / starting_balance - 1) * 100:.2f}%",
+                'max_drawdown': f"{-equity['drawdown'].min() if not equity.empty else 0.0:.2f}%",
+                'total_trades': len(trades) if trades is not None else 0
+            }
+        }
+    
+    def _run_walk_forward_window(self, window: Dict[str, Any], strategy_code: str, strategy_name: str,
+                                 config_overrides: Dict, epochs: int, hyperopt_lock: threading.Lock,
+                                 workspace: Path, cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Hyperopt the in-sample period (holding hyperopt_lock), then backtest the
+        out-of-sample period (never raises)"""
+        
+        window_name = f"{strategy_name}_wf{window['index']}"
+        results = {'success': False, 'window': window, 'strategy_name': window_name}
+        
+        try:
+            window_code = self._rename_strategy(strategy_code, strategy_name, window_name)
+            
+            print(f"🚶 Окно {window['index']}: hyperopt {window['in_sample']}, бэктест {window['out_of_sample']}")
+            with hyperopt_lock:
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                hyperopt_results = self.run_hyperopt(
+                    window_code, window_name, config_overrides, epochs,
+                    cancel_token=cancel_token,
+                    timerange=window['in_sample'],
+                    workspace=workspace
+                )
+            results['best_params'] = hyperopt_results.get('best_params', {})
+            results['best_result'] = hyperopt_results.get('best_result', {})
+            
+            # Backtesting the strategy defaults would pass for an optimized window
+            if not hyperopt_results.get('epochs_read') or not results['best_params']:
+                raise RuntimeError(f"Hyperopt {window['in_sample']} evaluated no epochs or found no parameters")
+            
+            # freqtrade stored the best parameters next to the strategy in the workspace,
+            # the backtest loads them from there
+            backtest_results = self.run_backtest(
+                window_code, window_name, config_overrides, window['out_of_sample'],
+                workspace=workspace,
+                cancel_token=cancel_token
+            )
+            results.update({key: backtest_results.get(key) for key in ('success', 'error', 'stats', 'trades', 'equity')})
+            results['starting_balance'] = float(self.build_config(config_overrides).get('dry_run_wallet', 1000))
+        except JobCancelled:
+            results.update({'cancelled': True, 'error': "Cancelled"})
+        except Exception as e:
+            print(f"❌ Окно {window['index']} walk-forward: {e}")
+            results['error'] = str(e)
+        
+        return results
+    
+    def _rename_strategy(self, strategy_code: str, strategy_name: str, new_name: str) -> str:
+        """Rename the strategy class so the code can be saved under new_name"""
+        
+        renamed, count = re.subn(rf"^class\s+{re.escape(strategy_name)}\s*\(",
+                                 f"class {new_name}(", strategy_code, flags=re.MULTILINE)
+        if not count:
+            raise ValueError(f"Strategy class {strategy_name} not found in strategy code")
+        return renamed
+    
+    def preview_signals(self, graph, timerange: str = None) -> Dict[str, Any]:
+        """Evaluate the graph on local candles and return entry/exit masks and signal counts"""
+        return self.preview_engine.preview_graph(graph, timerange)
+    
     def run_hyperopt(self, strategy_code: str, strategy_name: str = "GeneratedStrategy",
-                     config_overrides: Dict = None, epochs: int = 100) -> Dict[str, Any]:
-        """Run hyperopt and return results"""
+                     config_overrides: Dict = None, epochs: int = 100,
+                     progress_callback=None, cancel_token: CancelToken = None,
+                     epoch_callback=None, timerange: str = None, workspace: Path = None,
+                     job_workers: int = None) -> Dict[str, Any]:
+        """Run hyperopt and return results (raises JobCancelled when cancel_token fires)
+        
+        epoch_callback receives one event per evaluated epoch (see HyperoptMonitor) while
+        freqtrade is still running; the results contain the best epochs as 'leaderboard'.
+        With a workspace the strategy and config live in that directory and freqtrade
+        writes the best parameters next to the strategy there. job_workers limits the
+        hyperopt processes (freqtrade uses all cores by default).
+        """
+        
+        if workspace is not None:
+            workspace = Path(workspace)
+            workspace.mkdir(parents=True, exist_ok=True)
         
         # Save strategy
-        strategy_file = self.save_strategy(strategy_code, strategy_name)
+        strategy_file = self.save_strategy(strategy_code, strategy_name, workspace)
         
         # Create config
-        config_file = self.create_config(config_overrides)
+        config_file = self.create_config(config_overrides, workspace)
+        self._prepare_data(self.build_config(config_overrides), strategy_code)
+        
+        started = time.time()
+        cancel_token = self._track_token(cancel_token)
+        
+        # Tail the epochs file of this run while freqtrade writes it
+        monitor = HyperoptMonitor(
+            HyperoptEpochReader(self.user_data_dir / 'hyperopt_results', strategy_name, since=started),
+            total_epochs=epochs,
+            on_epoch=epoch_callback
+        ).start()
+        try:
+            results = self._run_hyperopt(strategy_name, config_file, config_overrides, epochs,
+                                         progress_callback, cancel_token, timerange, workspace,
+                                         job_workers)
+            monitor.stop()
+            
+            epoch_results = monitor.results()
+            if epoch_results['epochs_read']:
+                print(f"📈 Прочитано эпох hyperopt: {epoch_results['epochs_read']}")
+                results.update(epoch_results)
+            return results
+        except JobCancelled:
+            print("🛑 Hyperopt отменен")
+            # Only the epochs file of this run, older hyperopt results are kept
+            self._remove_partial_results(self.user_data_dir / 'hyperopt_results',
+                                         (f"strategy_{strategy_name}_*.fthypt",), since=started)
+            raise
+        finally:
+            monitor.stop()
+            self._untrack_token(cancel_token)
+    
+    def _run_hyperopt(self, strategy_name: str, config_file: Path, config_overrides: Dict = None,
+                      epochs: int = 100, progress_callback=None,
+                      cancel_token: CancelToken = None, timerange: str = None,
+                      workspace: Path = None, job_workers: int = None) -> Dict[str, Any]:
+        """Run hyperopt through the freqtrade CLI
+        
+        Not on the warm workers: they are daemonic processes, where joblib's loky backend
+        falls back to a single process and hyperopt would lose its parallelism.
+        """
         
         # Build command
         cmd = [
@@ -215,16 +717,23 @@ class FreqtradeRunner:
             "--epochs", str(epochs),
             "--spaces", "buy", "sell"
         ]
+        if timerange:
+            cmd.extend(["--timerange", timerange])
+        if workspace is not None:
+            cmd.extend(["--strategy-path", str(workspace)])
+        if job_workers:
+            cmd.extend(["--job-workers", str(job_workers)])
         
         # Run command
         try:
-            result = subprocess.run(
+            process = StreamingProcess(
                 cmd,
-                capture_output=True,
-                text=True,
                 cwd=str(self.user_data_dir.parent),
-                timeout=1800  # 30 minute timeout
+                on_progress=progress_callback,
+                cancel_token=cancel_token,
+                env=self._freqtrade_env()
             )
+            result = process.run(timeout=1800)  # 30 minute timeout
             
             if result.returncode != 0:
                 raise RuntimeError(f"Hyperopt failed: {result.stderr}")
@@ -232,6 +741,8 @@ class FreqtradeRunner:
             # Parse results
             return self._parse_hyperopt_results(result.stdout, result.stderr)
             
+        except JobCancelled:
+            raise
         except subprocess.TimeoutExpired:
             raise RuntimeError("Hyperopt timed out after 30 minutes")
         except Exception as e:
@@ -272,9 +783,11 @@ class FreqtradeRunner:
         except Exception as e:
             raise RuntimeError(f"Failed to start live trading: {str(e)}")
     
-    def _parse_backtest_results(self, stdout: str, stderr: str) -> Dict[str, Any]:
+    def _parse_backtest_results(self, stdout: str, stderr: str, results_dir: Path = None) -> Dict[str, Any]:
         """Parse backtest results from output and files"""
         
+        results_dir = results_dir or self.temp_dir
+        
         results = {
             'success': True,
             'stdout': stdout,
@@ -286,117 +799,47 @@ class FreqtradeRunner:
         
         try:
             # Look for results file - Freqtrade creates files with timestamps
-            results_file = self.temp_dir / "backtest_results.json"
-            zip_file = None
+            results_file = results_dir / "backtest_results.json"
+            backtest_data = None
             
             # If exact file doesn't exist, look for timestamped files
             if not results_file.exists():
                 # Look for .zip files first (newer freqtrade versions)
-                zip_files = list(self.temp_dir.glob("backtest_results-*.zip"))
-                if zip_files:
-                    zip_file = zip_files[0]  # Take the first (most recent)
+                zip_file = latest_result_zip(results_dir, "backtest_results-*.zip")
+                if zip_file is not None:
                     print(f"📊 Найден ZIP файл: {zip_file}")
                     
-                    # Extract JSON from ZIP
-                    with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                        # Find the JSON file inside
-                        json_files = [f for f in zip_ref.namelist() if f.endswith('.json') and 'config' not in f and 'market_change' not in f]
-                        if json_files:
-                            extracted_json = json_files[0]
-                            # Extract to temp directory
-                            zip_ref.extract(extracted_json, self.temp_dir)
-                            results_file = self.temp_dir / extracted_json
-                            print(f"📊 Извлечен JSON из ZIP: {extracted_json}")
+                    # Stream the result JSON straight from the archive, nothing is extracted
+                    backtest_data = read_backtest_zip(zip_file)
+                    results_file = zip_file
+                    
+                    # Keep the run in user_data/backtest_results and its index
+                    results['archived_result'] = str(self._archive_result(zip_file))
                 
-                # If no ZIP, look for direct JSON files
-                if not results_file.exists():
-                    pattern_files = list(self.temp_dir.glob("backtest_results-*.json"))
-                    if pattern_files:
-                        results_file = pattern_files[0]  # Take the first (most recent)
+                # If no ZIP, look for the newest direct JSON file (.meta.json as a last resort)
+                if backtest_data is None and not results_file.exists():
+                    json_files = [path for path in results_dir.glob("backtest_results-*.json")
+                                  if not path.name.endswith('.meta.json')]
+                    candidates = json_files or list(results_dir.glob("backtest_results-*.meta.json"))
+                    if candidates:
+                        results_file = max(candidates, key=lambda path: path.stat().st_mtime_ns)
                         print(f"📊 Найден файл с временной меткой: {results_file}")
-                    else:
-                        # Look for .meta.json files (sometimes freqtrade creates these)
-                        meta_files = list(self.temp_dir.glob("backtest_results-*.meta.json"))
-                        if meta_files:
-                            results_file = meta_files[0]
-                            print(f"📊 Найден .meta.json файл: {results_file}")
-            
-            if results_file.exists():
-                with open(results_file, 'r') as f:
-                    backtest_data = json.load(f)
-                
+            
+            if backtest_data is None and results_file.exists():
+                if results_file.name.endswith('.meta.json'):
+                    with open(results_file, 'r') as f:
+                        backtest_data = json.load(f)
+                else:
+                    backtest_data = read_backtest_json(results_file)
+            
+            if backtest_data is not None:
                 print(f"📊 Найден файл результатов: {results_file}")
                 print(f"📊 Ключи в backtest_data: {list(backtest_data.keys())}")
                 
-                # Extract statistics from strategy results
-                if 'strategy' in backtest_data:
-                    strategy_results = list(backtest_data['strategy'].values())[0]
-                    
-                    results['stats'] = {
-                        'total_return': f"{strategy_results.get('profit_total_pct', 0):.2f}%",
-                        'sharpe': f"{strategy_results.get('sharpe', 0):.2f}",
-                        'max_drawdown': f"{strategy_results.get('max_drawdown_account', 0) * 100:.2f}%",
-                        'total_trades': strategy_results.get('total_trades', 0),
-                        'profitable_trades': strategy_results.get('wins', 0),
-                        'avg_profit': f"{strategy_results.get('profit_mean_pct', 0):.2f}%"
-                    }
-                    
-                    # Also populate trade_stats for the trades table
-                    results['trade_stats'] = {
-                        'total_trades': strategy_results.get('total_trades', 0),
-                        'profitable_trades': strategy_results.get('wins', 0),
-                        'avg_profit': f"{strategy_results.get('profit_mean_pct', 0):.2f}%"
-                    }
-                    
-                    # Extract detailed trades from strategy results
-                    if 'trades' in strategy_results and strategy_results['trades']:
-                        trades_list = strategy_results['trades']
-                        print(f"📊 Найдено детальных сделок: {len(trades_list)}")
-                        
-                        # Convert trades to DataFrame with proper columns for display
-                        trades_data = []
-                        for trade in trades_list:
-                            trade_data = {
-                                'entry_date': trade.get('open_date', '').replace('+00:00', ''),
-                                'exit_date': trade.get('close_date', '').replace('+00:00', ''),
-                                'pair': trade.get('pair', ''),
-                                'side': 'Short' if trade.get('is_short', False) else 'Long',
-                                'amount': f"{trade.get('amount', 0):.6f}",
-                                'entry_price': f"{trade.get('open_rate', 0):.2f}",
-                                'exit_price': f"{trade.get('close_rate', 0):.2f}",
-                                'profit': f"{trade.get('profit_abs', 0):.2f} USDT",
-                                'profit_pct': f"{trade.get('profit_ratio', 0) * 100:.2f}%",
-                                'duration': self._format_duration(trade.get('trade_duration', 0)),
-                                # Keep data for equity curve
-                                'close_timestamp': pd.to_datetime(trade.get('close_date', '')),
-                                'profit_ratio': trade.get('profit_ratio', 0)
-                            }
-                            trades_data.append(trade_data)
-                        
-                        trades_df = pd.DataFrame(trades_data)
-                        results['trades'] = trades_df
-                        print(f"📊 Создан DataFrame сделок: {len(trades_df)} сделок")
-                    else:
-                        print("📊 Детальные сделки не найдены в strategy results")
-                        # Попробуем извлечь информацию из текстового вывода
-                        self._extract_trades_from_stdout(stdout, results)
-                
-                # Generate equity curve
-                trades_df = results.get('trades')
-                if trades_df is not None and not trades_df.empty:
-                    print("📊 Генерирую equity curve из детальных сделок...")
-                    equity_data = self._generate_equity_curve(trades_df)
-                    results['equity'] = equity_data
-                    print(f"📊 Equity curve создан: {len(equity_data)} точек")
-                else:
-                    print("📊 Нет данных для equity curve - создаю базовый")
-                    # Создаем базовый equity curve на основе статистики
-                    equity_data = self._create_basic_equity_curve(results.get('stats', {}))
-                    results['equity'] = equity_data
-                    print(f"📊 Базовый equity curve создан: {len(equity_data)} точек")
+                self._process_backtest_data(backtest_data, results, stdout)
             else:
                 print(f"📊 Файл результатов не найден: {results_file}")
-                print(f"📊 Файлы в temp_dir: {list(self.temp_dir.glob('*'))}")
+                print(f"📊 Файлы в results_dir: {list(results_dir.glob('*'))}")
                 # Создаем базовый equity curve на основе stdout
                 self._parse_summary_from_output(stdout, results)
                 equity_data = self._create_basic_equity_curve(results.get('stats', {}))
@@ -414,18 +857,180 @@ class FreqtradeRunner:
         
         return results
     
-    def _format_duration(self, duration_minutes: int) -> str:
-        """Format trade duration from minutes to readable format"""
-        if duration_minutes < 60:
-            return f"{duration_minutes}m"
-        elif duration_minutes < 1440:  # Less than 24 hours
-            hours = duration_minutes // 60
-            minutes = duration_minutes % 60
-            return f"{hours}h {minutes}m"
-        else:  # 24 hours or more
-            days = duration_minutes // 1440
-            remaining_hours = (duration_minutes % 1440) // 60
-            return f"{days}d {remaining_hours}h"
+    def _store_worker_result(self, backtest_data: Dict[str, Any], strategy_name: str,
+                             config: Dict[str, Any], results_dir: Path) -> Path:
+        """Write a warm worker's result dict as the zip + .meta.json a CLI export creates"""
+        
+        strategy_file = results_dir / f"{strategy_name}.py"
+        if not strategy_file.exists():
+            strategy_file = self.strategies_dir / f"{strategy_name}.py"
+        
+        stamp = time.strftime('%Y-%m-%d_%H-%M-%S')
+        base = f"backtest_results-{stamp}"
+        counter = 1
+        while (results_dir / f"{base}.zip").exists():
+            base = f"backtest_results-{stamp}_{counter}"
+            counter += 1
+        zip_file = results_dir / f"{base}.zip"
+        
+        with zipfile.ZipFile(zip_file, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr(f"{base}.json", json.dumps(backtest_data, default=str))
+            archive.writestr(f"{base}_config.json", json.dumps(config, indent=2, default=str))
+            if strategy_file.exists():
+                archive.writestr(f"{base}_{strategy_name}.py", strategy_file.read_text())
+        
+        started = int(time.time())
+        meta = {
+            name: {
+                'run_id': None,
+                'backtest_start_time': started,
+                'timeframe': stats.get('timeframe'),
+                'timeframe_detail': stats.get('timeframe_detail'),
+                'backtest_start_ts': stats.get('backtest_start_ts'),
+                'backtest_end_ts': stats.get('backtest_end_ts')
+            }
+            for name, stats in backtest_data.get('strategy', {}).items()
+        }
+        with open(zip_file.with_suffix('.meta.json'), 'w') as f:
+            json.dump(meta, f)
+        
+        return zip_file
+    
+    def _archive_result(self, zip_file: Path) -> Path:
+        """Copy a result zip (and its .meta.json) into the indexed results directory"""
+        
+        archive_dir = self.run_index.results_dir
+        if zip_file.parent == archive_dir:
+            return zip_file
+        
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        with self._archive_lock:
+            # Parallel batch jobs can export zips with the same timestamped name
+            target = archive_dir / zip_file.name
+            counter = 1
+            while target.exists():
+                target = archive_dir / f"{zip_file.stem}_{counter}.zip"
+                counter += 1
+            
+            shutil.copy2(zip_file, target)
+            meta_file = zip_file.with_suffix('.meta.json')
+            if meta_file.exists():
+                shutil.copy2(meta_file, target.with_suffix('.meta.json'))
+        
+        self.run_index.index_file(target)
+        return target
+    
+    def query_runs(self, metric: str = 'sharpe', limit: int = 20, strategy_name: str = None,
+                   strategy_code: str = None) -> List[Dict[str, Any]]:
+        """Best indexed backtest runs by metric, optionally only for one strategy name or source"""
+        self.run_index.refresh()
+        return self.run_index.top_runs(
+            metric, limit,
+            strategy=strategy_name,
+            code_hash=code_hash(strategy_code) if strategy_code is not None else None
+        )
+    
+    def _process_backtest_data(self, backtest_data: Dict[str, Any], results: Dict[str, Any], stdout: str = ""):
+        """Fill stats, trades and equity curve from a loaded backtest result dict"""
+        
+        strategy_results = {}
+        
+        # Extract statistics from strategy results
+        if 'strategy' in backtest_data:
+            strategy_results = list(backtest_data['strategy'].values())[0]
+            
+            results['stats'] = {
+                'total_return': f"{strategy_results.get('profit_total_pct', 0):.2f}%",
+                'sharpe': f"{strategy_results.get('sharpe', 0):.2f}",
+                'max_drawdown': f"{strategy_results.get('max_drawdown_account', 0) * 100:.2f}%",
+                'total_trades': strategy_results.get('total_trades', 0),
+                'profitable_trades': strategy_results.get('wins', 0),
+                'avg_profit': f"{strategy_results.get('profit_mean_pct', 0):.2f}%"
+            }
+            
+            # Also populate trade_stats for the trades table
+            results['trade_stats'] = {
+                'total_trades': strategy_results.get('total_trades', 0),
+                'profitable_trades': strategy_results.get('wins', 0),
+                'avg_profit': f"{strategy_results.get('profit_mean_pct', 0):.2f}%"
+            }
+            
+            # Extract detailed trades from strategy results
+            if 'trades' in strategy_results and strategy_results['trades']:
+                trades_list = strategy_results['trades']
+                print(f"📊 Найдено детальных сделок: {len(trades_list)}")
+                
+                # Typed columns with raw numbers; the trades view formats them for display
+                trades_df = build_trades_frame(trades_list, strategy_results.get('stake_currency', 'USDT'))
+                results['trades'] = trades_df
+                print(f"📊 Создан DataFrame сделок: {len(trades_df)} сделок")
+            else:
+                print("📊 Детальные сделки не найдены в strategy results")
+                # Попробуем извлечь информацию из текстового вывода
+                self._extract_trades_from_stdout(stdout, results)
+        
+        # Generate equity curve
+        trades_df = results.get('trades')
+        if trades_df is not None and not trades_df.empty:
+            print("📊 Генерирую equity curve из детальных сделок...")
+            equity_data = self._generate_equity_curve(trades_df, strategy_results)
+            results['equity'] = equity_data
+            print(f"📊 Equity curve создан: {len(equity_data)} точек")
+            # Monte Carlo is computed on demand (run_monte_carlo / MonteCarloThread), not while parsing
+            results['starting_balance'] = float(strategy_results.get('starting_balance',
+                                                                     self.default_config['dry_run_wallet']))
+        else:
+            print("📊 Нет данных для equity curve - создаю базовый")
+            # Создаем базовый equity curve на основе статистики
+            equity_data = self._create_basic_equity_curve(results.get('stats', {}))
+            results['equity'] = equity_data
+            print(f"📊 Базовый equity curve создан: {len(equity_data)} точек")
+    
+    def run_monte_carlo(self, results: Dict[str, Any], simulations: int = 10_000,
+                        method: str = 'bootstrap') -> Optional[Dict[str, Any]]:
+        """Resample the trades of parsed backtest results for final equity / drawdown / under-water
+        distributions; computed once per results dict and stored under 'monte_carlo'"""
+        
+        if results.get('monte_carlo') is not None:
+            return results['monte_carlo']
+        
+        trades_df = results.get('trades')
+        if trades_df is None or trades_df.empty or 'profit_abs' not in trades_df.columns:
+            return None
+        
+        starting_balance = float(results.get('starting_balance', self.default_config['dry_run_wallet']))
+        try:
+            monte_carlo = monte_carlo_trades(trades_df, starting_balance, simulations, method)
+        except Exception as e:
+            print(f"⚠️ Monte Carlo не выполнен: {e}")
+            return None
+        
+        results['monte_carlo'] = monte_carlo
+        print(f"🎲 Monte Carlo: {monte_carlo['simulations']} симуляций за {monte_carlo['elapsed_ms']:.0f} ms, "
+              f"P(убыток)={monte_carlo['probability_of_loss'] * 100:.1f}%")
+        return monte_carlo
+    
+    def _parse_backtest_data(self, backtest_data: Dict[str, Any], stdout: str = "", stderr: str = "") -> Dict[str, Any]:
+        """Parse an in-memory backtest result dict (e.g. returned by a warm worker)"""
+        
+        results = {
+            'success': True,
+            'stdout': stdout,
+            'stderr': stderr,
+            'stats': {},
+            'trades': None,
+            'equity': None
+        }
+        
+        try:
+            self._process_backtest_data(backtest_data, results, stdout)
+            self._parse_summary_from_output(stdout, results)
+        except Exception as e:
+            print(f"❌ Ошибка при обработке результатов: {e}")
+            results['success'] = False
+            results['error'] = str(e)
+        
+        return results
     
     def _parse_hyperopt_results(self, stdout: str, stderr: str) -> Dict[str, Any]:
         """Parse hyperopt results from output"""
@@ -470,68 +1075,33 @@ class FreqtradeRunner:
         
         return results
     
-    def _generate_equity_curve(self, trades_df: pd.DataFrame) -> pd.DataFrame:
-        """Generate equity curve from trades"""
+    def _generate_equity_curve(self, trades_df: pd.DataFrame, strategy_results: Dict[str, Any] = None) -> pd.DataFrame:
+        """Generate per-candle mark-to-market equity curve from trades and local candles"""
         
         if trades_df is None or trades_df.empty:
             print("📊 Нет сделок для генерации equity curve")
             return pd.DataFrame()
         
+        # Run settings fall back to the runner config (e.g. synthetic trades from stdout)
+        run_settings = {
+            'timeframe': self.default_config['timeframe'],
+            'starting_balance': self.default_config['dry_run_wallet']
+        }
+        run_settings.update(strategy_results or {})
+        
         try:
             print(f"📊 Обрабатываю {len(trades_df)} сделок для equity curve")
-            print(f"📊 Колонки в trades_df: {list(trades_df.columns)}")
-            
-            # Проверяем необходимые колонки
-            required_columns = ['close_timestamp', 'profit_ratio']
-            missing_columns = [col for col in required_columns if col not in trades_df.columns]
-            
-            if missing_columns:
-                print(f"❌ Отсутствуют колонки: {missing_columns}")
-                # Попробуем альтернативные названия
-                if 'close_date' in trades_df.columns:
-                    trades_df['close_timestamp'] = trades_df['close_date']
-                if 'profit_pct' in trades_df.columns:
-                    trades_df['profit_ratio'] = trades_df['profit_pct'] / 100
-                elif 'profit_abs' in trades_df.columns:
-                    # Используем абсолютную прибыль
-                    initial_balance = 1000
-                    trades_df['profit_ratio'] = trades_df['profit_abs'] / initial_balance
-            
-            # Если все еще нет нужных колонок, создаем базовую equity curve
-            if 'close_timestamp' not in trades_df.columns or 'profit_ratio' not in trades_df.columns:
-                print("📊 Создаю упрощенную equity curve")
-                import datetime
-                return pd.DataFrame({
-                    'date': [datetime.datetime.now() - datetime.timedelta(days=1), datetime.datetime.now()],
-                    'equity': [1000.0, 1000.0],
-                    'drawdown': [0.0, 0.0]
-                })
-            
-            # Sort trades by close time
-            trades_df = trades_df.sort_values('close_timestamp')
             
-            # Calculate cumulative profit
-            trades_df['cumulative_profit'] = trades_df['profit_ratio'].cumsum()
-            
-            # Create equity curve
-            equity_data = pd.DataFrame({
-                'date': pd.to_datetime(trades_df['close_timestamp']),
-                'equity': 1000 * (1 + trades_df['cumulative_profit']),  # Assuming $1000 starting balance
-                'drawdown': trades_df['cumulative_profit'] * 100  # Convert to percentage
-            })
+            equity_data = self.equity_engine.build_for_results(
+                trades_df, run_settings, exchange=self.default_config['exchange']['name']
+            )
             
-            print(f"📊 Equity curve успешно создан: {len(equity_data)} точек")
+            print(f"📊 Equity curve успешно создан: {len(equity_data)} свечей")
             return equity_data
             
         except Exception as e:
             print(f"❌ Ошибка при генерации equity curve: {e}")
-            # Возвращаем простую equity curve в случае ошибки
-            import datetime
-            return pd.DataFrame({
-                'date': [datetime.datetime.now() - datetime.timedelta(days=1), datetime.datetime.now()],
-                'equity': [1000.0, 1000.0],
-                'drawdown': [0.0, 0.0]
-            })
+            return pd.DataFrame()
     
     def _parse_summary_from_output(self, output: str, results: Dict):
         """Parse summary statistics from CLI output"""
@@ -662,34 +1232,23 @@ class FreqtradeRunner:
                     exit_price = entry_prices[i] * (1 + profit_ratio)
                     exit_prices.append(exit_price)
                 
-                # Calculate durations
-                durations = []
-                for entry_date, exit_date in trade_dates:
-                    duration = exit_date - entry_date
-                    # Format duration as "X days, Y hours"
-                    days = duration.days
-                    hours = duration.seconds // 3600
-                    if days > 0:
-                        durations.append(f"{days} days, {hours}h")
-                    else:
-                        durations.append(f"{hours}h {(duration.seconds % 3600) // 60}m")
+                # Durations in minutes, like exported trades
+                durations = [int((exit_date - entry_date).total_seconds() // 60) for entry_date, exit_date in trade_dates]
                 
-                # Create DataFrame with trade details
+                # Create DataFrame with the same typed columns as build_trades_frame
                 synthetic_trades = pd.DataFrame({
-                    'entry_date': [date_pair[0].strftime('%Y-%m-%d %H:%M:%S') for date_pair in trade_dates],
-                    'exit_date': [date_pair[1].strftime('%Y-%m-%d %H:%M:%S') for date_pair in trade_dates],
+                    'entry_date': pd.to_datetime([date_pair[0] for date_pair in trade_dates]).tz_localize('UTC'),
+                    'exit_date': pd.to_datetime([date_pair[1] for date_pair in trade_dates]).tz_localize('UTC'),
                     'pair': pairs,
-                    'side': sides,
-                    'amount': [f"{amount:.4f}" for amount in amounts],
-                    'entry_price': [f"{price:.2f}" for price in entry_prices],
-                    'exit_price': [f"{price:.2f}" for price in exit_prices],
-                    'profit': [f"{profit:.2f} USDT" for profit in (amounts * entry_prices * profits_pct / 100)],
-                    'profit_pct': [f"{profit:.2f}%" for profit in profits_pct],
-                    'duration': durations,
-                    # Also keep data for equity curve
-                    'close_timestamp': [date_pair[1] for date_pair in trade_dates],
-                    'profit_ratio': profits_pct / 100
+                    'is_short': np.array(sides) == 'short',
+                    'amount': amounts,
+                    'entry_price': entry_prices,
+                    'exit_price': np.array(exit_prices),
+                    'profit_abs': amounts * entry_prices * profits_pct / 100,
+                    'profit_ratio': profits_pct / 100,
+                    'duration': np.array(durations, dtype=np.int64)
                 })
+                synthetic_trades.attrs['stake_currency'] = 'USDT'
                 
                 results['trades'] = synthetic_trades
                 
@@ -710,80 +1269,35 @@ class FreqtradeRunner:
             traceback.print_exc()
     
     def _create_basic_equity_curve(self, stats: Dict) -> pd.DataFrame:
-        """Create a basic equity curve when detailed trade data is not available"""
+        """Create a start/end equity curve when detailed trade data is not available"""
+        import datetime
+        
+        # Extract total return
+        total_return_str = stats.get('total_return', '0%')
         try:
-            import datetime
-            
-            # Extract total return
-            total_return_str = stats.get('total_return', '0%')
-            try:
-                total_return = float(total_return_str.replace('%', '')) / 100
-            except:
-                total_return = 0.0
-            
-            # Create a simple equity curve over 30 days
-            days = 30
-            dates = [datetime.datetime.now() - datetime.timedelta(days=days-i) for i in range(days)]
-            
-            # Create a realistic equity curve that ends at total_return
-            np.random.seed(42)  # For reproducible results
-            
-            # Generate daily returns that sum to total_return
-            daily_volatility = 0.01  # 1% daily volatility
-            returns = np.random.normal(0, daily_volatility, days-1)
-            
-            # Adjust last return to match total return
-            current_return = np.sum(returns)
-            adjustment = total_return - current_return
-            returns = np.append(returns, adjustment)
-            
-            # Calculate cumulative returns
-            cumulative_returns = np.cumsum(returns)
-            
-            # Convert to equity values (starting at $1000)
-            equity_values = 1000 * (1 + cumulative_returns)
-            # Prepend starting value
-            equity_values = np.concatenate([[1000], equity_values])
-            
-            # Ensure we have the same number of dates and equity values
-            if len(equity_values) != len(dates):
-                equity_values = equity_values[:len(dates)]
-            
-            # Calculate drawdown
-            peak = np.maximum.accumulate(equity_values)
-            drawdown = (equity_values - peak) / peak * 100
-            
-            equity_df = pd.DataFrame({
-                'date': dates,
-                'equity': equity_values,
-                'drawdown': drawdown
-            })
-            
-            print(f"📊 Создан базовый equity curve: {len(equity_df)} точек, итоговая доходность: {total_return:.2%}")
-            return equity_df
-            
-        except Exception as e:
-            print(f"❌ Ошибка создания базового equity curve: {e}")
-            # Fallback to very simple curve
-            import datetime
-            
-            # Extract total return for fallback
-            total_return_str = stats.get('total_return', '0%')
-            try:
-                total_return = float(total_return_str.replace('%', '')) / 100
-            except:
-                total_return = 0.0
-            
-            final_equity = 1000.0 * (1 + total_return)
-            
-            return pd.DataFrame({
-                'date': [datetime.datetime.now() - datetime.timedelta(days=1), datetime.datetime.now()],
-                'equity': [1000.0, final_equity],
-                'drawdown': [0.0, 0.0]
-            })
+            total_return = float(str(total_return_str).replace('%', '')) / 100
+        except ValueError:
+            total_return = 0.0
+        
+        starting_balance = float(self.default_config['dry_run_wallet'])
+        final_equity = starting_balance * (1 + total_return)
+        
+        # Only the two known points - no per-candle path without trades
+        now = datetime.datetime.now()
+        equity_df = pd.DataFrame({
+            'date': [now - datetime.timedelta(days=30), now],
+            'equity': [starting_balance, final_equity],
+            'drawdown': [0.0, min(0.0, total_return * 100)]
+        })
+        
+        print(f"📊 Создан базовый equity curve, итоговая доходность: {total_return:.2%}")
+        return equity_df
     
     def cleanup(self):
         """Clean up temporary files"""
+        self.cancel_all()
+        self.stop_worker_pool()
+        self.run_index.close()
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
 
@@ -792,9 +1306,11 @@ class BacktestThread(QThread):
     """Background thread for running backtests"""
     
     # Signals
-    finished = Signal(dict)  # Results
-    error = Signal(str)      # Error message
-    progress = Signal(str)   # Progress update
+    finished = Signal(dict)        # Results
+    error = Signal(str)            # Error message
+    progress = Signal(str)         # Progress update
+    progress_event = Signal(dict)  # Structured progress (phase, pair, percent, message)
+    cancelled = Signal()           # Job was cancelled
     
     def __init__(self, runner: FreqtradeRunner, strategy_code: str, 
                  strategy_name: str = "GeneratedStrategy", config_overrides: Dict = None):
@@ -803,6 +1319,12 @@ class BacktestThread(QThread):
         self.strategy_code = strategy_code
         self.strategy_name = strategy_name
         self.config_overrides = config_overrides or {}
+        self.cancel_token = CancelToken()
+        self._last_phase = None
+    
+    def cancel(self):
+        """Stop the backtest; the thread finishes as soon as freqtrade is killed"""
+        self.cancel_token.cancel()
     
     def run(self):
         """Run backtest in background thread"""
@@ -812,23 +1334,84 @@ class BacktestThread(QThread):
             results = self.runner.run_backtest(
                 self.strategy_code,
                 self.strategy_name,
-                self.config_overrides
+                self.config_overrides,
+                progress_callback=self._on_progress,
+                cancel_token=self.cancel_token
             )
             
             self.progress.emit("Backtest completed!")
             self.finished.emit(results)
             
+        except JobCancelled:
+            self.progress.emit("Backtest cancelled")
+            self.cancelled.emit()
         except Exception as e:
             self.error.emit(str(e))
+    
+    def _on_progress(self, event: Dict[str, Any]):
+        """Forward progress events; phase changes also go to the text log"""
+        self.progress_event.emit(event)
+        if event['phase'] != self._last_phase:
+            self._last_phase = event['phase']
+            self.progress.emit(f"Backtest: {event['phase']} ({event['percent']}%)")
+
+
+class BatchBacktestThread(QThread):
+    """Background thread for running a batch of backtests in parallel"""
+    
+    # Signals
+    job_finished = Signal(int, dict)  # Job index, results
+    finished = Signal(list)           # All results in job order
+    error = Signal(str)               # Error message
+    progress = Signal(str)            # Progress update
+    cancelled = Signal()              # Batch was cancelled
+    
+    def __init__(self, runner: FreqtradeRunner, jobs: List[Dict[str, Any]], max_workers: int = None):
+        super().__init__()
+        self.runner = runner
+        self.jobs = jobs
+        self.max_workers = max_workers
+        self.cancel_token = CancelToken()
+        self._done = 0
+    
+    def cancel(self):
+        """Stop running jobs and skip the queued ones"""
+        self.cancel_token.cancel()
+    
+    def run(self):
+        """Run batch in background thread"""
+        try:
+            self.progress.emit(f"Starting batch of {len(self.jobs)} backtests...")
+            
+            results = self.runner.run_backtest_batch(self.jobs, self.max_workers, self._on_job_finished,
+                                                     self.cancel_token)
+            
+            self.progress.emit("Batch completed!")
+            self.finished.emit(results)
+            
+        except JobCancelled:
+            self.progress.emit("Batch cancelled")
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+    
+    def _on_job_finished(self, index: int, job: Dict[str, Any], results: Dict[str, Any]):
+        self._done += 1
+        status = "ok" if results.get('success') else f"failed: {results.get('error', '')}"
+        self.progress.emit(f"[{self._done}/{len(self.jobs)}] {job.get('pairs', '')} {job.get('timerange', '')} {status}")
+        self.job_finished.emit(index, results)
 
 
 class HyperoptThread(QThread):
     """Background thread for running hyperopt"""
     
     # Signals
-    finished = Signal(dict)  # Results
-    error = Signal(str)      # Error message
-    progress = Signal(str)   # Progress update
+    finished = Signal(dict)        # Results
+    error = Signal(str)            # Error message
+    progress = Signal(str)         # Progress update
+    progress_event = Signal(dict)  # Structured progress (phase, pair, percent, message)
+    epoch_update = Signal(dict)    # Evaluated epoch with the current leaderboard
+    cancelled = Signal()           # Job was cancelled
     
     def __init__(self, runner: FreqtradeRunner, strategy_code: str,
                  strategy_name: str = "GeneratedStrategy", config_overrides: Dict = None,
@@ -839,6 +1422,12 @@ class HyperoptThread(QThread):
         self.strategy_name = strategy_name
         self.config_overrides = config_overrides or {}
         self.epochs = epochs
+        self.cancel_token = CancelToken()
+        self._last_phase = None
+    
+    def cancel(self):
+        """Stop the hyperopt; the thread finishes as soon as freqtrade is killed"""
+        self.cancel_token.cancel()
     
     def run(self):
         """Run hyperopt in background thread"""
@@ -849,11 +1438,92 @@ class HyperoptThread(QThread):
                 self.strategy_code,
                 self.strategy_name,
                 self.config_overrides,
-                self.epochs
+                self.epochs,
+                progress_callback=self._on_progress,
+                cancel_token=self.cancel_token,
+                epoch_callback=self._on_epoch
             )
             
             self.progress.emit("Hyperopt completed!")
             self.finished.emit(results)
             
+        except JobCancelled:
+            self.progress.emit("Hyperopt cancelled")
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(str(e))
+    
+    def _on_progress(self, event: Dict[str, Any]):
+        """Forward progress events; phase changes also go to the text log"""
+        self.progress_event.emit(event)
+        if event['phase'] != self._last_phase:
+            self._last_phase = event['phase']
+            self.progress.emit(f"Hyperopt: {event['phase']} ({event['percent']}%)")
+    
+    def _on_epoch(self, event: Dict[str, Any]):
+        """Forward epoch updates (called from the epochs file monitor thread)"""
+        self.epoch_update.emit(event)
+        marker = " *" if event['rank'] == 1 else ""
+        self.progress.emit(f"Epoch {event['epoch']}/{event['total_epochs']}: "
+                           f"loss {event['loss']:.5f}, best {event['best_loss']:.5f}{marker}")
+
+
+class MonteCarloThread(QThread):
+    """Background thread for the Monte Carlo resampling of finished backtest results"""
+    
+    # Signals
+    finished = Signal(dict)  # Monte Carlo results
+    error = Signal(str)      # Error message
+    
+    def __init__(self, runner: FreqtradeRunner, results: Dict[str, Any]):
+        super().__init__()
+        self.runner = runner
+        self.results = results
+        self.cancel_token = CancelToken()
+    
+    def cancel(self):
+        """Drop the result; the resampling itself is short and runs to the end"""
+        self.cancel_token.cancel()
+    
+    def run(self):
+        """Resample the trades in background thread"""
+        try:
+            monte_carlo = self.runner.run_monte_carlo(self.results)
+            if monte_carlo is not None and not self.cancel_token.cancelled:
+                self.finished.emit(monte_carlo)
+            
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class PreviewThread(QThread):
+    """Background thread for signal previews; a newer preview cancels the older one"""
+    
+    # Signals
+    finished = Signal(dict)  # Preview results
+    error = Signal(str)      # Error message
+    cancelled = Signal()     # Preempted by a newer preview
+    
+    def __init__(self, runner: FreqtradeRunner, graph_data: Dict[str, Any], timerange: str = None):
+        super().__init__()
+        self.runner = runner
+        self.graph_data = graph_data
+        self.timerange = timerange
+        self.cancel_token = CancelToken()
+    
+    def cancel(self):
+        self.cancel_token.cancel()
+    
+    def run(self):
+        """Evaluate the preview in background thread"""
+        try:
+            results = self.runner.preview_engine.preview_graph_data(
+                self.graph_data, self.timerange, self.cancel_token
+            )
+            self.cancel_token.raise_if_cancelled()
+            self.finished.emit(results)
+            
+        except JobCancelled:
+            self.cancelled.emit()
         except Exception as e:
             self.error.emit(str(e))
@@ -0,0 +1,208 @@
+"""
+Streaming executor - runs freqtrade CLI commands line by line
+
+Replaces subprocess.run(capture_output=True): stdout/stderr are read by background
+threads as the process writes them, freqtrade log lines are turned into structured
+progress events, and only a bounded tail of the output is kept in memory.
+"""
+
+import queue
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable
+
+from cancellation import CancelToken, JobCancelled, kill_process_tree, popen_group_kwargs
+
+
+# (pattern, phase, coarse percent) for freqtrade backtesting/hyperopt log lines
+PHASE_PATTERNS = [
+    (re.compile(r"Using resolved strategy (\S+)"), 'loading_strategy', 5),
+    (re.compile(r"Loading data from .* up to"), 'loading_data', 10),
+    (re.compile(r"Dataload complete\. Calculating indicators"), 'indicators', 40),
+    (re.compile(r"Running backtesting for Strategy (\S+)"), 'backtesting', 60),
+    (re.compile(r"Backtesting with data from"), 'backtesting', 70),
+    (re.compile(r"[Dd]umping json to|Storing backtest results"), 'exporting', 95),
+    (re.compile(r"Hyperopting with data from|Using optimizer random state"), 'hyperopt', 0),
+]
+
+PAIR_PATTERN = re.compile(r"\b([A-Z][A-Z0-9]+/[A-Z][A-Z0-9]+(?::[A-Z0-9]+)?)\b")
+EPOCH_PATTERN = re.compile(r"(?:Epochs?\D*?|^\s*\|?\s*\*?\s*(?:Best)?\s*)(\d+)\s*/\s*(\d+)")
+PERCENT_PATTERN = re.compile(r"(\d{1,3})\s*%")
+
+
+class ProgressParser:
+    """Turns freqtrade output lines into progress events (phase, pair, percent)"""
+
+    def __init__(self):
+        self.phase = 'starting'
+        self.percent = 0
+        self.pair = None
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        """Return a progress event for the line, or None if it carries no progress information"""
+
+        changed = False
+
+        for pattern, phase, percent in PHASE_PATTERNS:
+            if pattern.search(line):
+                if phase != self.phase:
+                    self.phase = phase
+                    changed = True
+                if percent > self.percent:
+                    self.percent = percent
+                    changed = True
+                break
+
+        pair_match = PAIR_PATTERN.search(line)
+        if pair_match and pair_match.group(1) != self.pair:
+            self.pair = pair_match.group(1)
+            changed = True
+
+        if self.phase == 'hyperopt' or 'poch' in line:
+            epoch_match = EPOCH_PATTERN.search(line)
+            if epoch_match and int(epoch_match.group(2)) > 0:
+                current, total = int(epoch_match.group(1)), int(epoch_match.group(2))
+                self.phase = 'hyperopt'
+                percent = min(100, current * 100 // total)
+                if percent != self.percent:
+                    self.percent = percent
+                    changed = True
+        elif '━' in line or '█' in line:
+            percent_match = PERCENT_PATTERN.search(line)
+            if percent_match and int(percent_match.group(1)) != self.percent:
+                self.percent = min(100, int(percent_match.group(1)))
+                changed = True
+
+        if not changed:
+            return None
+
+        return {
+            'phase': self.phase,
+            'pair': self.pair,
+            'percent': self.percent,
+            'message': line.strip()
+        }
+
+
+class StreamingProcess:
+    """Runs a command with line-streamed output, progress events and a bounded output tail"""
+
+    def __init__(self, cmd: List[str], cwd: str = None,
+                 on_line: Callable[[str, str], None] = None,
+                 on_progress: Callable[[Dict[str, Any]], None] = None,
+                 stdout_tail: int = 2000, stderr_tail: int = 500,
+                 cancel_token: CancelToken = None, env: Dict[str, str] = None):
+        self.cmd = cmd
+        self.cwd = cwd
+        self.env = env
+        self.on_line = on_line
+        self.on_progress = on_progress
+        self.parser = ProgressParser()
+        self.stdout_lines = deque(maxlen=stdout_tail)
+        self.stderr_lines = deque(maxlen=stderr_tail)
+        self.cancel_token = cancel_token
+        self.process: Optional[subprocess.Popen] = None
+
+    def run(self, timeout: float = None) -> subprocess.CompletedProcess:
+        """Run to completion
+        
+        Raises subprocess.TimeoutExpired on timeout and JobCancelled when the cancel token
+        fires; in both cases the whole process tree is killed first.
+        """
+
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+        self.process = subprocess.Popen(
+            self.cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=self.cwd,
+            env=self.env,
+            **popen_group_kwargs()
+        )
+
+        # The wait loop polls the token, so the (possibly blocking) tree kill
+        # happens on this thread and never on the thread that requested cancellation
+        return self._wait(timeout)
+
+    def cancel(self) -> None:
+        """Kill the process and all of its children"""
+
+        if self.process is not None:
+            kill_process_tree(self.process)
+
+    def _wait(self, timeout: float = None) -> subprocess.CompletedProcess:
+
+        lines: "queue.Queue" = queue.Queue()
+        readers = [
+            threading.Thread(target=self._read_pipe, args=(self.process.stdout, 'stdout', lines), daemon=True),
+            threading.Thread(target=self._read_pipe, args=(self.process.stderr, 'stderr', lines), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        deadline = time.monotonic() + timeout if timeout else None
+        open_streams = len(readers)
+
+        while open_streams:
+            if self.cancel_token is not None and self.cancel_token.cancelled:
+                self.cancel()
+                raise JobCancelled("Process was cancelled")
+
+            if deadline is not None and time.monotonic() > deadline:
+                self.cancel()
+                raise subprocess.TimeoutExpired(self.cmd, timeout, self.stdout_text, self.stderr_text)
+
+            try:
+                stream, line = lines.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if line is None:
+                open_streams -= 1
+                continue
+
+            self._handle_line(stream, line)
+
+        returncode = self.process.wait()
+
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise JobCancelled("Process was cancelled")
+
+        if self.on_progress is not None and returncode == 0:
+            self.on_progress({'phase': 'done', 'pair': self.parser.pair, 'percent': 100, 'message': ''})
+
+        return subprocess.CompletedProcess(self.cmd, returncode, self.stdout_text, self.stderr_text)
+
+    @property
+    def stdout_text(self) -> str:
+        return ''.join(self.stdout_lines)
+
+    @property
+    def stderr_text(self) -> str:
+        return ''.join(self.stderr_lines)
+
+    def _read_pipe(self, pipe, stream: str, lines: "queue.Queue"):
+        try:
+            for line in iter(pipe.readline, ''):
+                lines.put((stream, line))
+        finally:
+            pipe.close()
+            lines.put((stream, None))
+
+    def _handle_line(self, stream: str, line: str):
+        (self.stdout_lines if stream == 'stdout' else self.stderr_lines).append(line)
+
+        if self.on_line is not None:
+            self.on_line(stream, line)
+
+        if self.on_progress is not None:
+            event = self.parser.parse(line)
+            if event is not None:
+                self.on_progress(event)
@@ -0,0 +1,70 @@
+"""
+Data quality pipeline: gap filling and candle repair masks
+"""
+
+import numpy as np
+import pytest
+
+from data_quality import PREPROCESSING_DEFAULTS, fill_gaps, preprocess_candles, repair_candles
+
+
+HOUR_NS = 3600 * 10**9
+
+
+def _candles(hours, close=None):
+    close = np.asarray(close if close is not None else np.arange(len(hours)) + 100.0, dtype=float)
+    return {
+        'date': (np.asarray(hours, dtype=np.int64) * HOUR_NS).view('datetime64[ns]'),
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': np.full(len(close), 10.0)
+    }
+
+
+def test_fill_gaps_fills_every_gap_like_freqtrade():
+    # A 1-candle and a 3-candle gap on 1h data: both are longer than the default 30 minutes
+    candles = _candles([0, 1, 3, 4, 8])
+    filled, info = fill_gaps(candles, HOUR_NS, 30 * 60 * 10**9)
+
+    assert filled['date'].view(np.int64).tolist() == [hour * HOUR_NS for hour in range(9)]
+    inserted = [2, 5, 6, 7]
+    previous_close = {2: 101.0, 5: 103.0, 6: 103.0, 7: 103.0}
+    for row in inserted:
+        for column in ('open', 'high', 'low', 'close'):
+            assert filled[column][row] == previous_close[row]
+        assert filled['volume'][row] == 0.0
+    assert filled['close'][8] == 104.0
+    assert info == {'gaps': 2, 'missing': 4, 'largest_gap_minutes': 180.0, 'large_gaps': 2, 'filled': 4}
+
+
+def test_fill_gaps_measures_gaps_by_missing_candles():
+    candles = _candles([0, 1, 3, 4, 8])
+    _, info = fill_gaps(candles, HOUR_NS, 60 * 60 * 10**9)
+    assert info['large_gaps'] == 1 and info['largest_gap_minutes'] == 180.0
+
+
+def test_fill_missing_off_only_reports_gaps():
+    settings = dict(PREPROCESSING_DEFAULTS, fill_missing=False)
+    processed, report = preprocess_candles(_candles([0, 1, 3]), '1h', settings)
+    assert len(processed['close']) == 3
+    assert report['missing'] == 1 and report['filled'] == 0
+
+
+@pytest.mark.parametrize('use_ohlcv_preprocessing', [False, True])
+def test_repair_masks_invalid_candles(use_ohlcv_preprocessing):
+    candles = _candles(range(5))
+    candles['high'][2] = candles['close'][2] - 5.0   # high below close
+    candles['volume'][3] = -1.0                       # negative volume
+    settings = dict(PREPROCESSING_DEFAULTS, use_ohlcv_preprocessing=use_ohlcv_preprocessing)
+
+    repaired, counts = repair_candles(candles, settings)
+
+    assert counts['invalid'] == 2
+    if use_ohlcv_preprocessing:
+        for row in (2, 3):
+            assert repaired['open'][row] == repaired['high'][row] == repaired['close'][row] == 101.0
+        assert repaired['volume'][3] == 0.0
+    else:
+        assert repaired is candles
@@ -0,0 +1,42 @@
+"""
+Exporter optimizer: common subexpression elimination keys
+"""
+
+import contextlib
+import io
+
+from exporter import StrategyExporter
+
+
+def _graph_data(indicators):
+    nodes = [{'id': 'market', 'type': 'market_data', 'parameters': {'pair': 'BTC/USDT', 'timeframe': '1h'}}]
+    connections = []
+    for node_id, parameters in indicators.items():
+        nodes.append({'id': node_id, 'type': 'indicator', 'parameters': parameters})
+        connections.append({'from': 'market.candles', 'to': f'{node_id}.candles'})
+    return StrategyExporter()._analyze_graph_dict({'nodes': nodes, 'connections': connections})
+
+
+def _merged(indicators):
+    with contextlib.redirect_stdout(io.StringIO()):
+        exporter = StrategyExporter()
+        optimized = exporter._eliminate_common_subexpressions(_graph_data(indicators))
+    return sorted(set(indicators) - set(optimized['nodes']))
+
+
+def test_indicators_differing_in_unused_parameters_merge():
+    assert _merged({
+        'ema': {'indicator_type': 'EMA', 'period': 20, 'rsi_overbought': 70},
+        'ema_copy': {'indicator_type': 'EMA', 'period': 20, 'rsi_overbought': 80, 'macd_fast': 5},
+        'macd': {'indicator_type': 'MACD', 'period': 14},
+        'macd_copy': {'indicator_type': 'MACD', 'period': 30, 'macd_fast': 8}
+    }) == ['ema_copy', 'macd_copy']
+
+
+def test_indicators_differing_in_generated_call_stay():
+    assert _merged({
+        'ema': {'indicator_type': 'EMA', 'period': 20},
+        'ema_slow': {'indicator_type': 'EMA', 'period': 50},
+        'ema_high': {'indicator_type': 'EMA', 'period': 20, 'source': 'high'},
+        'sma': {'indicator_type': 'SMA', 'period': 20}
+    }) == []
@@ -0,0 +1,55 @@
+"""
+Monte Carlo resampling: computed on demand, not while parsing backtest results
+"""
+
+import contextlib
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from monte_carlo import monte_carlo_trades
+from result_reader import read_backtest_zip
+from runner import FreqtradeRunner
+
+
+SAMPLE_RESULT = (Path(__file__).resolve().parent.parent / 'user_data' / 'backtest_results' /
+                 'backtest-result-2025-07-01_19-56-45.zip')
+
+
+def _trades(profits):
+    return pd.DataFrame({
+        'exit_date': pd.date_range('2025-01-01', periods=len(profits), freq='h', tz='UTC'),
+        'profit_abs': profits
+    })
+
+
+def test_shuffle_keeps_final_equity():
+    profits = [10.0, -5.0, 3.0, -20.0, 7.0]
+    results = monte_carlo_trades(_trades(profits), 1000.0, simulations=500, method='shuffle', seed=1)
+    np.testing.assert_allclose(results['final_equity'], 1000.0 + sum(profits), rtol=1e-6)
+    # The -20 trade alone is a 2% drawdown from at most 1013, every order draws down at least that far
+    assert results['max_drawdown'].max() <= -1.9
+
+
+def test_bootstrap_is_seeded():
+    trades = _trades(np.linspace(-10, 12, 50))
+    first = monte_carlo_trades(trades, simulations=300, seed=7)
+    second = monte_carlo_trades(trades, simulations=300, seed=7)
+    np.testing.assert_array_equal(first['final_equity'], second['final_equity'])
+    assert len(first['bands']) == 50 and list(first['percentiles']) == ['final_equity', 'max_drawdown', 'under_water']
+
+
+def test_parsing_leaves_monte_carlo_for_later():
+    if not SAMPLE_RESULT.exists():
+        pytest.skip("sample backtest result not available")
+    runner = FreqtradeRunner()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner._parse_backtest_data(read_backtest_zip(SAMPLE_RESULT))
+        assert 'monte_carlo' not in results and not results['trades'].empty
+
+        monte_carlo = runner.run_monte_carlo(results, simulations=200)
+    assert results['monte_carlo'] is monte_carlo and monte_carlo['trades'] == len(results['trades'])
+    assert runner.run_monte_carlo(results) is monte_carlo
@@ -0,0 +1,281 @@
+"""
+Preview / export parity: the signal preview must fire on exactly the candles where the
+exported strategy's populate_* code sets enter_long / exit_long.
+
+Each graph is previewed with SignalPreviewEngine and exported with StrategyExporter; the
+exported populate_indicators / entry / exit lines run on the same candles with TA-Lib
+(or plain-Python reference implementations of its EMA/SMA/RSI when it is not
+installed, never the preview's own indicators) and freqtrade's
+merge_informative_pair and missing-candle fill (or their documented behaviour when
+freqtrade is not installed). Every case runs on the sample candles and on a copy
+with gaps of 1 to 31 missing candles.
+"""
+
+import contextlib
+import io
+import shutil
+import textwrap
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exporter import StrategyExporter
+from ohlcv_store import get_store
+from preview import SignalPreviewEngine
+
+
+SAMPLE_DATA = Path(__file__).resolve().parent.parent / 'user_data' / 'data' / 'binance' / 'BTC_USDT-1h.feather'
+NODE = 'frequi.nodes.{0}.{0}'
+
+# Rows removed from the sample candles for the gappy data set
+GAP_ROWS = [slice(100, 103), slice(500, 501), slice(900, 931)]
+
+
+def _graph(nodes, connections):
+    return {'nodes': nodes, 'connections': [{'from': a, 'to': b} for a, b in connections]}
+
+
+BASIC_GRAPH = _graph([
+    {'id': 'market', 'type': 'market_data', 'parameters': {'pair': 'BTC/USDT', 'timeframe': '1h'}},
+    {'id': 'ema_fast', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 12}},
+    {'id': 'ema_slow', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 26}},
+    {'id': 'rsi', 'type': 'indicator', 'parameters': {'indicator_type': 'RSI', 'period': 14}},
+    {'id': 'spread', 'type': 'math', 'parameters': {'operation': 'subtract'}},
+    {'id': 'spread_pct', 'type': 'math', 'parameters': {'operation': 'divide'}},
+    {'id': 'trend_up', 'type': 'logic', 'parameters': {'operation': 'greater_than', 'threshold': 0.001}},
+    {'id': 'overbought', 'type': 'logic', 'parameters': {'operation': 'greater_than', 'threshold': 70}},
+    {'id': 'not_overbought', 'type': 'logic', 'parameters': {'operation': 'NOT'}},
+    {'id': 'entry', 'type': 'logic', 'parameters': {'operation': 'AND'}},
+    {'id': 'enter', 'type': 'enter', 'parameters': {'side': 'long'}},
+    {'id': 'exit', 'type': 'exit', 'parameters': {'side': 'long'}}
+], [
+    ('market.candles', 'ema_fast.candles'), ('market.candles', 'ema_slow.candles'),
+    ('market.candles', 'rsi.candles'), ('ema_fast.values', 'spread.A'), ('ema_slow.values', 'spread.B'),
+    ('spread.result', 'spread_pct.A'), ('market.candles', 'spread_pct.B'),
+    ('spread_pct.result', 'trend_up.condition1'), ('rsi.values', 'overbought.condition1'),
+    ('overbought.result', 'not_overbought.condition1'), ('trend_up.result', 'entry.condition1'),
+    ('not_overbought.result', 'entry.condition2'), ('entry.result', 'enter.signal'),
+    ('spread.result', 'exit.signal')
+])
+
+INFORMATIVE_GRAPH = _graph([
+    {'id': 'md_1h', 'type_': NODE.format('MarketDataNode'), 'parameters': {'pair': 'BTC/USDT', 'timeframe': '1h'}},
+    {'id': 'md_4h', 'type_': NODE.format('MarketDataNode'), 'parameters': {'pair': 'BTC/USDT', 'timeframe': '4h'}},
+    {'id': 'ema_fast', 'type_': NODE.format('IndicatorNode'), 'parameters': {'indicator_type': 'EMA', 'period': 10}},
+    {'id': 'ema_4h', 'type_': NODE.format('IndicatorNode'), 'parameters': {'indicator_type': 'EMA', 'period': 20}},
+    {'id': 'diff', 'type_': NODE.format('MathNode'), 'parameters': {'operation': 'subtract'}},
+    {'id': 'close_vs', 'type_': NODE.format('MathNode'), 'parameters': {'operation': 'subtract'}},
+    {'id': 'enter', 'type_': NODE.format('EnterNode'), 'parameters': {'side': 'long'}},
+    {'id': 'exit', 'type_': NODE.format('ExitNode'), 'parameters': {'side': 'long'}}
+], [
+    ('md_1h.candles', 'ema_fast.candles'), ('md_4h.candles', 'ema_4h.candles'),
+    ('ema_fast.values', 'diff.A'), ('ema_4h.values', 'diff.B'), ('diff.result', 'enter.signal'),
+    ('md_4h.candles', 'close_vs.A'), ('ema_4h.values', 'close_vs.B'), ('close_vs.result', 'exit.signal')
+])
+
+HYPEROPT_GRAPH = _graph([
+    {'id': 'market', 'type': 'market_data', 'parameters': {'pair': 'BTC/USDT', 'timeframe': '1h'}},
+    {'id': 'fast', 'type_': NODE.format('HyperoptNode'),
+     'parameters': {'param_name': 'fast', 'param_type': 'Integer', 'min_value': 5, 'max_value': 30}},
+    {'id': 'ema_fast', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 10}},
+    {'id': 'ema_slow', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 50}},
+    {'id': 'sma', 'type': 'indicator', 'parameters': {'indicator_type': 'SMA', 'period': 20}},
+    {'id': 'cross', 'type': 'math', 'parameters': {'operation': 'subtract'}},
+    {'id': 'trend', 'type': 'math', 'parameters': {'operation': 'subtract'}},
+    {'id': 'above', 'type': 'logic', 'parameters': {'operation': 'greater_than', 'threshold': 0}},
+    {'id': 'uptrend', 'type': 'logic', 'parameters': {'operation': 'greater_than', 'threshold': 0}},
+    {'id': 'entry', 'type': 'logic', 'parameters': {'operation': 'AND'}},
+    {'id': 'enter', 'type': 'enter', 'parameters': {'side': 'long'}},
+    {'id': 'exit', 'type': 'exit', 'parameters': {'side': 'long'}}
+], [
+    ('market.candles', 'ema_fast.candles'), ('fast.value', 'ema_fast.period'),
+    ('market.candles', 'ema_slow.candles'), ('market.candles', 'sma.candles'),
+    ('ema_fast.values', 'cross.A'), ('ema_slow.values', 'cross.B'), ('sma.values', 'trend.A'),
+    ('ema_slow.values', 'trend.B'), ('cross.result', 'above.condition1'), ('trend.result', 'uptrend.condition1'),
+    ('above.result', 'entry.condition1'), ('uptrend.result', 'entry.condition2'),
+    ('entry.result', 'enter.signal'), ('cross.result', 'exit.signal')
+])
+
+# MathNode comparisons against their threshold, feeding a logic node
+MATH_COMPARISON_GRAPH = _graph([
+    {'id': 'market', 'type': 'market_data', 'parameters': {'pair': 'BTC/USDT', 'timeframe': '1h'}},
+    {'id': 'ema_fast', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 9}},
+    {'id': 'ema_slow', 'type': 'indicator', 'parameters': {'indicator_type': 'EMA', 'period': 21}},
+    {'id': 'rsi', 'type': 'indicator', 'parameters': {'indicator_type': 'RSI', 'period': 14}},
+    {'id': 'crossed', 'type': 'math',
+     'parameters': {'operation': 'subtract', 'comparison': 'greater', 'threshold': 25.0}},
+    {'id': 'rsi_ok', 'type': 'math', 'parameters': {'operation': 'multiply', 'use_constant': True, 'constant': 1.0,
+                                                   'comparison': 'less_equal', 'threshold': 65.0}},
+    {'id': 'entry', 'type': 'logic', 'parameters': {'operation': 'AND'}},
+    {'id': 'spread', 'type': 'math', 'parameters': {'operation': 'subtract', 'comparison': 'none'}},
+    {'id': 'enter', 'type': 'enter', 'parameters': {'side': 'long'}},
+    {'id': 'exit', 'type': 'exit', 'parameters': {'side': 'long'}}
+], [
+    ('market.candles', 'ema_fast.candles'), ('market.candles', 'ema_slow.candles'),
+    ('market.candles', 'rsi.candles'), ('ema_fast.values', 'crossed.A'), ('ema_slow.values', 'crossed.B'),
+    ('rsi.values', 'rsi_ok.A'), ('crossed.result', 'entry.condition1'), ('rsi_ok.result', 'entry.condition2'),
+    ('entry.result', 'enter.signal'), ('ema_fast.values', 'spread.A'), ('ema_slow.values', 'spread.B'),
+    ('spread.result', 'exit.signal')
+])
+
+EXPORTER_OPTIONS = {
+    'default': {},
+    'prune_columns': {'prune_columns': True},
+    'per_node_columns': {'fuse_expressions': False}
+}
+
+
+def _reference_ema(values, period):
+    """TA-Lib EMA: seeded with the SMA of the first `period` values"""
+    result = [np.nan] * len(values)
+    if len(values) < period:
+        return result
+    result[period - 1] = previous = sum(values[:period]) / period
+    for index in range(period, len(values)):
+        previous = previous + 2.0 / (period + 1) * (values[index] - previous)
+        result[index] = previous
+    return result
+
+
+def _reference_sma(values, period):
+    """TA-Lib SMA: running window sum"""
+    result = [np.nan] * len(values)
+    window = 0.0
+    for index, value in enumerate(values):
+        window += value - (values[index - period] if index >= period else 0.0)
+        if index >= period - 1:
+            result[index] = window / period
+    return result
+
+
+def _reference_rsi(values, period):
+    """TA-Lib RSI: Wilder averages of gains and losses seeded with their first-`period` means"""
+    result = [np.nan] * len(values)
+    if len(values) <= period:
+        return result
+    changes = [values[index] - values[index - 1] for index in range(1, len(values))]
+    gain = sum(max(change, 0.0) for change in changes[:period]) / period
+    loss = sum(max(-change, 0.0) for change in changes[:period]) / period
+    for index in range(period, len(values)):
+        if index > period:
+            change = changes[index - 1]
+            gain = (gain * (period - 1) + max(change, 0.0)) / period
+            loss = (loss * (period - 1) + max(-change, 0.0)) / period
+        result[index] = 100.0 * gain / (gain + loss) if gain + loss > 0 else 0.0
+    return result
+
+
+def _indicator_library():
+    """TA-Lib, else plain-Python references of its EMA/SMA/RSI (independent of the preview's NumPy code)"""
+    try:
+        import talib.abstract as ta
+        return ta
+    except ImportError:
+        def wrap(function):
+            return lambda series, timeperiod: pd.Series(function(series.tolist(), timeperiod), index=series.index)
+        return types.SimpleNamespace(EMA=wrap(_reference_ema), SMA=wrap(_reference_sma), RSI=wrap(_reference_rsi))
+
+
+def _merge_informative_pair(dataframe, informative, timeframe, timeframe_inf, ffill=True):
+    """freqtrade's merge: an informative candle is visible from the base candle its close falls in"""
+
+    try:
+        from freqtrade.strategy import merge_informative_pair
+        return merge_informative_pair(dataframe, informative, timeframe, timeframe_inf, ffill=ffill)
+    except ImportError:
+        pass
+
+    informative = informative.copy()
+    informative['date_merge'] = informative['date'] + pd.Timedelta(timeframe_inf) - pd.Timedelta(timeframe)
+    informative.columns = [f"{column}_{timeframe_inf}" for column in informative.columns]
+    dataframe = pd.merge(dataframe, informative, left_on='date', right_on=f'date_merge_{timeframe_inf}', how='left')
+    dataframe = dataframe.drop(f'date_merge_{timeframe_inf}', axis=1)
+    return dataframe.ffill() if ffill else dataframe
+
+
+def _fill_up_missing_data(dataframe, timeframe):
+    """freqtrade's fill of missing candles before backtesting: flat at the previous close, zero volume"""
+
+    try:
+        from freqtrade.data.converter import ohlcv_fill_up_missing_data
+        return ohlcv_fill_up_missing_data(dataframe, timeframe, 'BTC/USDT')
+    except ImportError:
+        pass
+
+    filled = dataframe.resample(pd.Timedelta(timeframe), on='date').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'})
+    filled['close'] = filled['close'].ffill()
+    for column in ('open', 'high', 'low'):
+        filled[column] = filled[column].fillna(filled['close'])
+    return filled.reset_index()
+
+
+def _exported_signals(exporter: StrategyExporter, graph: dict, data_dir: Path) -> dict:
+    """Run the exported populate_* lines on the base candles; enter_long / exit_long masks"""
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph_data = exporter._analyze_graph_dict(graph)
+        sections = exporter._generate_code_sections(graph_data)
+
+    lines = (sections['indicators'] + sections['parameter_indicators'] +
+             ["dataframe['enter_long'] = 0", "dataframe['exit_long'] = 0"] +
+             sections['entry_signals'] + sections['exit_signals'])
+    body = "\n".join(textwrap.dedent(line) for line in lines)
+    source = "def populate(self, dataframe, metadata):\n" + textwrap.indent(body, '    ') + "\n    return dataframe\n"
+
+    namespace = {'ta': _indicator_library(), 'np': np, 'pd': pd, 'merge_informative_pair': _merge_informative_pair}
+    exec(source, namespace)
+
+    store = get_store(data_dir)
+    strategy = types.SimpleNamespace(
+        timeframe=exporter._base_market_node(graph_data)['parameters']['timeframe'],
+        dp=types.SimpleNamespace(get_pair_dataframe=lambda pair, timeframe: _fill_up_missing_data(
+            store.frame(pair, timeframe, 'binance'), timeframe))
+    )
+    for node in graph_data['hyperopt_nodes']:
+        params = node['parameters']
+        setattr(strategy, params['param_name'], types.SimpleNamespace(
+            value=exporter._hyperopt_default(params),
+            range=range(int(params['min_value']), int(params['max_value']) + 1)
+        ))
+
+    dataframe = namespace['populate'](strategy, strategy.dp.get_pair_dataframe('BTC/USDT', strategy.timeframe),
+                                      {'pair': 'BTC/USDT'})
+    return {column: (dataframe[column] == 1).to_numpy() for column in ('enter_long', 'exit_long')}
+
+
+@pytest.fixture(scope='module', params=['sample', 'gaps'])
+def data_dir(request, tmp_path_factory):
+    """Copy of the sample 1h candles (or of the candles without GAP_ROWS); caches and
+    resampled files stay in the temp dir"""
+
+    if not SAMPLE_DATA.exists():
+        pytest.skip("sample candles not available")
+    data_dir = tmp_path_factory.mktemp('user_data') / 'data'
+    (data_dir / 'binance').mkdir(parents=True)
+    if request.param == 'sample':
+        shutil.copy(SAMPLE_DATA, data_dir / 'binance' / SAMPLE_DATA.name)
+    else:
+        candles = pd.read_feather(SAMPLE_DATA)
+        removed = np.concatenate([np.arange(len(candles))[rows] for rows in GAP_ROWS])
+        candles.drop(index=removed).reset_index(drop=True).to_feather(data_dir / 'binance' / SAMPLE_DATA.name)
+    return data_dir
+
+
+@pytest.mark.parametrize('options', EXPORTER_OPTIONS.values(), ids=EXPORTER_OPTIONS.keys())
+@pytest.mark.parametrize('graph', [BASIC_GRAPH, INFORMATIVE_GRAPH, HYPEROPT_GRAPH, MATH_COMPARISON_GRAPH],
+                         ids=['basic', 'informative', 'hyperopt', 'math_comparison'])
+def test_preview_signals_match_exported_strategy(graph, options, data_dir):
+    engine = SignalPreviewEngine(data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        preview = engine.preview_strategy_dict(graph)
+    exported = _exported_signals(StrategyExporter(**options), graph, data_dir)
+
+    for column, mask in exported.items():
+        assert len(preview['signals'][column]) == len(mask)
+        mismatches = np.flatnonzero(preview['signals'][column] != mask)
+        assert not len(mismatches), f"{column} differs on {len(mismatches)} candles, first at {mismatches[0]}"
+    assert preview['signals']['enter_long'].any() and preview['signals']['exit_long'].any()
@@ -0,0 +1,53 @@
+"""
+Resampler: exact OHLCV aggregation, incomplete edge candles are dropped
+"""
+
+import numpy as np
+
+from resampler import resample_candles
+
+
+HOUR_NS = 3600 * 10**9
+
+
+def _candles(hours):
+    hours = np.asarray(hours, dtype=np.int64)
+    close = hours + 100.0
+    return {
+        'date': (hours * HOUR_NS).view('datetime64[ns]'),
+        'open': close - 0.5,
+        'high': close + 1.0,
+        'low': close - 1.0,
+        'close': close,
+        'volume': np.ones(len(hours))
+    }
+
+
+def test_incomplete_edge_candles_are_dropped():
+    # 1h candles from 02:00 to 13:00: the 00:00 and 12:00 4h candles are incomplete
+    resampled = resample_candles(_candles(range(2, 14)), '4h', '1h')
+
+    assert resampled['date'].view(np.int64).tolist() == [4 * HOUR_NS, 8 * HOUR_NS]
+    assert resampled['open'].tolist() == [103.5, 107.5]
+    assert resampled['high'].tolist() == [108.0, 112.0]
+    assert resampled['low'].tolist() == [103.0, 107.0]
+    assert resampled['close'].tolist() == [107.0, 111.0]
+    assert resampled['volume'].tolist() == [4.0, 4.0]
+
+
+def test_complete_edges_are_kept_and_inner_gaps_give_partial_candles():
+    hours = [hour for hour in range(0, 12) if hour != 5]
+    resampled = resample_candles(_candles(hours), '4h', '1h')
+
+    assert resampled['date'].view(np.int64).tolist() == [0, 4 * HOUR_NS, 8 * HOUR_NS]
+    assert resampled['volume'].tolist() == [4.0, 3.0, 4.0]
+    assert resampled['close'].tolist() == [103.0, 107.0, 111.0]
+
+
+def test_weekly_candles_start_on_monday():
+    # 1970-01-05 is the first Monday after the epoch; daily candles from Thursday 01-01 to Sunday 01-18
+    resampled = resample_candles(_candles(np.arange(18) * 24), '1w', '1d')
+
+    # Thursday to Sunday before the first Monday is an incomplete week
+    assert resampled['date'].view(np.int64).tolist() == [4 * 24 * HOUR_NS, 11 * 24 * HOUR_NS]
+    assert resampled['volume'].tolist() == [7.0, 7.0]
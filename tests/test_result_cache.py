@@ -0,0 +1,83 @@
+"""
+Backtest result cache keys: every input of a backtest run must change the key
+"""
+
+import json
+
+import pytest
+
+from result_cache import BacktestResultCache
+from runner import FreqtradeRunner
+
+
+CODE = "class GeneratedStrategy(IStrategy):\n    pass\n"
+CONFIG = {'timeframe': '1h', 'exchange': {'name': 'binance', 'pair_whitelist': ['BTC/USDT']}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BacktestResultCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / 'BTC_USDT-1h.feather'
+    path.write_bytes(b'candles')
+    return path
+
+
+def test_key_is_stable(cache, data_file):
+    assert (cache.make_key(CODE, CONFIG, '20250101-', [data_file]) ==
+            cache.make_key(CODE, dict(CONFIG), '20250101-', [data_file]))
+
+
+@pytest.mark.parametrize('change', ['code', 'config', 'timerange'])
+def test_key_covers_run_inputs(cache, data_file, change):
+    code, config, timerange = CODE, CONFIG, '20250101-'
+    key = cache.make_key(code, config, timerange, [data_file])
+    if change == 'code':
+        code += "# changed\n"
+    elif change == 'config':
+        config = dict(CONFIG, timeframe='4h')
+    else:
+        timerange = '20250201-'
+    assert cache.make_key(code, config, timerange, [data_file]) != key
+
+
+def test_key_covers_data_file_contents(cache, data_file):
+    key = cache.make_key(CODE, CONFIG, None, [data_file])
+    data_file.write_bytes(b'more candles')
+    assert cache.make_key(CODE, CONFIG, None, [data_file]) != key
+    data_file.unlink()
+    assert cache.fingerprint(data_file) == 'missing'
+
+
+def test_key_covers_params_file(cache, data_file, tmp_path):
+    params_file = tmp_path / 'GeneratedStrategy.json'
+    missing = cache.make_key(CODE, CONFIG, None, [data_file], params_file)
+
+    params_file.write_text(json.dumps({'params': {'buy': {'fast': 12}}}))
+    first = cache.make_key(CODE, CONFIG, None, [data_file], params_file)
+    params_file.write_text(json.dumps({'params': {'buy': {'fast': 21}}}))
+    second = cache.make_key(CODE, CONFIG, None, [data_file], params_file)
+
+    assert len({missing, first, second}) == 3
+
+
+def test_backtest_misses_cache_after_hyperopt_params_change(tmp_path, monkeypatch):
+    runner = FreqtradeRunner()
+    runner.result_cache = BacktestResultCache(tmp_path / 'cache')
+    runs = []
+    monkeypatch.setattr(runner, '_prepare_data', lambda config, strategy_code=None: None)
+    monkeypatch.setattr(runner, '_run_backtest_cli',
+                        lambda *args, **kwargs: runs.append(args) or {'success': True, 'run': len(runs)})
+
+    workspace = tmp_path / 'workspace'
+    runner.run_backtest(CODE, workspace=workspace)
+    assert runner.run_backtest(CODE, workspace=workspace).get('cached')
+    assert len(runs) == 1
+
+    # freqtrade's hyperopt writes the best parameters next to the strategy
+    (workspace / 'GeneratedStrategy.json').write_text(json.dumps({'params': {'buy': {'fast': 12}}}))
+    results = runner.run_backtest(CODE, workspace=workspace)
+    assert not results.get('cached') and len(runs) == 2
@@ -0,0 +1,69 @@
+"""
+Backtest run index: warm-worker runs are archived like CLI runs, fallbacks pick the newest file
+"""
+
+import contextlib
+import io
+import json
+import os
+import types
+from pathlib import Path
+
+import pytest
+
+from result_reader import read_backtest_zip
+from run_index import BacktestRunIndex, code_hash
+from runner import FreqtradeRunner
+
+
+SAMPLE_RESULT = (Path(__file__).resolve().parent.parent / 'user_data' / 'backtest_results' /
+                 'backtest-result-2025-07-01_19-56-45.zip')
+CODE = "class GeneratedStrategy(IStrategy):\n    timeframe = '1h'\n"
+
+
+@pytest.fixture
+def runner(tmp_path):
+    runner = FreqtradeRunner()
+    runner.strategies_dir = tmp_path / 'strategies'
+    runner.strategies_dir.mkdir()
+    runner.run_index = BacktestRunIndex(tmp_path / 'backtest_results', tmp_path / 'index.sqlite')
+    yield runner
+    runner.run_index.close()
+
+
+def test_worker_backtest_is_archived_and_indexed(runner, tmp_path):
+    if not SAMPLE_RESULT.exists():
+        pytest.skip("sample backtest result not available")
+    backtest_data = read_backtest_zip(SAMPLE_RESULT)
+    runner.worker_pool = types.SimpleNamespace(
+        submit=lambda job, timeout, cancel_token: {'result': backtest_data, 'elapsed': 0.1})
+
+    workspace = tmp_path / 'workspace'
+    workspace.mkdir()
+    runner.save_strategy(CODE, 'GeneratedStrategy', workspace)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner._run_backtest_in_worker('GeneratedStrategy', timerange='20250410-20250420',
+                                                 workspace=workspace)
+
+    archived = Path(results['archived_result'])
+    assert archived.parent == runner.run_index.results_dir and archived.with_suffix('.meta.json').exists()
+    runs = runner.query_runs('sharpe', strategy_code=CODE)
+    assert [run['file'] for run in runs] == [archived.name]
+    assert runs[0]['sharpe'] == pytest.approx(backtest_data['strategy']['GeneratedStrategy']['sharpe'])
+    assert runs[0]['code_hash'] == code_hash(CODE)
+
+
+def test_json_fallback_reads_the_newest_result(runner, tmp_path):
+    results_dir = tmp_path / 'results'
+    results_dir.mkdir()
+    for index, name in enumerate(['backtest_results-2025-07-02_10-00-00.json',
+                                  'backtest_results-2025-07-01_10-00-00.json']):
+        path = results_dir / name
+        path.write_text(json.dumps({'strategy': {'GeneratedStrategy': {'total_trades': index, 'trades': []}}}))
+        os.utime(path, ns=(10**18 + index * 10**9, 10**18 + index * 10**9))
+    meta = results_dir / 'backtest_results-2025-07-03_10-00-00.meta.json'
+    meta.write_text(json.dumps({'GeneratedStrategy': {'timeframe': '1h'}}))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner._parse_backtest_results("", "", results_dir)
+    assert results['stats']['total_trades'] == 1
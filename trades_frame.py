@@ -0,0 +1,63 @@
+"""
+Trades frame - columnar construction of the trades DataFrame from exported trades
+
+Each column is collected in one pass and converted to a typed array at once
+(datetime64 dates, float64 prices/profits), raw numbers are kept and display
+strings are left to the view (see ui.results_panel.TradesTableModel).
+"""
+
+from typing import Dict, List, Any
+
+import numpy as np
+import pandas as pd
+
+
+# (frame column, exported trade field, dtype, value used for missing fields)
+TRADE_COLUMNS = (
+    ('pair', 'pair', object, ''),
+    ('is_short', 'is_short', bool, False),
+    ('amount', 'amount', np.float64, np.nan),
+    ('entry_price', 'open_rate', np.float64, np.nan),
+    ('exit_price', 'close_rate', np.float64, np.nan),
+    ('profit_abs', 'profit_abs', np.float64, 0.0),
+    ('profit_ratio', 'profit_ratio', np.float64, 0.0),
+    ('duration', 'trade_duration', np.int64, 0),
+)
+
+# (frame column, epoch milliseconds field, ISO date field)
+DATE_COLUMNS = (
+    ('entry_date', 'open_timestamp', 'open_date'),
+    ('exit_date', 'close_timestamp', 'close_date'),
+)
+
+FRAME_COLUMNS = [column for column, _, _ in DATE_COLUMNS] + [column for column, _, _, _ in TRADE_COLUMNS]
+
+
+def build_trades_frame(trades: List[Dict[str, Any]], stake_currency: str = 'USDT') -> pd.DataFrame:
+    """Build the trades DataFrame (one row per trade, typed columns)"""
+
+    columns = {}
+
+    for column, timestamp_field, date_field in DATE_COLUMNS:
+        columns[column] = _trade_dates(trades, timestamp_field, date_field)
+
+    for column, field, dtype, missing in TRADE_COLUMNS:
+        values = [trade.get(field, missing) for trade in trades]
+        # numpy maps None to nan/False for float/bool columns, integers need an explicit value
+        if dtype is np.int64 and None in values:
+            values = [missing if value is None else value for value in values]
+        columns[column] = np.array(values, dtype=dtype)
+
+    trades_df = pd.DataFrame(columns, columns=FRAME_COLUMNS)
+    trades_df.attrs['stake_currency'] = stake_currency
+    return trades_df
+
+
+def _trade_dates(trades: List[Dict[str, Any]], timestamp_field: str, date_field: str) -> pd.DatetimeIndex:
+    """UTC dates from epoch milliseconds, falling back to the ISO date strings"""
+
+    timestamps = [trade.get(timestamp_field) for trade in trades]
+    if all(timestamp is not None for timestamp in timestamps):
+        return pd.to_datetime(np.array(timestamps, dtype=np.int64), unit='ms', utc=True)
+
+    return pd.to_datetime([trade.get(date_field) for trade in trades], utc=True, format='ISO8601')
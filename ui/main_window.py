@@ -3,6 +3,7 @@ Main window for RDP application
 Contains the visual strategy builder interface
 """
 
+import warnings
 from pathlib import Path
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -18,7 +19,7 @@ from .node_palette import NodePalette
 from .property_panel import PropertyPanel
 from .results_panel import ResultsPanel
 from exporter import StrategyExporter
-from runner import FreqtradeRunner, BacktestThread, HyperoptThread
+from runner import FreqtradeRunner, BacktestThread, HyperoptThread, MonteCarloThread, PreviewThread
 from nodes.base_nodes import NODE_CLASSES
 
 
@@ -33,6 +34,12 @@ class MainWindow(QMainWindow):
         self.graph = None
         self.exporter = StrategyExporter()
         self.runner = FreqtradeRunner()
+        self.backtest_thread = None
+        self.hyperopt_thread = None
+        self.preview_thread = None
+        self.monte_carlo_thread = None
+        # Cancelled/preempted threads are kept referenced until they actually stop
+        self._retired_threads = []
         
         self.setup_ui()
         self.setup_menu_bar()
@@ -143,6 +150,17 @@ class MainWindow(QMainWindow):
         export_action.triggered.connect(self.export_strategy)
         file_menu.addAction(export_action)
         
+        # Code generation options of exported strategies (also used for backtests/hyperopt)
+        export_options_menu = file_menu.addMenu("Export &Options")
+        for label, option in (("Cache Indicator Columns", 'indicator_cache'),
+                              ("Prune Intermediate Columns", 'prune_columns'),
+                              ("Fuse Math/Logic Expressions", 'fuse_expressions')):
+            option_action = QAction(label, self)
+            option_action.setCheckable(True)
+            option_action.setChecked(getattr(self.exporter, option))
+            option_action.toggled.connect(lambda checked, option=option: setattr(self.exporter, option, checked))
+            export_options_menu.addAction(option_action)
+        
         file_menu.addSeparator()
         
         # Exit
@@ -165,6 +183,17 @@ class MainWindow(QMainWindow):
         redo_action.triggered.connect(self.redo_action)
         edit_menu.addAction(redo_action)
         
+        # History menu (indexed backtest results)
+        history_menu = menubar.addMenu("Hi&story")
+        
+        best_current_action = QAction("Best Runs of &Current Strategy", self)
+        best_current_action.triggered.connect(lambda: self.show_run_history(current_strategy=True))
+        history_menu.addAction(best_current_action)
+        
+        best_all_action = QAction("Best Runs of &All Strategies", self)
+        best_all_action.triggered.connect(lambda: self.show_run_history(current_strategy=False))
+        history_menu.addAction(best_all_action)
+        
         # Help menu
         help_menu = menubar.addMenu("&Help")
         
@@ -182,9 +211,14 @@ class MainWindow(QMainWindow):
         self.backtest_btn.clicked.connect(self.run_backtest)
         toolbar.addWidget(self.backtest_btn)
         
+        # Signal preview button (in-process, no freqtrade)
+        self.preview_btn = QPushButton("Preview Signals")
+        self.preview_btn.clicked.connect(self.run_preview)
+        toolbar.addWidget(self.preview_btn)
+        
         # Hyperopt button
         self.hyperopt_btn = QPushButton("Hyperopt")
-        self.hyperopt_btn.clicked.connect(self.run_hyperopt)
+        self.hyperopt_btn.clicked.connect(lambda: self.run_hyperopt())
         toolbar.addWidget(self.hyperopt_btn)
         
         # Live trading button
@@ -193,6 +227,12 @@ class MainWindow(QMainWindow):
         self.live_btn.setStyleSheet("QPushButton { color: red; font-weight: bold; }")
         toolbar.addWidget(self.live_btn)
         
+        # Cancel running backtest/hyperopt (kills the freqtrade process tree)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_running_job)
+        self.cancel_btn.setEnabled(False)
+        toolbar.addWidget(self.cancel_btn)
+        
         toolbar.addSeparator()
         
         # Status indicator
@@ -331,6 +371,7 @@ class MainWindow(QMainWindow):
             self.backtest_thread.finished.connect(self.on_backtest_finished)
             self.backtest_thread.error.connect(self.on_backtest_error)
             self.backtest_thread.progress.connect(self.results_panel.log_message)
+            self.backtest_thread.progress_event.connect(self.results_panel.update_progress)
             
             # Start thread
             self.backtest_thread.start()
@@ -342,34 +383,232 @@ class MainWindow(QMainWindow):
     
     def on_backtest_finished(self, results):
         """Handle backtest completion"""
+        if self.sender() is not self.backtest_thread:
+            return  # Late result of a cancelled backtest
         self.set_buttons_enabled(True)
         self.status_label.setText("Ready")
         
         if results.get('success', False):
             self.results_panel.log_message("Backtest completed successfully!", "SUCCESS")
             self.results_panel.update_results(results)
+            self.start_monte_carlo(results)
         else:
             error_msg = results.get('error', 'Unknown error')
             self.results_panel.log_message(f"Backtest failed: {error_msg}", "ERROR")
     
+    def start_monte_carlo(self, results):
+        """Resample the backtest trades in the background; the bands are added to the equity chart when done"""
+        if results.get('trades') is None:
+            return
+        if self.monte_carlo_thread is not None and self.monte_carlo_thread.isRunning():
+            self.monte_carlo_thread.cancel()
+            self._retire_thread(self.monte_carlo_thread)
+        
+        thread = MonteCarloThread(self.runner, results)
+        thread.finished.connect(lambda monte_carlo: self.on_monte_carlo_finished(thread, results, monte_carlo))
+        thread.error.connect(
+            lambda error_msg: self.results_panel.log_message(f"Monte Carlo error: {error_msg}", "WARNING"))
+        self.monte_carlo_thread = thread
+        thread.start()
+    
+    def on_monte_carlo_finished(self, thread, results, monte_carlo):
+        """Redraw the equity curve with the Monte Carlo percentile bands"""
+        if thread is not self.monte_carlo_thread:
+            return  # Result for an older backtest
+        self.results_panel.equity_widget.plot_equity_curve(results.get('equity'), monte_carlo)
+    
     def on_backtest_error(self, error_msg):
         """Handle backtest error"""
+        if self.sender() is not self.backtest_thread:
+            return  # Late error of a cancelled backtest
         self.set_buttons_enabled(True)
         self.status_label.setText("Ready")
         self.results_panel.log_message(f"Backtest error: {error_msg}", "ERROR")
         QMessageBox.critical(self, "Backtest Error", f"Backtest failed:\n{error_msg}")
     
-    def run_hyperopt(self):
-        """Run hyperopt using Freqtrade CLI"""
+    def show_run_history(self, current_strategy: bool = True, metric: str = 'sharpe', limit: int = 20):
+        """Log the best indexed backtest runs (of the current graph's exported code or of all strategies)"""
+        try:
+            strategy_code = self.exporter.export_graph(self.graph) if current_strategy else None
+            runs = self.runner.query_runs(metric, limit, strategy_code=strategy_code)
+        except Exception as e:
+            self.results_panel.log_message(f"Run history error: {e}", "ERROR")
+            return
+        
+        scope = "current strategy" if current_strategy else "all strategies"
+        if not runs:
+            self.results_panel.log_message(f"No indexed backtest runs for {scope}", "WARNING")
+            return
+        
+        self.results_panel.log_message(f"Top {len(runs)} runs by {metric} ({scope}):", "INFO")
+        for run in runs:
+            self.results_panel.log_message(
+                f"{run[metric]:.3f}  {run['strategy']}  {run['timeframe'] or ''} {run['timerange'] or ''}  "
+                f"profit {(run['profit_total'] or 0) * 100:.2f}%  trades {int(run['total_trades'] or 0)}  "
+                f"{run['file']}",
+                "INFO"
+            )
+    
+    def cancel_running_job(self):
+        """Cancel the running backtest/hyperopt and free the UI immediately"""
+        cancelled = False
+        
+        for attr in ('backtest_thread', 'hyperopt_thread'):
+            thread = getattr(self, attr)
+            if thread is not None and thread.isRunning():
+                thread.cancel()
+                self._retire_thread(thread)
+                setattr(self, attr, None)
+                cancelled = True
+        
+        if cancelled:
+            self.results_panel.log_message("Job cancelled", "WARNING")
+            self.results_panel.update_progress({'phase': 'cancelled', 'percent': 0})
+            self.statusBar().showMessage("Job cancelled", 3000)
+        
+        self.set_buttons_enabled(True)
+        self.status_label.setText("Ready")
+    
+    def _retire_thread(self, thread):
+        """Disconnect a cancelled thread and keep it alive until it stops (a running QThread
+        must not be destroyed); late epochs, results or errors of it never reach the UI"""
+        for name in ('finished', 'error', 'progress', 'progress_event', 'epoch_update'):
+            signal = getattr(thread, name, None)
+            if signal is None:
+                continue
+            try:
+                with warnings.catch_warnings():
+                    # PySide warns about signals without connections
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    signal.disconnect()
+            except (RuntimeError, TypeError):
+                pass
+        self._retired_threads = [t for t in self._retired_threads if t.isRunning()]
+        self._retired_threads.append(thread)
+    
+    def run_preview(self):
+        """Preview entry/exit signals in-process without spawning freqtrade
+        
+        The preview runs in a background thread; starting a new one preempts the
+        previous preview, whose result is dropped.
+        """
+        try:
+            nodes = self.graph.all_nodes()
+            if not nodes:
+                raise ValueError("Graph is empty - add some nodes first")
+            graph_data = self.exporter._analyze_graph(nodes)
+            
+            if self.preview_thread is not None and self.preview_thread.isRunning():
+                self.preview_thread.cancel()
+                self._retire_thread(self.preview_thread)
+            
+            self.preview_thread = PreviewThread(self.runner, graph_data)
+            self.preview_thread.finished.connect(self.on_preview_finished)
+            self.preview_thread.error.connect(self.on_preview_error)
+            self.preview_thread.start()
+            
+        except Exception as e:
+            self.on_preview_error(str(e))
+    
+    def on_preview_finished(self, results):
+        """Show preview signal counts"""
+        if self.sender() is not self.preview_thread:
+            return  # Stale result of a preempted preview
+        
+        try:
+            counts = results['signal_counts']
+            
+            self.results_panel.log_message(
+                f"Preview {results['pair']} {results['timeframe']}: {results['candles']} candles "
+                f"in {results['load_ms'] + results['eval_ms']:.1f} ms", "INFO"
+            )
+            quality = results['data_quality']
+            self.results_panel.log_message(
+                f"Data quality {quality['quality']:.1%}: {quality['missing']} missing "
+                f"({quality['filled']} filled, {quality['large_gaps']} large gaps), {quality['duplicates']} duplicates, "
+                f"{quality['invalid']} invalid, {quality['low_volume']} zero volume, {quality['outliers']} outliers",
+                "INFO" if quality['passed'] else "WARNING"
+            )
+            self.results_panel.log_message(
+                f"Signals - enter long: {counts['enter_long']}, enter short: {counts['enter_short']}, "
+                f"exit long: {counts['exit_long']}, exit short: {counts['exit_short']}", "SUCCESS"
+            )
+            self.statusBar().showMessage(
+                f"Preview: {counts['enter_long'] + counts['enter_short']} entries, "
+                f"{counts['exit_long'] + counts['exit_short']} exits", 3000
+            )
+            
+        except Exception as e:
+            self.on_preview_error(str(e))
+    
+    def on_preview_error(self, error_msg):
+        """Handle preview error"""
+        sender = self.sender()
+        if isinstance(sender, PreviewThread) and sender is not self.preview_thread:
+            return
+        self.results_panel.log_message(f"Preview failed: {error_msg}", "ERROR")
+        QMessageBox.critical(self, "Preview Error", f"Failed to preview signals:\n{error_msg}")
+    
+    def run_hyperopt(self, epochs: int = 100):
+        """Run hyperopt using Freqtrade CLI, showing epochs live as they are evaluated"""
         try:
             self.set_buttons_enabled(False)
             self.status_label.setText("Running hyperopt...")
-            # TODO: Implement hyperopt execution
+            self.results_panel.log_message("Exporting strategy...", "INFO")
+            
+            strategy_code = self.exporter.export_graph(self.graph)
+            
+            self.results_panel.start_hyperopt(epochs)
+            
+            # Create and start hyperopt thread
+            self.hyperopt_thread = HyperoptThread(
+                self.runner,
+                strategy_code,
+                "GeneratedStrategy",
+                epochs=epochs
+            )
+            
+            # Connect signals
+            self.hyperopt_thread.finished.connect(self.on_hyperopt_finished)
+            self.hyperopt_thread.error.connect(self.on_hyperopt_error)
+            self.hyperopt_thread.progress.connect(self.results_panel.log_message)
+            self.hyperopt_thread.progress_event.connect(self.results_panel.update_progress)
+            self.hyperopt_thread.epoch_update.connect(self.results_panel.update_hyperopt_epoch)
+            
+            # Start thread
+            self.hyperopt_thread.start()
+            
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to run hyperopt: {str(e)}")
             self.set_buttons_enabled(True)
             self.status_label.setText("Ready")
     
+    def on_hyperopt_finished(self, results):
+        """Handle hyperopt completion"""
+        if self.sender() is not self.hyperopt_thread:
+            return  # Late result of a cancelled hyperopt
+        self.set_buttons_enabled(True)
+        self.status_label.setText("Ready")
+        
+        if not results.get('success', False):
+            self.results_panel.log_message(f"Hyperopt failed: {results.get('error', 'Unknown error')}", "ERROR")
+            return
+        
+        self.results_panel.log_message("Hyperopt completed successfully!", "SUCCESS")
+        if results.get('leaderboard'):
+            self.results_panel.hyperopt_widget.populate_leaderboard(results['leaderboard'])
+        for key, value in results.get('best_params', {}).items():
+            self.results_panel.log_message(f"Best {key}: {value}", "INFO")
+    
+    def on_hyperopt_error(self, error_msg):
+        """Handle hyperopt error"""
+        if self.sender() is not self.hyperopt_thread:
+            return  # Late error of a cancelled hyperopt
+        self.set_buttons_enabled(True)
+        self.status_label.setText("Ready")
+        self.results_panel.log_message(f"Hyperopt error: {error_msg}", "ERROR")
+        QMessageBox.critical(self, "Hyperopt Error", f"Hyperopt failed:\n{error_msg}")
+    
     def run_live(self):
         """Run live trading using Freqtrade CLI"""
         # Show confirmation dialog
@@ -393,8 +632,10 @@ class MainWindow(QMainWindow):
     def set_buttons_enabled(self, enabled):
         """Enable/disable trading buttons"""
         self.backtest_btn.setEnabled(enabled)
+        self.preview_btn.setEnabled(enabled)
         self.hyperopt_btn.setEnabled(enabled)
         self.live_btn.setEnabled(enabled)
+        self.cancel_btn.setEnabled(not enabled)
     
     def check_unsaved_changes(self):
         """Check if there are unsaved changes and ask user"""
@@ -413,6 +654,12 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle window close event"""
         if self.check_unsaved_changes():
+            # Do not leave freqtrade processes running after the window is gone
+            for thread in (self.backtest_thread, self.hyperopt_thread, self.preview_thread, self.monte_carlo_thread,
+                           *self._retired_threads):
+                if thread is not None and thread.isRunning():
+                    thread.cancel()
+                    thread.wait(5000)
             event.accept()
         else:
             event.ignore()
@@ -480,8 +727,6 @@ class MainWindow(QMainWindow):
             crossover.set_pos(500, 100)
             crossover.set_name('Crossover')
             crossover.set_parameter('operation', 'subtract')
-            crossover.set_parameter('comparison', 'greater_than')
-            crossover.set_parameter('threshold', 0.0)
             
             # Create entry signal
             entry = self.graph.create_node('frequi.nodes.EnterNode.EnterNode')
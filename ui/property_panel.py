@@ -309,9 +309,23 @@ class PropertyPanel(QWidget):
         constant_spin.valueChanged.connect(lambda value: self.current_node.set_parameter('constant', value))
         layout.addRow("Constant:", constant_spin)
         
+        # Optional comparison of the result with a threshold
+        comparison_combo = QComboBox()
+        comparison_combo.addItems(["none", "greater", "less", "greater_equal", "less_equal", "equal"])
+        comparison_combo.setCurrentText(self.current_node.get_parameter('comparison', 'none'))
+        comparison_combo.currentTextChanged.connect(lambda text: self.current_node.set_parameter('comparison', text))
+        layout.addRow("Comparison:", comparison_combo)
+        
+        threshold_spin = QDoubleSpinBox()
+        threshold_spin.setRange(-999999, 999999)
+        threshold_spin.setDecimals(4)
+        threshold_spin.setValue(float(self.current_node.get_parameter('threshold', 0.0)))
+        threshold_spin.valueChanged.connect(lambda value: self.current_node.set_parameter('threshold', value))
+        layout.addRow("Threshold:", threshold_spin)
+        
         self.properties_layout.addWidget(group)
         # Динамические параметры
-        self.add_dynamic_parameters(skip_keys=['operation', 'constant'])
+        self.add_dynamic_parameters(skip_keys=['operation', 'constant', 'comparison', 'threshold'])
     
     def add_logic_properties(self):
         """Add properties for Logic node"""
@@ -320,15 +334,24 @@ class PropertyPanel(QWidget):
         
         # Logic type
         logic_combo = QComboBox()
-        logic_combo.addItems(["AND", "OR", "NOT", "XOR"])
+        logic_combo.addItems(["AND", "OR", "NOT", "XOR",
+                              "greater_than", "less_than", "greater_equal", "less_equal", "equal"])
         current_logic = self.current_node.get_parameter('operation', 'AND')
         logic_combo.setCurrentText(current_logic)
         logic_combo.currentTextChanged.connect(lambda text: self.current_node.set_parameter('operation', text))
         layout.addRow("Operation:", logic_combo)
         
+        # Comparisons test condition1 against this value when condition2 is unconnected
+        threshold_spin = QDoubleSpinBox()
+        threshold_spin.setRange(-999999, 999999)
+        threshold_spin.setDecimals(4)
+        threshold_spin.setValue(float(self.current_node.get_parameter('threshold', 0.0)))
+        threshold_spin.valueChanged.connect(lambda value: self.current_node.set_parameter('threshold', value))
+        layout.addRow("Threshold:", threshold_spin)
+        
         self.properties_layout.addWidget(group)
         # Динамические параметры
-        self.add_dynamic_parameters(skip_keys=['operation'])
+        self.add_dynamic_parameters(skip_keys=['operation', 'threshold'])
     
     def add_enter_properties(self):
         """Add properties for Enter node"""
@@ -4,14 +4,16 @@ Results panel for displaying backtest results, equity curves, and logs
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTabWidget, QTextEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView,
-    QHBoxLayout, QLabel, QPushButton, QSplitter
+    QTableView, QTableWidget, QTableWidgetItem, QHeaderView,
+    QHBoxLayout, QLabel, QPushButton, QSplitter, QProgressBar
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QFont
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
 
 
@@ -45,10 +47,12 @@ class EquityChartWidget(QWidget):
         self.total_return_label = QLabel("Total Return: --")
         self.sharpe_label = QLabel("Sharpe: --")
         self.max_dd_label = QLabel("Max DD: --")
+        self.monte_carlo_label = QLabel("MC p5: --")
         
         controls_layout.addWidget(self.total_return_label)
         controls_layout.addWidget(self.sharpe_label)
         controls_layout.addWidget(self.max_dd_label)
+        controls_layout.addWidget(self.monte_carlo_label)
         
         layout.addLayout(controls_layout)
         
@@ -67,8 +71,9 @@ class EquityChartWidget(QWidget):
         ax.set_ylabel('Portfolio Value')
         self.canvas.draw()
     
-    def plot_equity_curve(self, equity_data):
-        """Plot equity curve from backtest results"""
+    def plot_equity_curve(self, equity_data, monte_carlo=None):
+        """Plot equity curve from backtest results, with Monte Carlo percentile bands if given"""
+        self.update_monte_carlo(monte_carlo)
         if equity_data is None or equity_data.empty:
             self.plot_empty_chart()
             return
@@ -77,7 +82,11 @@ class EquityChartWidget(QWidget):
         ax = self.figure.add_subplot(111)
         
         # Plot equity curve
-        equity_data.plot(x='date', y='equity', ax=ax, label='Portfolio Value')
+        # x_compat keeps matplotlib date units so the band overlay shares the x axis
+        equity_data.plot(x='date', y='equity', ax=ax, label='Portfolio Value', x_compat=True)
+        
+        if monte_carlo is not None:
+            self.plot_monte_carlo_bands(ax, monte_carlo['bands'])
         
         # Add drawdown as filled area
         if 'drawdown' in equity_data.columns:
@@ -99,6 +108,32 @@ class EquityChartWidget(QWidget):
         self.figure.tight_layout()
         self.canvas.draw()
     
+    def plot_monte_carlo_bands(self, ax, bands):
+        """Overlay Monte Carlo equity percentiles (by trade exit date) on the equity axis"""
+        dates = mdates.date2num(pd.DatetimeIndex(pd.to_datetime(bands['date'], utc=True)).to_pydatetime())
+        ax.fill_between(dates, bands['p5'], bands['p95'], alpha=0.15, color='tab:blue', label='MC 5-95%')
+        ax.fill_between(dates, bands['p25'], bands['p75'], alpha=0.25, color='tab:blue', label='MC 25-75%')
+        ax.plot(dates, bands['p50'], linestyle='--', linewidth=1, color='tab:blue', label='MC median')
+    
+    def update_monte_carlo(self, monte_carlo):
+        """Update the Monte Carlo label (pessimistic 5th percentiles)"""
+        if not monte_carlo:
+            self.monte_carlo_label.setText("MC p5: --")
+            self.monte_carlo_label.setToolTip("")
+            return
+        
+        percentiles = monte_carlo['percentiles']
+        self.monte_carlo_label.setText(
+            f"MC p5: {percentiles['final_equity'][5]:.0f} / DD {percentiles['max_drawdown'][5]:.1f}%"
+        )
+        self.monte_carlo_label.setToolTip(
+            f"{monte_carlo['simulations']} {monte_carlo['method']} simulations of {monte_carlo['trades']} trades\n"
+            f"Median final equity: {percentiles['final_equity'][50]:.2f}\n"
+            f"Median max drawdown: {percentiles['max_drawdown'][50]:.2f}%\n"
+            f"Median longest under water: {percentiles['under_water'][50]:.0f} trades\n"
+            f"Probability of loss: {monte_carlo['probability_of_loss'] * 100:.1f}%"
+        )
+    
     def update_stats(self, stats):
         """Update performance statistics labels"""
         if stats:
@@ -116,6 +151,114 @@ class EquityChartWidget(QWidget):
         pass
 
 
+def format_duration(duration_minutes: int) -> str:
+    """Format trade duration from minutes to readable format"""
+    if duration_minutes < 60:
+        return f"{duration_minutes}m"
+    elif duration_minutes < 1440:  # Less than 24 hours
+        hours = duration_minutes // 60
+        minutes = duration_minutes % 60
+        return f"{hours}h {minutes}m"
+    else:  # 24 hours or more
+        days = duration_minutes // 1440
+        remaining_hours = (duration_minutes % 1440) // 60
+        return f"{days}d {remaining_hours}h"
+
+
+class TradesTableModel(QAbstractTableModel):
+    """Table model over the trades DataFrame - display strings are built only for visible cells"""
+    
+    # (header, raw column, column name in older string-formatted frames, numeric)
+    COLUMNS = [
+        ("Entry Date", 'entry_date', 'entry_date', False),
+        ("Exit Date", 'exit_date', 'exit_date', False),
+        ("Pair", 'pair', 'pair', False),
+        ("Side", 'is_short', 'side', False),
+        ("Amount", 'amount', 'amount', True),
+        ("Entry Price", 'entry_price', 'entry_price', True),
+        ("Exit Price", 'exit_price', 'exit_price', True),
+        ("Profit", 'profit_abs', 'profit', True),
+        ("Profit %", 'profit_ratio', 'profit_pct', True),
+        ("Duration", 'duration', 'duration', True)
+    ]
+    
+    def __init__(self, trades_data: pd.DataFrame = None):
+        super().__init__()
+        self._rows = 0
+        self._values = []
+        self._currency = 'USDT'
+        self.set_trades(trades_data)
+    
+    def set_trades(self, trades_data: pd.DataFrame = None):
+        """Replace the displayed trades"""
+        self.beginResetModel()
+        
+        self._rows = 0 if trades_data is None else len(trades_data)
+        self._values = []
+        if trades_data is not None:
+            self._currency = trades_data.attrs.get('stake_currency', 'USDT')
+            for _, column, legacy_column, _ in self.COLUMNS:
+                name = column if column in trades_data.columns else legacy_column
+                self._values.append(self._column_values(trades_data, name))
+        
+        self.endResetModel()
+    
+    def _column_values(self, trades_data: pd.DataFrame, name: str):
+        if name not in trades_data.columns:
+            return None
+        series = trades_data[name]
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            # Plain datetime64 array: no per-row Timestamp objects
+            series = series.dt.tz_localize(None)
+        return series.to_numpy()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            values = self._values[index.column()]
+            if values is None:
+                return ""
+            return self._format(self.COLUMNS[index.column()][1], values[index.row()])
+        
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.COLUMNS[index.column()][3]:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        
+        return None
+    
+    def _format(self, column: str, value) -> str:
+        """Display string for one raw value"""
+        if isinstance(value, str):
+            return value  # Already formatted (older cached results)
+        if column in ('entry_date', 'exit_date'):
+            return "" if np.isnat(value) else np.datetime_as_string(value, unit='s').replace('T', ' ')
+        if column == 'is_short':
+            return "Short" if value else "Long"
+        if column == 'duration':
+            return format_duration(int(value))
+        if column == 'amount':
+            return f"{value:.6f}"
+        if column == 'profit_abs':
+            return f"{value:.2f} {self._currency}"
+        if column == 'profit_ratio':
+            return f"{value * 100:.2f}%"
+        if isinstance(value, float):
+            return f"{value:.2f}"
+        return str(value)
+
+
 class TradesTableWidget(QWidget):
     """Widget for displaying trades table"""
     
@@ -148,18 +291,12 @@ class TradesTableWidget(QWidget):
         
         layout.addLayout(controls_layout)
         
-        # Trades table
-        self.table = QTableWidget()
+        # Trades table (model/view, so large backtests do not create an item per cell)
+        self.model = TradesTableModel()
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        
-        # Set up columns
-        columns = [
-            "Entry Date", "Exit Date", "Pair", "Side", "Amount",
-            "Entry Price", "Exit Price", "Profit", "Profit %", "Duration"
-        ]
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         
         # Resize columns to content
         header = self.table.horizontalHeader()
@@ -167,23 +304,18 @@ class TradesTableWidget(QWidget):
         
         layout.addWidget(self.table)
         
+        self.empty_label = QLabel("No trades data available. Run a backtest to see trade results.")
+        self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.empty_label)
+        
         # Show empty message initially
         self.show_empty_message()
     
     def show_empty_message(self):
         """Show message when no trades available"""
-        self.table.setRowCount(1)
-        self.table.setColumnCount(1)
-        self.table.setHorizontalHeaderLabels([""])
-        
-        item = QTableWidgetItem("No trades data available. Run a backtest to see trade results.")
-        item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        item.setFlags(Qt.ItemFlag.ItemIsEnabled)  # Make it non-editable
-        self.table.setItem(0, 0, item)
-        
-        # Hide header and stretch to fill
-        self.table.horizontalHeader().setVisible(False)
-        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.model.set_trades(None)
+        self.table.setVisible(False)
+        self.empty_label.setVisible(True)
     
     def populate_trades(self, trades_data):
         """Populate table with trades data"""
@@ -191,34 +323,9 @@ class TradesTableWidget(QWidget):
             self.show_empty_message()
             return
         
-        # Restore proper table structure
-        columns = [
-            "Entry Date", "Exit Date", "Pair", "Side", "Amount",
-            "Entry Price", "Exit Price", "Profit", "Profit %", "Duration"
-        ]
-        self.table.setColumnCount(len(columns))
-        self.table.setHorizontalHeaderLabels(columns)
-        self.table.horizontalHeader().setVisible(True)
-        
-        # Set row count
-        self.table.setRowCount(len(trades_data))
-        
-        # Populate data
-        for row, trade in trades_data.iterrows():
-            self.table.setItem(row, 0, QTableWidgetItem(str(trade.get('entry_date', ''))))
-            self.table.setItem(row, 1, QTableWidgetItem(str(trade.get('exit_date', ''))))
-            self.table.setItem(row, 2, QTableWidgetItem(str(trade.get('pair', ''))))
-            self.table.setItem(row, 3, QTableWidgetItem(str(trade.get('side', ''))))
-            self.table.setItem(row, 4, QTableWidgetItem(str(trade.get('amount', ''))))
-            self.table.setItem(row, 5, QTableWidgetItem(str(trade.get('entry_price', ''))))
-            self.table.setItem(row, 6, QTableWidgetItem(str(trade.get('exit_price', ''))))
-            self.table.setItem(row, 7, QTableWidgetItem(str(trade.get('profit', ''))))
-            self.table.setItem(row, 8, QTableWidgetItem(str(trade.get('profit_pct', ''))))
-            self.table.setItem(row, 9, QTableWidgetItem(str(trade.get('duration', ''))))
-        
-        # Resize columns
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.model.set_trades(trades_data)
+        self.empty_label.setVisible(False)
+        self.table.setVisible(True)
     
     def update_stats(self, stats):
         """Update trade statistics"""
@@ -237,6 +344,108 @@ class TradesTableWidget(QWidget):
         pass
 
 
+class HyperoptWidget(QWidget):
+    """Widget for live hyperopt convergence and the best epochs"""
+    
+    LEADERBOARD_COLUMNS = ["Rank", "Epoch", "Loss", "Trades", "Profit %", "Sharpe", "Max DD", "Params"]
+    
+    def __init__(self):
+        super().__init__()
+        self.epochs = []
+        self.losses = []
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Setup the hyperopt UI"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        # Convergence chart: loss per epoch and best loss so far
+        self.figure = Figure(figsize=(6, 4), dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        splitter.addWidget(self.canvas)
+        
+        # Leaderboard (bounded top-N, so a plain table widget is enough)
+        self.table = QTableWidget(0, len(self.LEADERBOARD_COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.LEADERBOARD_COLUMNS)
+        self.table.setAlternatingRowColors(True)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        splitter.addWidget(self.table)
+        
+        layout.addWidget(splitter)
+        
+        self.summary_label = QLabel("No hyperopt running")
+        layout.addWidget(self.summary_label)
+        
+        self.reset()
+    
+    def reset(self, total_epochs=None):
+        """Clear chart and leaderboard for a new run"""
+        self.epochs = []
+        self.losses = []
+        self.total_epochs = total_epochs
+        self.table.setRowCount(0)
+        self.summary_label.setText(f"Hyperopt: 0/{total_epochs} epochs" if total_epochs else "No hyperopt running")
+        self.plot_convergence()
+    
+    def update_epoch(self, event):
+        """Add an evaluated epoch (event from HyperoptThread.epoch_update)"""
+        self.epochs.append(event['epoch'])
+        self.losses.append(event['loss'])
+        
+        if event['rank'] is not None:
+            self.populate_leaderboard(event['leaderboard'])
+        
+        self.summary_label.setText(
+            f"Hyperopt: {len(self.epochs)}/{event.get('total_epochs') or '?'} epochs, "
+            f"best loss {event['best_loss']:.5f}"
+        )
+        self.plot_convergence()
+    
+    def populate_leaderboard(self, entries):
+        """Show the best epochs, best first"""
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            metrics = entry.get('metrics', {})
+            values = [
+                str(row + 1),
+                str(entry.get('epoch', '')),
+                f"{entry['loss']:.5f}",
+                str(metrics.get('total_trades', '')),
+                f"{metrics['profit_total'] * 100:.2f}%" if 'profit_total' in metrics else '',
+                f"{metrics['sharpe']:.3f}" if 'sharpe' in metrics else '',
+                f"{metrics['max_drawdown_account'] * 100:.2f}%" if 'max_drawdown_account' in metrics else '',
+                ", ".join(f"{key}={value}" for key, value in entry.get('params', {}).items())
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+    
+    def plot_convergence(self):
+        """Plot loss per epoch with the running best"""
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        
+        if self.losses:
+            losses = np.array(self.losses, dtype=float)
+            ax.scatter(self.epochs, losses, s=8, alpha=0.5, label='Epoch loss')
+            ax.step(self.epochs, np.minimum.accumulate(losses), where='post', color='green', label='Best loss')
+            ax.legend(loc='upper right')
+        else:
+            ax.text(0.5, 0.5, 'No hyperopt epochs yet', horizontalalignment='center',
+                    verticalalignment='center', transform=ax.transAxes, fontsize=12, color='gray')
+        
+        ax.set_title('Hyperopt Convergence')
+        ax.set_xlabel('Epoch')
+        ax.set_ylabel('Loss')
+        ax.grid(True, alpha=0.3)
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+
 class LogsWidget(QWidget):
     """Widget for displaying execution logs"""
     
@@ -262,11 +471,23 @@ class LogsWidget(QWidget):
         
         controls_layout.addStretch()
         
+        # Live progress of the running freqtrade job
+        self.phase_label = QLabel("")
+        controls_layout.addWidget(self.phase_label)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setVisible(False)
+        controls_layout.addWidget(self.progress_bar)
+        
         layout.addLayout(controls_layout)
         
         # Logs text area
         self.logs_text = QTextEdit()
         self.logs_text.setReadOnly(True)
+        # Keep memory bounded for long runs
+        self.logs_text.document().setMaximumBlockCount(5000)
         self.logs_text.setFont(QFont("Monaco", 10))  # Monospace font
         self.logs_text.setStyleSheet("""
             QTextEdit {
@@ -306,6 +527,15 @@ class LogsWidget(QWidget):
         scrollbar = self.logs_text.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
     
+    def update_progress(self, event):
+        """Show a structured progress event (phase, pair, percent)"""
+        phase = event.get('phase', '')
+        pair = event.get('pair')
+        
+        self.phase_label.setText(f"{phase} {pair}" if pair else phase)
+        self.progress_bar.setValue(int(event.get('percent', 0)))
+        self.progress_bar.setVisible(phase not in ('done', 'cancelled'))
+    
     def clear_logs(self):
         """Clear all logs"""
         self.logs_text.clear()
@@ -342,6 +572,10 @@ class ResultsPanel(QWidget):
         self.trades_widget = TradesTableWidget()
         self.tab_widget.addTab(self.trades_widget, "Trades")
         
+        # Hyperopt tab
+        self.hyperopt_widget = HyperoptWidget()
+        self.tab_widget.addTab(self.hyperopt_widget, "Hyperopt")
+        
         # Logs tab
         self.logs_widget = LogsWidget()
         self.tab_widget.addTab(self.logs_widget, "Logs")
@@ -355,7 +589,7 @@ class ResultsPanel(QWidget):
             equity_data = results_data.get('equity')
             stats = results_data.get('stats')
             
-            self.equity_widget.plot_equity_curve(equity_data)
+            self.equity_widget.plot_equity_curve(equity_data, results_data.get('monte_carlo'))
             self.equity_widget.update_stats(stats)
             
             # Update trades table
@@ -392,3 +626,16 @@ class ResultsPanel(QWidget):
     def log_message(self, message, level="INFO"):
         """Add a log message"""
         self.logs_widget.append_log(message, level)
+    
+    def update_progress(self, event):
+        """Forward a progress event to the logs tab"""
+        self.logs_widget.update_progress(event)
+    
+    def start_hyperopt(self, total_epochs):
+        """Reset the hyperopt tab and bring it to front"""
+        self.hyperopt_widget.reset(total_epochs)
+        self.tab_widget.setCurrentWidget(self.hyperopt_widget)
+    
+    def update_hyperopt_epoch(self, event):
+        """Forward an epoch update to the hyperopt tab"""
+        self.hyperopt_widget.update_epoch(event)
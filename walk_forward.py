@@ -0,0 +1,134 @@
+"""
+Walk-forward analysis - rolling in-sample/out-of-sample windows and stitched equity
+
+The data range is split into windows of an in-sample period (hyperopt) followed by
+an out-of-sample period (backtest with the in-sample best parameters). Windows start
+after the indicator warmup so freqtrade can load the startup candles of the first
+window; later out-of-sample backtests take their warmup from the end of their own
+in-sample period. The out-of-sample equity curves are chained into one curve.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import DEFAULT_DATA_DIR, get_store, timeframe_to_timedelta
+
+
+def format_timerange(start: pd.Timestamp, end: pd.Timestamp) -> str:
+    """freqtrade --timerange string (day resolution, end exclusive)"""
+    return f"{start:%Y%m%d}-{end:%Y%m%d}"
+
+
+def local_data_range(pairs: List[str], timeframe: str, exchange: str = 'binance',
+                     data_dir: Path = DEFAULT_DATA_DIR) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """Date range covered by the local candles of all pairs that have data"""
+
+    store = get_store(data_dir)
+    start = end = None
+    for pair in pairs:
+        try:
+            pair_range = store.date_range(pair, timeframe, exchange)
+        except FileNotFoundError:
+            print(f"⚠️ Нет данных для {pair} {timeframe} - пара не учитывается в walk-forward")
+            continue
+
+        if pair_range is None:
+            continue
+        start = pair_range[0] if start is None else max(start, pair_range[0])
+        end = pair_range[1] if end is None else min(end, pair_range[1])
+
+    if start is None or end is None or start >= end:
+        raise FileNotFoundError(f"No local data for {', '.join(pairs)} {timeframe}")
+    return start, end
+
+
+def walk_forward_windows(data_start: pd.Timestamp, data_end: pd.Timestamp, in_sample_days: int,
+                         out_of_sample_days: int, step_days: int = None,
+                         warmup: pd.Timedelta = pd.Timedelta(0)) -> List[Dict[str, Any]]:
+    """Rolling windows over [data_start + warmup, data_end]
+
+    Windows advance by step_days (default: out_of_sample_days, i.e. back to back
+    out-of-sample periods); the last out-of-sample period may be shorter.
+    """
+
+    if in_sample_days <= 0 or out_of_sample_days <= 0:
+        raise ValueError("In-sample and out-of-sample periods must be positive")
+
+    step = pd.Timedelta(days=step_days or out_of_sample_days)
+    in_sample = pd.Timedelta(days=in_sample_days)
+    out_of_sample = pd.Timedelta(days=out_of_sample_days)
+    last_day = data_end.floor('D')
+
+    windows = []
+    in_sample_start = (data_start + warmup).ceil('D')
+    while in_sample_start + in_sample < last_day:
+        out_of_sample_start = in_sample_start + in_sample
+        out_of_sample_end = min(out_of_sample_start + out_of_sample, last_day)
+
+        windows.append({
+            'index': len(windows),
+            'in_sample': format_timerange(in_sample_start, out_of_sample_start),
+            'out_of_sample': format_timerange(out_of_sample_start, out_of_sample_end),
+            'in_sample_start': in_sample_start,
+            'out_of_sample_start': out_of_sample_start,
+            'out_of_sample_end': out_of_sample_end,
+            # Startup candles the out-of-sample backtest loads from the in-sample period
+            'warmup_start': out_of_sample_start - warmup
+        })
+        in_sample_start += step
+
+    return windows
+
+
+def stitch_equity(window_results: List[Dict[str, Any]], starting_balance: float = 1000.0) -> pd.DataFrame:
+    """Chain the out-of-sample equity curves of consecutive windows into one curve
+
+    Each window's curve is rescaled from its own starting balance to the equity the
+    previous windows ended with and cut where the next window's out-of-sample period
+    starts. Windows without trades (or failed ones) keep the equity flat.
+    """
+
+    ordered = sorted(window_results, key=lambda result: result['window']['out_of_sample_start'])
+    equity = starting_balance
+    frames = []
+
+    for position, result in enumerate(ordered):
+        window = result['window']
+        start = window['out_of_sample_start']
+        cut = ordered[position + 1]['window']['out_of_sample_start'] \
+            if position + 1 < len(ordered) else window['out_of_sample_end']
+
+        curve = result.get('equity')
+        trades = result.get('trades')
+        has_curve = (result.get('success') and curve is not None and not curve.empty
+                     and trades is not None and not trades.empty)
+
+        if has_curve:
+            dates = pd.to_datetime(curve['date'], utc=True)
+            in_window = ((dates >= start) & (dates < cut)).to_numpy()
+            growth = curve['equity'].to_numpy(dtype=float)[in_window] / result.get('starting_balance', starting_balance)
+            segment = pd.DataFrame({'date': dates[in_window].to_numpy(), 'equity': equity * growth})
+        else:
+            segment = pd.DataFrame({'date': pd.to_datetime([start, cut], utc=True), 'equity': [equity, equity]})
+
+        if segment.empty:
+            continue
+        segment['window'] = window['index']
+        frames.append(segment)
+        equity = float(segment['equity'].iloc[-1])
+
+    if not frames:
+        return pd.DataFrame(columns=['date', 'equity', 'window', 'returns', 'cum_return', 'drawdown'])
+
+    stitched = pd.concat(frames, ignore_index=True)
+    values = stitched['equity'].to_numpy(dtype=float)
+    previous = np.concatenate([[starting_balance], values[:-1]])
+    peak = np.maximum(np.maximum.accumulate(values), starting_balance)
+
+    stitched['returns'] = values / previous - 1
+    stitched['cum_return'] = values / starting_balance - 1
+    stitched['drawdown'] = (values / peak - 1) * 100
+    return stitched
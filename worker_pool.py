@@ -0,0 +1,348 @@
+"""
+Freqtrade worker pool - long-lived processes that run backtests in-process
+
+Each worker imports freqtrade once, keeps the exchange object and loaded pair data
+between jobs and returns the result dict over a pipe, so repeated runs skip the
+interpreter, ccxt and data loading cost of a cold `freqtrade` CLI call. Hyperopt
+stays on the CLI: inside a worker joblib's loky backend runs its epochs in a single
+process.
+"""
+
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import multiprocessing as mp
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from cancellation import CancelToken, JobCancelled
+
+
+# Spawn keeps workers independent from the (Qt) parent process state
+_MP_CONTEXT = mp.get_context('spawn')
+
+# Loaded candle sets kept by each worker (least recently used ones are dropped)
+DATA_CACHE_SIZE = 4
+
+
+def _worker_main(conn, worker_id: int):
+    """Worker process loop: pre-import freqtrade, then serve jobs until None is received"""
+
+    # Own process group, so killing the worker also kills the processes a job started
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    try:
+        from freqtrade.configuration import Configuration
+        from freqtrade.enums import RunMode
+        from freqtrade.optimize.backtesting import Backtesting
+    except Exception as e:
+        conn.send({'ready': False, 'error': f"Failed to import freqtrade: {e}"})
+        return
+
+    conn.send({'ready': True, 'worker_id': worker_id})
+
+    state = {
+        'exchanges': {},   # exchange name -> Exchange instance
+        'data': OrderedDict()  # (datadir, pairs, timeframe, timerange, startup, files) -> (data, timerange)
+    }
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+
+        if job is None:
+            break
+
+        started = time.perf_counter()
+        try:
+            result = _run_backtest_job(job, state, Configuration, RunMode, Backtesting)
+            conn.send({'success': True, 'result': result, 'elapsed': time.perf_counter() - started})
+        except Exception as e:
+            conn.send({
+                'success': False,
+                'error': str(e),
+                'traceback': traceback.format_exc(),
+                'elapsed': time.perf_counter() - started
+            })
+
+
+def _job_configuration(job: Dict[str, Any], Configuration, run_mode) -> Dict[str, Any]:
+    """Build a freqtrade configuration the same way the CLI does"""
+
+    workspace = Path(job.get('workspace') or tempfile.mkdtemp(prefix='frequi_worker_'))
+    workspace.mkdir(parents=True, exist_ok=True)
+
+    config_file = workspace / 'config.json'
+    with open(config_file, 'w') as f:
+        json.dump(job['config'], f, indent=2)
+
+    args = {
+        'config': [str(config_file)],
+        'strategy': job['strategy_name'],
+        'user_data_dir': job['user_data_dir'],
+        'timerange': job.get('timerange'),
+        'export': 'trades',
+        'exportfilename': str(workspace / 'backtest_results.json'),
+        'cache': 'none'
+    }
+    if job.get('strategy_path'):
+        args['strategy_path'] = job['strategy_path']
+
+    return Configuration(args, run_mode).get_config()
+
+
+def _data_files_signature(config: Dict[str, Any]) -> tuple:
+    """(name, size, mtime_ns) of the whitelisted pairs' candle files in the datadir
+
+    A download, a resample or a rewrite of any of them changes the signature, so a warm
+    worker reloads the candles instead of backtesting on the ones it loaded before.
+    """
+
+    datadir = Path(config['datadir'])
+    signature = []
+    for pair in sorted(config['exchange']['pair_whitelist']):
+        pair_file = pair.replace('/', '_').replace(':', '_')
+        for path in sorted(datadir.rglob(f"{pair_file}-*")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((str(path.relative_to(datadir)), stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _run_backtest_job(job: Dict[str, Any], state: Dict[str, Any], Configuration, RunMode, Backtesting) -> Dict[str, Any]:
+    """Run one backtest, reusing the exchange and loaded candles of previous jobs"""
+
+    config = _job_configuration(job, Configuration, RunMode.BACKTEST)
+
+    exchange_name = config['exchange']['name']
+    backtesting = Backtesting(config, exchange=state['exchanges'].get(exchange_name))
+    state['exchanges'][exchange_name] = backtesting.exchange
+
+    try:
+        data_key = (
+            str(config['datadir']),
+            tuple(sorted(config['exchange']['pair_whitelist'])),
+            config['timeframe'],
+            job.get('timerange'),
+            backtesting.required_startup,
+            _data_files_signature(config)
+        )
+        if data_key in state['data']:
+            state['data'].move_to_end(data_key)
+        else:
+            state['data'][data_key] = backtesting.load_bt_data()
+            while len(state['data']) > DATA_CACHE_SIZE:
+                state['data'].popitem(last=False)
+        data, timerange = state['data'][data_key]
+
+        backtesting.load_bt_data_detail()
+
+        min_date = max_date = None
+        for strategy in backtesting.strategylist:
+            min_date, max_date = backtesting.backtest_one_strategy(strategy, data, timerange)
+
+        from freqtrade.optimize.optimize_reports import generate_backtest_stats
+        results = generate_backtest_stats(data, backtesting.all_results, min_date=min_date, max_date=max_date)
+
+        # Round-trip through JSON so the parent receives exactly what the CLI would export
+        return json.loads(json.dumps(results, default=str))
+    finally:
+        if hasattr(backtesting, 'cleanup'):
+            backtesting.cleanup()
+
+
+class _Worker:
+    """Parent-side handle of one worker process"""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.conn, child_conn = _MP_CONTEXT.Pipe()
+        self.process = _MP_CONTEXT.Process(
+            target=_worker_main,
+            args=(child_conn, worker_id),
+            name=f"frequi-worker-{worker_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self, timeout: float) -> None:
+        if not self.conn.poll(timeout):
+            raise RuntimeError(f"Worker {self.worker_id} did not start within {timeout:.0f}s")
+        message = self.conn.recv()
+        if not message.get('ready'):
+            raise RuntimeError(message.get('error', f"Worker {self.worker_id} failed to start"))
+
+    def run(self, job: Dict[str, Any], timeout: float, cancel_token: CancelToken = None) -> Dict[str, Any]:
+        self.conn.send(job)
+
+        deadline = time.monotonic() + timeout
+        while not self.conn.poll(0.1):
+            if cancel_token is not None and cancel_token.cancelled:
+                # A job cannot be interrupted inside freqtrade, so the worker is sacrificed
+                self.kill()
+                raise JobCancelled("Worker job was cancelled")
+            if time.monotonic() > deadline:
+                self.kill()
+                raise RuntimeError(f"Worker job timed out after {timeout:.0f}s")
+
+        return self.conn.recv()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker together with the processes its job started"""
+
+        if sys.platform == 'win32':
+            if self.process.is_alive():
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(self.process.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            # Signal the group even if the worker already exited - children may still be alive
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        self.process.kill()
+        self.process.join()
+
+
+class FreqtradeWorkerPool:
+    """Pool of warm freqtrade worker processes"""
+
+    def __init__(self, size: int = 1, startup_timeout: float = 120.0):
+        self.size = max(1, size)
+        self.startup_timeout = startup_timeout
+        self._workers: List[_Worker] = []
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Start all workers and wait until freqtrade is imported in each of them"""
+
+        with self._lock:
+            if self._workers:
+                return
+
+            workers = [self._spawn() for _ in range(self.size)]
+            try:
+                for worker in workers:
+                    worker.wait_ready(self.startup_timeout)
+            except Exception:
+                for worker in workers:
+                    worker.kill()
+                raise
+
+            self._workers = workers
+            for worker in workers:
+                self._idle.put(worker)
+
+        print(f"🔥 Запущено {self.size} freqtrade воркеров")
+
+    def submit(self, job: Dict[str, Any], timeout: float = 300.0,
+               cancel_token: CancelToken = None) -> Dict[str, Any]:
+        """Run a job on the next idle worker (blocks until a worker is free and the job is done)"""
+
+        if not self.running:
+            raise RuntimeError("Worker pool is not running")
+
+        while True:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            if not self.running:
+                raise RuntimeError("Worker pool has no workers left")
+            try:
+                worker = self._idle.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+
+        try:
+            response = worker.run(job, timeout, cancel_token)
+        except Exception:
+            # Only a live worker goes back to the idle queue; the replacement starts in the background
+            self._replace(worker)
+            raise
+        self._idle.put(worker)
+
+        if not response.get('success'):
+            print(f"❌ Worker traceback:\n{response.get('traceback', '')}")
+            raise RuntimeError(response.get('error', 'Worker job failed'))
+
+        return response
+
+    def shutdown(self) -> None:
+        """Stop all workers"""
+
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._idle = queue.Queue()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._next_id)
+        self._next_id += 1
+        return worker
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a failed worker and start its replacement without waiting for it
+
+        The replacement joins the idle queue once freqtrade is imported; if it does not
+        start, the pool is one worker smaller.
+        """
+
+        worker.kill()
+        with self._lock:
+            if worker not in self._workers:
+                return
+            replacement = self._spawn()
+            self._workers = [replacement if w is worker else w for w in self._workers]
+
+        threading.Thread(target=self._await_ready, args=(replacement,),
+                         name=f"frequi-worker-{replacement.worker_id}-start", daemon=True).start()
+
+    def _await_ready(self, worker: _Worker) -> None:
+        try:
+            worker.wait_ready(self.startup_timeout)
+        except Exception as e:
+            print(f"⚠️ Воркер {worker.worker_id} не перезапущен: {e}")
+            worker.kill()
+            with self._lock:
+                self._workers = [w for w in self._workers if w is not worker]
+            return
+
+        with self._lock:
+            if worker in self._workers:
+                self._idle.put(worker)
+                return
+        # The pool was shut down while the worker started
+        worker.stop()